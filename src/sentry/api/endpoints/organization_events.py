@@ -113,6 +113,7 @@ class OrganizationEventsV2Endpoint(OrganizationEventsEndpointBase):
         data_fn = partial(
             lambda **kwargs: snuba.transform_aliases_and_query(skip_conditions=True, **kwargs),
             referrer="api.organization-events-v2",
+            stream=True,
             **snuba_args
         )
 
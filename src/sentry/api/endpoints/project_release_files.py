@@ -180,4 +180,8 @@ class ProjectReleaseFilesEndpoint(ProjectEndpoint):
             file.delete()
             return Response({"detail": ERR_FILE_EXISTS}, status=409)
 
+        # The manifest is invalidated again once the file is committed, as a
+        # concurrent lookup may have cached it without the file in between.
+        ReleaseFile.objects.invalidate_manifest(release.id, dist.id if dist else None)
+
         return Response(serialize(releasefile, request.user), status=201)
@@ -4,7 +4,9 @@ import bisect
 import functools
 import math
 
+from collections import Iterator
 from datetime import datetime
+from itertools import islice
 from django.db import connections
 from django.db.models.sql.datastructures import EmptyResultSet
 from django.utils import timezone
@@ -353,6 +355,18 @@ class SequencePaginator(object):
         )
 
 
+def _consume_page(iterator, limit):
+    """
+    Returns the first ``limit`` items of an iterator. The rest of it is read
+    but not kept, so that e.g. a streamed snuba response is read up to the
+    members that follow its rows.
+    """
+    page = list(islice(iterator, limit))
+    for _ in iterator:
+        pass
+    return page
+
+
 class GenericOffsetPaginator(object):
     """
     A paginator for getting pages of results for a query using the OFFSET/LIMIT
@@ -379,6 +393,13 @@ class GenericOffsetPaginator(object):
         # Request 1 more than limit so we can tell if there is another page
         data = self.data_fn(offset=offset, limit=limit + 1)
 
+        # The data can also be provided as an iterator (e.g. the rows of a
+        # streamed snuba query), which is only kept up to the page size.
+        if isinstance(data, Iterator):
+            data = _consume_page(data, limit + 1)
+        elif isinstance(data, dict) and isinstance(data.get("data"), Iterator):
+            data["data"] = _consume_page(data["data"], limit + 1)
+
         if isinstance(data, list):
             has_more = len(data) == limit + 1
             if has_more:
@@ -5,9 +5,51 @@ import zlib
 from sentry.utils import metrics
 
 
+# Attachments are compressed and stored in chunks of this size, so that they
+# never have to be held in memory as a whole.
+ATTACHMENT_CHUNK_SIZE = 1024 * 1024
+
+
+class ChunkedReader(object):
+    """
+    A minimal file-like object that reads from an iterator of chunks.
+    """
+
+    def __init__(self, chunks):
+        self._chunks = iter(chunks)
+        self._buffer = b""
+
+    def read(self, size=-1):
+        parts = [self._buffer]
+        length = len(self._buffer)
+        while size < 0 or length < size:
+            chunk = next(self._chunks, None)
+            if chunk is None:
+                break
+            parts.append(chunk)
+            length += len(chunk)
+
+        data = b"".join(parts)
+        if size < 0:
+            self._buffer = b""
+            return data
+        self._buffer = data[size:]
+        return data[:size]
+
+
 class CachedAttachment(object):
-    def __init__(self, name=None, content_type=None, type=None, data=None, load=None):
-        if data is None and load is None:
+    def __init__(
+        self,
+        name=None,
+        content_type=None,
+        type=None,
+        data=None,
+        load=None,
+        fileobj=None,
+        load_chunks=None,
+        size=None,
+    ):
+        if data is None and load is None and fileobj is None and load_chunks is None:
             raise AttributeError("Missing attachment data")
 
         self.name = name
@@ -16,20 +58,65 @@ class CachedAttachment(object):
 
         self._data = data
         self._load = load
+        self._fileobj = fileobj
+        self._load_chunks = load_chunks
+        self._size = size
 
     @classmethod
     def from_upload(cls, file, **kwargs):
         return CachedAttachment(
-            name=file.name, content_type=file.content_type, data=file.read(), **kwargs
+            name=file.name, content_type=file.content_type, fileobj=file, **kwargs
         )
 
     @property
     def data(self):
-        if self._data is None and self._load is not None:
-            self._data = self._load()
+        if self._data is None:
+            if self._load is not None:
+                self._data = self._load()
+            else:
+                self._data = b"".join(self.chunks())
 
         return self._data
 
+    @property
+    def size(self):
+        if self._size is None:
+            if self._data is not None:
+                self._size = len(self._data)
+            else:
+                self._size = sum(len(chunk) for chunk in self.chunks())
+
+        return self._size
+
+    def chunks(self, chunk_size=None):
+        """
+        Yields the contents of the attachment in chunks, without loading the
+        entire attachment into memory if it was not loaded yet.
+        """
+        if chunk_size is None:
+            chunk_size = ATTACHMENT_CHUNK_SIZE
+
+        if self._data is None and self._fileobj is not None:
+            self._fileobj.seek(0)
+            while True:
+                chunk = self._fileobj.read(chunk_size)
+                if not chunk:
+                    break
+                yield chunk
+        elif self._data is None and self._load_chunks is not None:
+            for chunk in self._load_chunks():
+                yield chunk
+        else:
+            data = self.data
+            for offset in range(0, len(data), chunk_size):
+                yield data[offset : offset + chunk_size]
+
+    def open(self):
+        """
+        Returns a file-like object that streams the contents of the attachment.
+        """
+        return ChunkedReader(self.chunks())
+
     def meta(self):
         return {"name": self.name, "content_type": self.content_type, "type": self.type}
 
@@ -46,32 +133,58 @@ class BaseAttachmentCache(object):
 
     def set(self, key, attachments, timeout=None):
         key = self.make_key(key)
+        meta = []
         for index, attachment in enumerate(attachments):
-            compressed = zlib.compress(attachment.data)
-            self.inner.set(u"{}:{}".format(key, index), compressed, timeout, raw=True)
+            size = compressed_size = 0
+            chunks = 0
+            for chunk in attachment.chunks():
+                compressed = zlib.compress(chunk)
+                self.inner.set(
+                    u"{}:{}:{}".format(key, index, chunks), compressed, timeout, raw=True
+                )
+                size += len(chunk)
+                compressed_size += len(compressed)
+                chunks += 1
 
             metrics_tags = {"type": attachment.type}
             metrics.incr("attachments.received", tags=metrics_tags, skip_internal=False)
-            metrics.timing("attachments.blob-size.raw", len(attachment.data), tags=metrics_tags)
-            metrics.timing("attachments.blob-size.compressed", len(compressed), tags=metrics_tags)
+            metrics.timing("attachments.blob-size.raw", size, tags=metrics_tags)
+            metrics.timing("attachments.blob-size.compressed", compressed_size, tags=metrics_tags)
+
+            meta.append(dict(attachment.meta(), chunks=chunks, size=size))
 
-        meta = [attachment.meta() for attachment in attachments]
         self.inner.set(key, meta, timeout, raw=False)
 
+    def get_chunks(self, key, index, chunks):
+        if chunks is None:
+            # Attachments stored before chunking was introduced are stored
+            # as a single value.
+            yield zlib.decompress(self.inner.get(u"{}:{}".format(key, index), raw=True))
+            return
+
+        for chunk in range(chunks):
+            yield zlib.decompress(self.inner.get(u"{}:{}:{}".format(key, index, chunk), raw=True))
+
     def get(self, key):
         key = self.make_key(key)
         result = self.inner.get(key, raw=False)
-        if result is not None:
-            result = [
+        if result is None:
+            return None
+
+        attachments = []
+        for index, meta in enumerate(result):
+            attachment = dict(meta)
+            chunks = attachment.pop("chunks", None)
+            attachments.append(
                 CachedAttachment(
-                    load=lambda index=index: zlib.decompress(
-                        self.inner.get(u"{}:{}".format(key, index), raw=True)
+                    load_chunks=lambda index=index, chunks=chunks: self.get_chunks(
+                        key, index, chunks
                     ),
+                    size=attachment.pop("size", None),
                     **attachment
                 )
-                for index, attachment in enumerate(result)
-            ]
-        return result
+            )
+        return attachments
 
     def delete(self, key):
         key = self.make_key(key)
@@ -79,6 +192,11 @@ class BaseAttachmentCache(object):
         if attachments is None:
             return
 
-        for index in range(0, len(attachments)):
-            self.inner.delete(u"{}:{}".format(key, index))
+        for index, attachment in enumerate(attachments):
+            chunks = attachment.get("chunks")
+            if chunks is None:
+                self.inner.delete(u"{}:{}".format(key, index))
+            else:
+                for chunk in range(chunks):
+                    self.inner.delete(u"{}:{}:{}".format(key, index, chunk))
         self.inner.delete(key)
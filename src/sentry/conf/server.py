@@ -689,7 +689,8 @@ CELERYBEAT_SCHEDULE = {
 }
 
 BGTASKS = {
-    "sentry.bgtasks.clean_dsymcache:clean_dsymcache": {"interval": 5 * 60, "roles": ["worker"]}
+    "sentry.bgtasks.clean_dsymcache:clean_dsymcache": {"interval": 5 * 60, "roles": ["worker"]},
+    "sentry.bgtasks.clean_blobcache:clean_blobcache": {"interval": 5 * 60, "roles": ["worker"]},
 }
 
 # Sentry logs to two major places: stdout, and it's internal project.
@@ -1044,9 +1045,23 @@ SENTRY_RATELIMITER_OPTIONS = {}
 # The default value for project-level quotas
 SENTRY_DEFAULT_MAX_EVENTS_PER_MINUTE = "90%"
 
+# Models which opt into it (``cache_local=True``) keep recently used instances
+# in a per-process cache for up to ``SENTRY_MODEL_CACHE_LOCAL_TTL`` seconds in
+# front of the shared cache. Changes made by other processes may go unnoticed
+# for that long. A TTL of 0 disables the per-process cache.
+SENTRY_MODEL_CACHE_LOCAL_TTL = 10
+SENTRY_MODEL_CACHE_LOCAL_SIZE = 1000
+
 # Snuba configuration
 SENTRY_SNUBA = os.environ.get("SNUBA", "http://localhost:1218")
 
+# Storage tiers used to cache the results of Snuba queries that opt into
+# caching (``use_cache=True``.) ``local`` is a per-process LRU cache, ``redis``
+# stores results in the ``SENTRY_CACHE`` backend, which shares them between
+# processes. An empty value disables the cache.
+SENTRY_SNUBA_CACHE_TIERS = ("local", "redis")
+SENTRY_SNUBA_CACHE_LOCAL_SIZE = 500
+
 # Node storage backend
 SENTRY_NODESTORE = "sentry.nodestore.django.DjangoNodeStorage"
 SENTRY_NODESTORE_OPTIONS = {}
@@ -1082,6 +1097,9 @@ SENTRY_TSDB_ROLLUPS = (
 )
 
 # Internal metrics
+# To aggregate metrics in process before they are sent, wrap another backend:
+#   SENTRY_METRICS_BACKEND = "sentry.metrics.aggregating.AggregatingMetricsBackend"
+#   SENTRY_METRICS_OPTIONS = {"backend": "sentry.metrics.statsd.StatsdMetricsBackend"}
 SENTRY_METRICS_BACKEND = "sentry.metrics.dummy.DummyMetricsBackend"
 SENTRY_METRICS_OPTIONS = {}
 SENTRY_METRICS_SAMPLE_RATE = 1.0
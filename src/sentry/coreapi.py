@@ -17,7 +17,7 @@ from six import BytesIO
 from time import time
 
 from sentry.attachments import attachment_cache
-from sentry.cache import default_cache
+from sentry.eventstore.processing import event_processing_store
 from sentry.models import ProjectKey
 from sentry.tasks.store import preprocess_event, preprocess_event_from_reprocessing
 from sentry.utils import json
@@ -26,7 +26,6 @@ from sentry.utils.http import origin_from_request
 from sentry.utils.strings import decompress
 from sentry.utils.safe import get_path
 from sentry.utils.sdk import configure_scope
-from sentry.utils.canonical import CANONICAL_TYPES
 
 
 _dist_re = re.compile(r"^[a-zA-Z0-9_.-]+$")
@@ -158,13 +157,9 @@ class ClientApiHelper(object):
         if start_time is None:
             start_time = time()
 
-        # we might be passed some subclasses of dict that fail dumping
-        if isinstance(data, CANONICAL_TYPES):
-            data = dict(data.items())
-
         cache_timeout = 3600
         cache_key = cache_key_for_event(data)
-        default_cache.set(cache_key, data, cache_timeout)
+        event_processing_store.store(cache_key, data, "ingest", cache_timeout)
 
         # Attachments will be empty or None if the "event-attachments" feature
         # is turned off. For native crash reports it will still contain the
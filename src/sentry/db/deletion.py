@@ -1,13 +1,54 @@
 from __future__ import absolute_import
 
 import itertools
+import os
+import threading
 from uuid import uuid4
 
+from concurrent.futures import ThreadPoolExecutor
 from datetime import timedelta
 from django.db import connections, router
 from django.utils import timezone
 
-from sentry.utils import db
+from sentry.utils import db, json
+
+
+class DeletionCheckpoint(object):
+    """
+    Persists the progress of partitioned deletions in a JSON file, so that an
+    interrupted cleanup can resume where it stopped.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.lock = threading.Lock()
+        try:
+            with open(path) as f:
+                self.data = json.load(f)
+        except (IOError, ValueError):
+            self.data = {}
+
+    def get(self, key):
+        with self.lock:
+            return self.data.get(key)
+
+    def set(self, key, value):
+        with self.lock:
+            self.data[key] = value
+            self._write()
+
+    def delete(self, key):
+        with self.lock:
+            if self.data.pop(key, None) is not None:
+                self._write()
+
+    def _write(self):
+        # Write to a temporary file first, so that an interruption never
+        # leaves a partially written checkpoint behind.
+        tmp_path = u"{}.tmp".format(self.path)
+        with open(tmp_path, "w") as f:
+            json.dump(self.data, f)
+        os.rename(tmp_path, self.path)
 
 
 class BulkDeleteQuery(object):
@@ -19,7 +60,7 @@ class BulkDeleteQuery(object):
         self.order_by = order_by
         self.using = router.db_for_write(model)
 
-    def execute_postgres(self, chunk_size=10000):
+    def _get_where(self):
         quote_name = connections[self.using].ops.quote_name
 
         where = []
@@ -33,7 +74,12 @@ class BulkDeleteQuery(object):
             )
         if self.project_id:
             where.append(u"project_id = {}".format(self.project_id))
+        return where
+
+    def execute_postgres(self, chunk_size=10000):
+        quote_name = connections[self.using].ops.quote_name
 
+        where = self._get_where()
         if where:
             where_clause = u"where {}".format(" and ".join(where))
         else:
@@ -69,11 +115,99 @@ class BulkDeleteQuery(object):
         return self._continuous_query(query)
 
     def _continuous_query(self, query):
+        deleted = 0
         results = True
         cursor = connections[self.using].cursor()
         while results:
             cursor.execute(query)
             results = cursor.rowcount > 0
+            deleted += max(cursor.rowcount, 0)
+        return deleted
+
+    def get_checkpoint_key(self):
+        return u"{}:{}:{}:{}".format(
+            self.model._meta.db_table, self.dtfield, self.days, self.project_id
+        )
+
+    def get_partitions(self, partitions):
+        """
+        Splits the id range of the table into ``partitions`` disjoint
+        ``[start, end)`` ranges of (about) equal size.
+        """
+        cursor = connections[self.using].cursor()
+        cursor.execute(u"select min(id), max(id) from {}".format(self.model._meta.db_table))
+        min_id, max_id = cursor.fetchone()
+        if min_id is None:
+            return []
+
+        total = max_id - min_id + 1
+        partitions = min(partitions, total)
+        bounds = [min_id + total * i // partitions for i in range(partitions + 1)]
+        return [[bounds[i], bounds[i + 1]] for i in range(partitions)]
+
+    def execute_partitioned(self, partitions, chunk_size=10000, checkpoint=None):
+        """
+        Splits the id range of the table into ``partitions`` disjoint ranges
+        and deletes them concurrently, each in id order and in transactions of
+        at most ``chunk_size`` rows. The progress of every partition is saved
+        to ``checkpoint`` (a ``DeletionCheckpoint``) after every chunk, and
+        resumed from it. Returns the number of deleted rows.
+        """
+        assert db.is_postgres()
+
+        key = self.get_checkpoint_key()
+        ranges = checkpoint.get(key) if checkpoint is not None else None
+        if ranges is None:
+            ranges = self.get_partitions(partitions)
+        if not ranges:
+            return 0
+
+        where = self._get_where()
+        where.append("id >= %s and id < %s")
+        query = u"""
+            with deleted as (
+                delete from {table}
+                where id = any(array(
+                    select id
+                    from {table}
+                    where {where}
+                    order by id
+                    limit {chunk_size}
+                ))
+                returning id
+            )
+            select count(*), max(id) from deleted;
+        """.format(
+            table=self.model._meta.db_table, where=" and ".join(where), chunk_size=chunk_size
+        )
+
+        def delete_partition(index):
+            deleted = 0
+            try:
+                cursor = connections[self.using].cursor()
+                while True:
+                    start, end = ranges[index]
+                    if start >= end:
+                        return deleted
+
+                    cursor.execute(query, [start, end])
+                    count, last_id = cursor.fetchone()
+                    deleted += count
+                    if count < chunk_size:
+                        ranges[index] = [end, end]
+                    else:
+                        ranges[index] = [last_id + 1, end]
+                    if checkpoint is not None:
+                        checkpoint.set(key, ranges)
+            finally:
+                connections[self.using].close()
+
+        with ThreadPoolExecutor(len(ranges)) as executor:
+            deleted = sum(executor.map(delete_partition, range(len(ranges))))
+
+        if checkpoint is not None:
+            checkpoint.delete(key)
+        return deleted
 
     def execute_generic(self, chunk_size=100):
         qs = self.get_generic_queryset()
@@ -96,18 +230,24 @@ class BulkDeleteQuery(object):
     def _continuous_generic_query(self, query, chunk_size):
         # XXX: we step through because the deletion collector will pull all
         # relations into memory
+        deleted = 0
         exists = True
         while exists:
             exists = False
             for item in query[:chunk_size].iterator():
                 item.delete()
+                deleted += 1
                 exists = True
+        return deleted
 
     def execute(self, chunk_size=10000):
+        """
+        Deletes all matching rows, and returns the number of deleted rows.
+        """
         if db.is_postgres():
-            self.execute_postgres(chunk_size)
+            return self.execute_postgres(chunk_size)
         else:
-            self.execute_generic(chunk_size)
+            return self.execute_generic(chunk_size)
 
     def iterator(self, chunk_size=100):
         if db.is_postgres():
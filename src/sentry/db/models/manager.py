@@ -3,8 +3,12 @@ from __future__ import absolute_import, print_function
 import logging
 import six
 import threading
+import time
 import weakref
 
+from collections import OrderedDict
+from six.moves import cPickle as pickle
+
 from django.conf import settings
 from django.db import router
 from django.db.models import Model
@@ -13,7 +17,7 @@ from django.db.models.signals import post_save, post_delete, post_init, class_pr
 from django.utils.encoding import smart_text
 
 from sentry import nodestore
-from sentry.utils.cache import cache
+from sentry.utils.cache import cache, jitter_timeout, single_flight
 from sentry.utils.hashlib import md5_text
 
 from .query import create_or_update
@@ -48,6 +52,75 @@ def make_key(model, prefix, kwargs):
     return "%s:%s:%s" % (prefix, model.__name__, md5_text(kwargs_bits).hexdigest())
 
 
+class LocalModelCache(object):
+    """
+    A size bounded, per-process LRU cache of model instances where every item
+    expires after ``SENTRY_MODEL_CACHE_LOCAL_TTL`` seconds.
+
+    Instances are stored pickled so that every hit returns a fresh copy which
+    the caller is free to mutate.
+    """
+
+    def __init__(self):
+        self.items = OrderedDict()
+        self.lock = threading.Lock()
+
+    @property
+    def ttl(self):
+        return getattr(settings, "SENTRY_MODEL_CACHE_LOCAL_TTL", 0)
+
+    @property
+    def size(self):
+        return getattr(settings, "SENTRY_MODEL_CACHE_LOCAL_SIZE", 1000)
+
+    def get(self, key):
+        if not self.ttl:
+            return None
+
+        with self.lock:
+            item = self.items.pop(key, None)
+            if item is None:
+                return None
+
+            expires, value = item
+            if expires < time.time():
+                return None
+
+            self.items[key] = item
+
+        return pickle.loads(value)
+
+    def set(self, key, instance):
+        ttl = self.ttl
+        if not ttl:
+            return
+
+        # Ensure we don't serialize the database into the cache
+        db = instance._state.db
+        instance._state.db = None
+        try:
+            value = pickle.dumps(instance, pickle.HIGHEST_PROTOCOL)
+        finally:
+            instance._state.db = db
+
+        with self.lock:
+            self.items.pop(key, None)
+            self.items[key] = (time.time() + ttl, value)
+            while len(self.items) > self.size:
+                self.items.popitem(last=False)
+
+    def delete(self, key):
+        with self.lock:
+            self.items.pop(key, None)
+
+    def clear(self):
+        with self.lock:
+            self.items.clear()
+
+
+local_model_cache = LocalModelCache()
+
+
 class BaseQuerySet(QuerySet):
     # XXX(dcramer): we prefer values_list, but we cant disable values as Django uses it
     # internally
@@ -71,6 +144,9 @@ class BaseManager(Manager):
         self.cache_fields = kwargs.pop("cache_fields", [])
         self.cache_ttl = kwargs.pop("cache_ttl", 60 * 5)
         self.cache_version = kwargs.pop("cache_version", None)
+        # Keeps recently used instances in a per-process cache in front of the
+        # shared cache, see ``LocalModelCache``.
+        self.cache_local = kwargs.pop("cache_local", False)
         self.__local_cache = threading.local()
         super(BaseManager, self).__init__(*args, **kwargs)
 
@@ -148,7 +224,7 @@ class BaseManager(Manager):
             cache.set(
                 key=self.__get_lookup_cache_key(**{key: value}),
                 value=pk_val,
-                timeout=self.cache_ttl,
+                timeout=jitter_timeout(self.cache_ttl),
                 version=self.cache_version,
             )
 
@@ -160,12 +236,13 @@ class BaseManager(Manager):
             cache.set(
                 key=self.__get_lookup_cache_key(**{pk_name: pk_val}),
                 value=instance,
-                timeout=self.cache_ttl,
+                timeout=jitter_timeout(self.cache_ttl),
                 version=self.cache_version,
             )
         except Exception as e:
             logger.error(e, exc_info=True)
         instance._state.db = db
+        self.__local_delete(pk_val)
 
         # Kill off any keys which are no longer valid
         if instance in self.__cache:
@@ -198,10 +275,28 @@ class BaseManager(Manager):
         cache.delete(
             key=self.__get_lookup_cache_key(**{pk_name: instance.pk}), version=self.cache_version
         )
+        self.__local_delete(instance.pk)
 
     def __get_lookup_cache_key(self, **kwargs):
         return make_key(self.model, "modelcache", kwargs)
 
+    def __get_local_cache_key(self, pk_val):
+        pk_name = self.model._meta.pk.name
+        return (self.cache_version, self.__get_lookup_cache_key(**{pk_name: pk_val}))
+
+    def __local_get(self, pk_val):
+        if not self.cache_local:
+            return None
+        return local_model_cache.get(self.__get_local_cache_key(pk_val))
+
+    def __local_set(self, instance):
+        if self.cache_local:
+            local_model_cache.set(self.__get_local_cache_key(instance.pk), instance)
+
+    def __local_delete(self, pk_val):
+        if self.cache_local:
+            local_model_cache.delete(self.__get_local_cache_key(pk_val))
+
     def __value_for_field(self, instance, key):
         """
         Return the cacheable value for a field.
@@ -242,14 +337,31 @@ class BaseManager(Manager):
             key = key.split("__exact", 1)[0]
 
         if key in self.cache_fields or key == pk_name:
+            if key == pk_name:
+                retval = self.__local_get(value)
+                if retval is not None:
+                    retval._state.db = router.db_for_read(self.model, **kwargs)
+                    return retval
+
             cache_key = self.__get_lookup_cache_key(**{key: value})
 
             retval = cache.get(cache_key, version=self.cache_version)
             if retval is None:
-                result = self.get(**kwargs)
-                # Ensure we're pushing it into the cache
-                self.__post_save(instance=result)
-                return result
+                result = []
+
+                def compute():
+                    result.append(self.get(**kwargs))
+                    # Ensure we're pushing it into the cache
+                    self.__post_save(instance=result[0])
+                    return result[0]
+
+                # Only one process loads a missing instance, while the others
+                # wait for it to show up in the cache.
+                retval = single_flight(
+                    cache_key, lambda: cache.get(cache_key, version=self.cache_version), compute
+                )
+                if result:
+                    return result[0]
 
             # If we didn't look up by pk we need to hit the reffed
             # key
@@ -268,12 +380,84 @@ class BaseManager(Manager):
                 logger.error("Cache response returned invalid value %r", retval)
                 return self.get(**kwargs)
 
+            self.__local_set(retval)
             retval._state.db = router.db_for_read(self.model, **kwargs)
 
             return retval
         else:
             return self.get(**kwargs)
 
+    def get_many_from_cache(self, values, key="pk"):
+        """
+        Wrapper around `QuerySet.filter(pk__in=values)` which supports caching of
+        the intermediate value. Returns the instances which exist, in the
+        order of ``values``.
+
+        Every instance missing from the cache is loaded with a single query
+        and pushed into the cache.
+        """
+        pk_name = self.model._meta.pk.name
+        if key == "pk":
+            key = pk_name
+
+        # We store everything by key references (vs instances)
+        values = [value.pk if isinstance(value, Model) else value for value in values]
+
+        if not self.cache_fields or key != pk_name:
+            results = {getattr(i, key): i for i in self.filter(**{key + "__in": values})}
+            return [results[value] for value in values if value in results]
+
+        values = [self.model._meta.pk.to_python(value) for value in values]
+        db = router.db_for_read(self.model)
+
+        results = {}
+        for value in values:
+            retval = self.__local_get(value)
+            if retval is not None:
+                results[value] = retval
+
+        cache_keys = {
+            self.__get_lookup_cache_key(**{pk_name: value}): value
+            for value in values
+            if value not in results
+        }
+        if cache_keys:
+            cache_results = cache.get_many(list(cache_keys), version=self.cache_version)
+        else:
+            cache_results = {}
+
+        for cache_key, retval in six.iteritems(cache_results):
+            value = cache_keys[cache_key]
+            if not isinstance(retval, self.model) or retval.pk != value:
+                if settings.DEBUG:
+                    raise ValueError("Unexpected value returned from cache")
+                logger.error("Cache response returned invalid value %r", retval)
+                continue
+            self.__local_set(retval)
+            results[value] = retval
+
+        missing = [value for value in values if value not in results]
+        if missing:
+            to_cache = {}
+            for instance in self.filter(pk__in=missing):
+                results[instance.pk] = instance
+                to_cache[self.__get_lookup_cache_key(**{pk_name: instance.pk})] = instance
+
+            # Ensure we don't serialize the database into the cache
+            for instance in six.itervalues(to_cache):
+                instance._state.db = None
+            try:
+                cache.set_many(
+                    to_cache, timeout=jitter_timeout(self.cache_ttl), version=self.cache_version
+                )
+            except Exception as e:
+                logger.error(e, exc_info=True)
+
+        for retval in six.itervalues(results):
+            retval._state.db = db
+
+        return [results[value] for value in values if value in results]
+
     def create_or_update(self, **kwargs):
         return create_or_update(self.model, **kwargs)
 
@@ -281,6 +465,7 @@ class BaseManager(Manager):
         pk_name = self.model._meta.pk.name
         cache_key = self.__get_lookup_cache_key(**{pk_name: instance_id})
         cache.delete(cache_key, version=self.cache_version)
+        self.__local_delete(instance_id)
 
     def post_save(self, instance, **kwargs):
         """
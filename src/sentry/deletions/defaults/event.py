@@ -1,6 +1,11 @@
 from __future__ import absolute_import, print_function
 
+import six
+
+from collections import defaultdict
+
 from sentry import nodestore
+from sentry.utils.query import bulk_delete_objects
 
 from ..base import BaseDeletionTask, BaseRelation, ModelDeletionTask, ModelRelation
 
@@ -16,26 +21,34 @@ class NodeDeletionTask(BaseDeletionTask):
 
 
 class EventDeletionTask(ModelDeletionTask):
-    def get_child_relations(self, instance):
-        from sentry import models
-
-        relations = super(EventDeletionTask, self).get_child_relations(instance)
-        key = {"project_id": instance.project_id, "event_id": instance.event_id}
-        relations.extend(
-            [ModelRelation(models.EventAttachment, key), ModelRelation(models.UserReport, key)]
-        )
-        return relations
-
     def get_child_relations_bulk(self, instance_list):
-        from sentry.models import Event
+        from sentry import models
 
         node_ids = []
+        event_ids = defaultdict(list)
         for i in instance_list:
-            node_id = Event.generate_node_id(i.project_id, i.event_id)
+            node_id = models.Event.generate_node_id(i.project_id, i.event_id)
             node_ids.append(node_id)
+            event_ids[i.project_id].append(i.event_id)
             # Unbind the NodeField so it doesn't attempt to get
             # get deleted a second time after NodeDeletionTask
             # runs, when the Event itself is deleted.
             i.data = None
 
-        return [BaseRelation({"nodes": node_ids}, NodeDeletionTask)]
+        relations = [BaseRelation({"nodes": node_ids}, NodeDeletionTask)]
+        for project_id, ids in six.iteritems(event_ids):
+            key = {"project_id": project_id, "event_id__in": ids}
+            relations.extend(
+                [ModelRelation(models.EventAttachment, key), ModelRelation(models.UserReport, key)]
+            )
+        return relations
+
+    def delete_instance_bulk(self, instance_list):
+        # Nothing references events by foreign key, and their nodes are already
+        # gone, so the whole chunk is removed with a single query.
+        bulk_delete_objects(
+            model=self.model,
+            limit=len(instance_list),
+            transaction_id=self.transaction_id,
+            id__in=[i.id for i in instance_list],
+        )
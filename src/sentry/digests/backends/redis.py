@@ -4,11 +4,13 @@ import logging
 import six
 import time
 
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from contextlib import contextmanager
 from redis.client import ResponseError
 
 from sentry.digests import Record, ScheduleEntry
 from sentry.digests.backends.base import Backend, InvalidState
+from sentry.utils import metrics
 from sentry.utils.locking.backends.redis import RedisLockBackend
 from sentry.utils.locking.manager import LockManager
 from sentry.utils.redis import check_cluster_versions, get_cluster_from_options, load_script
@@ -84,6 +86,21 @@ class RedisBackend(Backend):
         # too early.
         self.ttl = options.pop("ttl", 60 * 60)
 
+        # The maximum number of partitions (hosts) that are scheduled or
+        # maintained concurrently. Each partition is handled by a separate
+        # thread, and results are returned as soon as a partition completes so
+        # that a single slow host doesn't hold up the others.
+        self.partition_concurrency = options.pop("partition_concurrency", 8)
+
+        # The maximum number of timelines that can be moved from the "waiting"
+        # to the "ready" state per partition during each ``schedule`` call.
+        # Timelines exceeding this limit remain waiting (oldest are scheduled
+        # first) and will be picked up by the next scheduling call. A value of
+        # ``None`` disables the limit.
+        self.schedule_limit = options.pop("schedule_limit", None)
+        if self.schedule_limit is not None and self.schedule_limit < 1:
+            raise ValueError("Schedule limit must be at least 1 if used.")
+
         super(RedisBackend, self).__init__(**options)
 
     def validate(self):
@@ -130,28 +147,63 @@ class RedisBackend(Backend):
             )
         )
 
+    def __execute_partitions(self, operation, function):
+        """
+        Execute ``function(host)`` for every partition in the cluster
+        concurrently, yielding ``(host, result)`` pairs in the order that the
+        partitions complete. Partitions that fail are logged and skipped.
+        """
+        hosts = list(self.cluster.hosts)
+        if not hosts:
+            return
+
+        def execute(host):
+            with metrics.timer(u"digests.{}.partition".format(operation), tags={"host": host}):
+                return function(host)
+
+        with ThreadPoolExecutor(
+            max_workers=max(1, min(self.partition_concurrency, len(hosts)))
+        ) as executor:
+            futures = {executor.submit(execute, host): host for host in hosts}
+            for future in as_completed(futures):
+                host = futures[future]
+                try:
+                    result = future.result()
+                except Exception as error:
+                    logger.error(
+                        "Failed to perform %s for digest partition %r due to error: %r",
+                        operation,
+                        host,
+                        error,
+                        exc_info=True,
+                    )
+                else:
+                    yield host, result
+
     def __schedule_partition(self, host, deadline, timestamp):
         return script(
             self.cluster.get_local_client(host),
             ["-"],
-            ["SCHEDULE", self.namespace, self.ttl, timestamp, deadline],
+            [
+                "SCHEDULE",
+                self.namespace,
+                self.ttl,
+                timestamp,
+                deadline,
+                self.schedule_limit if self.schedule_limit else -1,
+            ],
         )
 
     def schedule(self, deadline, timestamp=None):
         if timestamp is None:
             timestamp = time.time()
 
-        for host in self.cluster.hosts:
-            try:
-                for key, timestamp in self.__schedule_partition(host, deadline, timestamp):
-                    yield ScheduleEntry(key, float(timestamp))
-            except Exception as error:
-                logger.error(
-                    "Failed to perform scheduling for partition %r due to error: %r",
-                    host,
-                    error,
-                    exc_info=True,
-                )
+        for host, entries in self.__execute_partitions(
+            "schedule", lambda host: self.__schedule_partition(host, deadline, timestamp)
+        ):
+            metrics.timing("digests.schedule.partition.entries", len(entries), tags={"host": host})
+            for key, entry_timestamp in entries:
+                yield ScheduleEntry(key, float(entry_timestamp))
 
     def __maintenance_partition(self, host, deadline, timestamp):
         return script(
@@ -164,16 +216,10 @@ class RedisBackend(Backend):
         if timestamp is None:
             timestamp = time.time()
 
-        for host in self.cluster.hosts:
-            try:
-                self.__maintenance_partition(host, deadline, timestamp)
-            except Exception as error:
-                logger.error(
-                    "Failed to perform maintenance on digest partition %r due to error: %r",
-                    host,
-                    error,
-                    exc_info=True,
-                )
+        for _ in self.__execute_partitions(
+            "maintenance", lambda host: self.__maintenance_partition(host, deadline, timestamp)
+        ):
+            pass
 
     @contextmanager
     def digest(self, key, minimum_delay=None, timestamp=None):
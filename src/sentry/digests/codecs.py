@@ -1,7 +1,9 @@
 from __future__ import absolute_import
 
+import msgpack
 import zlib
 
+from sentry.digests.notifications import EventReference, Notification
 from sentry.utils.compat import pickle
 
 
@@ -19,3 +21,50 @@ class CompressedPickleCodec(Codec):
 
     def decode(self, value):
         return pickle.loads(zlib.decompress(value))
+
+
+class CompactNotificationCodec(Codec):
+    """
+    Encodes digest notifications as a small, versioned msgpack structure that
+    only contains the identifiers required to rebuild the notification when
+    the digest is built, rather than a pickled copy of the event instance.
+
+    Encoded values are prefixed with a format version byte. Values that are
+    not notifications, as well as values that were written by the
+    ``CompressedPickleCodec`` (zlib streams never start with a version byte),
+    are handled by the pickle codec, so records that were added to timelines
+    before switching codecs can still be read.
+    """
+
+    VERSION = b"\x01"
+
+    def __init__(self):
+        self.fallback = CompressedPickleCodec()
+
+    def encode(self, value):
+        if not isinstance(value, Notification):
+            return self.fallback.encode(value)
+
+        reference = EventReference.from_event(value.event)
+        return self.VERSION + msgpack.packb(
+            [
+                reference.event_id,
+                reference.group_id,
+                reference.project_id,
+                reference.timestamp,
+                reference.platform,
+                list(value.rules),
+            ],
+            use_bin_type=True,
+        )
+
+    def decode(self, value):
+        if value[:1] != self.VERSION:
+            return self.fallback.decode(value)
+
+        event_id, group_id, project_id, timestamp, platform, rules = msgpack.unpackb(
+            value[1:], raw=False
+        )
+        return Notification(
+            EventReference(event_id, group_id, project_id, timestamp, platform), rules
+        )
@@ -8,16 +8,54 @@ import six
 from collections import OrderedDict, defaultdict, namedtuple
 from six.moves import reduce
 
+from sentry import eventstore
 from sentry.app import tsdb
 from sentry.digests import Record
-from sentry.models import Project, Group, GroupStatus, Rule
-from sentry.utils.dates import to_timestamp
+from sentry.models import Event, Project, Group, GroupStatus, Rule
+from sentry.utils.dates import to_datetime, to_timestamp
 
 logger = logging.getLogger("sentry.digests")
 
 Notification = namedtuple("Notification", "event rules")
 
 
+class EventReference(
+    namedtuple("EventReference", "event_id group_id project_id timestamp platform")
+):
+    """
+    A lightweight stand-in for an ``Event`` that only holds the identifiers
+    needed to load it again. Records decoded by the compact codec contain
+    these instead of event instances, and they are resolved back into events
+    in bulk when the digest is built (see ``rehydrate_records``.)
+    """
+
+    @classmethod
+    def from_event(cls, event):
+        if isinstance(event, cls):
+            return event
+        return cls(
+            event.event_id,
+            event.group_id,
+            event.project_id,
+            to_timestamp(event.datetime),
+            event.platform,
+        )
+
+    @property
+    def datetime(self):
+        return to_datetime(self.timestamp)
+
+    def to_event(self):
+        return Event(
+            event_id=self.event_id,
+            group_id=self.group_id,
+            project_id=self.project_id,
+            datetime=self.datetime,
+            platform=self.platform,
+            data={"node_id": Event.generate_node_id(self.project_id, self.event_id)},
+        )
+
+
 def split_key(key):
     from sentry.plugins import plugins  # XXX
 
@@ -67,6 +105,34 @@ def fetch_state(project, records):
     }
 
 
+def rehydrate_records(records):
+    """
+    Replace any event references contained in the records with event
+    instances, fetching the event bodies with a single nodestore request.
+    """
+    events = {}
+    for record in records:
+        event = record.value.event
+        if isinstance(event, EventReference) and event not in events:
+            events[event] = event.to_event()
+
+    if not events:
+        return records
+
+    eventstore.bind_nodes(list(events.values()), "data")
+
+    return [
+        Record(
+            record.key,
+            Notification(events[record.value.event], record.value.rules),
+            record.timestamp,
+        )
+        if isinstance(record.value.event, EventReference)
+        else record
+        for record in records
+    ]
+
+
 def attach_state(project, groups, rules, event_counts, user_counts):
     for id, group in six.iteritems(groups):
         assert group.project_id == project.id, "Group must belong to Project"
@@ -193,6 +259,8 @@ def build_digest(project, records, state=None):
     if state is None:
         state = fetch_state(project, records)
 
+    records = rehydrate_records(records)
+
     state = attach_state(**state)
 
     def check_group_state(record):
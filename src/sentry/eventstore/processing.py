@@ -0,0 +1,85 @@
+from __future__ import absolute_import
+
+__all__ = ["EventProcessingStore", "event_processing_store"]
+
+import msgpack
+import six
+import zlib
+
+from sentry.cache import default_cache
+from sentry.utils import json, metrics
+from sentry.utils.canonical import CANONICAL_TYPES, CanonicalKeyDict
+
+
+def _downgrade(value):
+    # We cannot persist canonical types, so we need to downgrade them.
+    if isinstance(value, CanonicalKeyDict):
+        return value.data
+    if isinstance(value, CANONICAL_TYPES):
+        return dict(value.items())
+    raise TypeError("Cannot serialize %r" % (type(value),))
+
+
+class EventProcessingStore(object):
+    """
+    Holds event payloads while they pass through the ``preprocess_event``,
+    ``process_event`` and ``save_event`` tasks. Tasks only pass the cache key
+    along, the payload is written once on ingestion and only rewritten by
+    stages that change it.
+
+    Payloads are encoded as zlib compressed msgpack, prefixed with a format
+    version byte and the name of the stage that wrote them. Values written
+    before the store existed (plain dicts, or JSON when the cache is backed by
+    Redis) can still be read.
+    """
+
+    VERSION = b"\x01"
+
+    def __init__(self, inner, timeout=3600):
+        self.inner = inner
+        self.timeout = timeout
+
+    def encode(self, data, stage):
+        if isinstance(data, CANONICAL_TYPES):
+            data = _downgrade(data)
+        payload = zlib.compress(msgpack.packb(data, default=_downgrade, use_bin_type=False))
+        return self.VERSION + msgpack.packb([stage, payload], use_bin_type=True)
+
+    def decode(self, value):
+        """
+        Returns a tuple of the stage that wrote the value and the payload.
+        """
+        if isinstance(value, dict):
+            return None, value
+        if value[:1] != self.VERSION:
+            return None, json.loads(value)
+
+        stage, payload = msgpack.unpackb(value[1:], raw=False)
+        return stage, msgpack.unpackb(zlib.decompress(payload), raw=False)
+
+    def store(self, key, data, stage, timeout=None):
+        with metrics.timer("events.processing_store.store", tags={"stage": stage}):
+            value = self.encode(data, stage)
+            self.inner.set(key, value, timeout or self.timeout, raw=True)
+        metrics.timing("events.processing_store.size", len(value), tags={"stage": stage})
+
+    def get(self, key, stage):
+        with metrics.timer("events.processing_store.get", tags={"stage": stage}):
+            value = self.inner.get(key, raw=True)
+            if value is None:
+                return None
+            written_by, data = self.decode(value)
+
+        if isinstance(value, six.binary_type):
+            metrics.timing(
+                "events.processing_store.read_size",
+                len(value),
+                tags={"stage": stage, "written_by": written_by or "legacy"},
+            )
+        return data
+
+    def delete(self, key):
+        self.inner.delete(key)
+
+
+event_processing_store = EventProcessingStore(default_cache)
@@ -9,7 +9,7 @@ from django.conf import settings
 from django.core.cache import cache
 
 from sentry.coreapi import cache_key_for_event
-from sentry.cache import default_cache
+from sentry.eventstore.processing import event_processing_store
 from sentry.models import Project
 from sentry.signals import event_accepted
 from sentry.tasks.store import preprocess_event
@@ -74,7 +74,7 @@ class IngestConsumerWorker(AbstractBatchWorker):
 
         cache_timeout = 3600
         cache_key = cache_key_for_event(data)
-        default_cache.set(cache_key, data, cache_timeout)
+        event_processing_store.store(cache_key, data, "ingest", cache_timeout)
 
         # Preprocess this event, which spawns either process_event or
         # save_event. Pass data explicitly to avoid fetching it again from the
@@ -27,6 +27,7 @@ from sentry.models import (
     Repository,
 )
 from sentry.utils import json
+from sentry.utils.committers import invalidate_commit_file_indexes
 
 from sentry.integrations.exceptions import ApiError
 from .repository import GitHubRepositoryProvider
@@ -174,6 +175,7 @@ class PushEventWebhook(Webhook):
         authors = {}
         client = integration.get_installation(organization_id=organization.id).get_client()
         gh_username_cache = {}
+        file_change_commit_ids = set()
 
         for commit in event["commits"]:
             if not commit["distinct"]:
@@ -299,6 +301,11 @@ class PushEventWebhook(Webhook):
                         )
             except IntegrityError:
                 pass
+            else:
+                file_change_commit_ids.add(c.id)
+
+        if file_change_commit_ids:
+            invalidate_commit_file_indexes(file_change_commit_ids)
 
 
 class PullRequestEventWebhook(Webhook):
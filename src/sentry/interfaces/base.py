@@ -68,7 +68,8 @@ class Interface(object):
     render differently than the default ``extra`` metadata in an event.
     """
 
-    _data = None
+    __slots__ = ("_data",)
+
     score = 0
     display_score = None
     ephemeral = False
@@ -98,16 +99,16 @@ class Interface(object):
         return {"_data": self._data}
 
     def __setstate__(self, state):
-        self.__dict__.update(state)
-        if not hasattr(self, "_data"):
-            self._data = {}
+        object.__setattr__(self, "_data", state.get("_data", {}))
 
     def __getattr__(self, name):
+        if name == "_data":
+            raise AttributeError(name)
         return self._data[name]
 
     def __setattr__(self, name, value):
         if name == "_data":
-            self.__dict__["_data"] = value
+            object.__setattr__(self, name, value)
         else:
             self._data[name] = value
 
@@ -177,39 +177,110 @@ def handle_nan(value):
     return value
 
 
+FRAME_ATTRIBUTES = (
+    "abs_path",
+    "colno",
+    "context_line",
+    "data",
+    "errors",
+    "filename",
+    "function",
+    "raw_function",
+    "image_addr",
+    "in_app",
+    "instruction_addr",
+    "lineno",
+    "module",
+    "package",
+    "platform",
+    "post_context",
+    "pre_context",
+    "symbol",
+    "symbol_addr",
+    "trust",
+    "vars",
+)
+
+_frame_attributes = frozenset(FRAME_ATTRIBUTES)
+
+
 class Frame(Interface):
+    """
+    A single frame of a stacktrace.
+
+    Frames created by ``to_python`` share the frame data of the event until
+    they are modified (or their raw data is requested), at which point they
+    take a private copy. Attributes missing from the data read as ``None``.
+    """
+
+    __slots__ = ("_shared", "_json")
+
     grouping_variants = ["system", "app"]
 
+    def __init__(self, **data):
+        super(Frame, self).__init__(**data)
+        object.__setattr__(self, "_shared", False)
+        object.__setattr__(self, "_json", None)
+
+    def __getstate__(self):
+        return {"_data": self._get_data()}
+
+    def __setstate__(self, state):
+        super(Frame, self).__setstate__(state)
+        object.__setattr__(self, "_shared", False)
+        object.__setattr__(self, "_json", None)
+
+    def __getattr__(self, name):
+        if name in Frame.__slots__ or name == "_data":
+            raise AttributeError(name)
+        try:
+            return self._data[name]
+        except KeyError:
+            if name in _frame_attributes:
+                return None
+            raise
+
+    def __setattr__(self, name, value):
+        self._unshare()[name] = value
+
+    def __eq__(self, other):
+        if not isinstance(self, type(other)):
+            return False
+        return self._get_data() == other._get_data()
+
+    def _get_data(self):
+        if not self._shared:
+            return self._data
+        data = dict.fromkeys(FRAME_ATTRIBUTES)
+        data.update(self._data)
+        return data
+
+    def _unshare(self):
+        if self._shared:
+            object.__setattr__(self, "_data", self._get_data())
+            object.__setattr__(self, "_shared", False)
+        object.__setattr__(self, "_json", None)
+        return self._data
+
     @classmethod
     def to_python(cls, data, raw=False):
-        for key in (
-            "abs_path",
-            "colno",
-            "context_line",
-            "data",
-            "errors",
-            "filename",
-            "function",
-            "raw_function",
-            "image_addr",
-            "in_app",
-            "instruction_addr",
-            "lineno",
-            "module",
-            "package",
-            "platform",
-            "post_context",
-            "pre_context",
-            "symbol",
-            "symbol_addr",
-            "trust",
-            "vars",
-        ):
-            data.setdefault(key, None)
-        return cls(**data)
+        frame = cls.__new__(cls)
+        object.__setattr__(frame, "_data", data)
+        object.__setattr__(frame, "_shared", True)
+        object.__setattr__(frame, "_json", None)
+        return frame
+
+    def get_raw_data(self):
+        # The caller may modify the data
+        return self._unshare()
 
     def to_json(self):
-        return prune_empty_keys(
+        # The event data of shared frames doesn't change, so their JSON is
+        # only built once.
+        if self._json is not None:
+            return dict(self._json)
+
+        rv = prune_empty_keys(
             {
                 "abs_path": self.abs_path or None,
                 "filename": self.filename or None,
@@ -234,6 +305,10 @@ class Frame(Interface):
                 "colno": self.colno,
             }
         )
+        if self._shared:
+            object.__setattr__(self, "_json", rv)
+            return dict(rv)
+        return rv
 
     def get_api_context(self, is_public=False, pad_addr=None, platform=None):
         from sentry.stacktraces.functions import get_function_name_for_frame
@@ -465,6 +540,8 @@ class Stacktrace(Interface):
               to the full interface path.
     """
 
+    __slots__ = ()
+
     score = 1950
     grouping_variants = ["system", "app"]
 
@@ -1,7 +1,10 @@
 from __future__ import absolute_import
 
+import os
 import six
+import threading
 
+from collections import OrderedDict
 from symbolic import ProguardMappingView
 from sentry.plugins import Plugin2
 from sentry.stacktraces.processing import StacktraceProcessor
@@ -11,6 +14,57 @@ from sentry.utils.safe import get_path
 
 FRAME_CACHE_VERSION = 2
 
+# Bounds for the mapping views kept open across events.
+MAPPING_VIEW_CACHE_SIZE = 20
+MAPPING_VIEW_CACHE_MAX_BYTES = 1024 * 1024 * 1024
+
+
+class MappingViewCache(object):
+    """
+    A per-process LRU of open proguard mapping views, bounded by the number
+    of views and the total size of the mapped files.
+
+    Views are keyed by the path of the mapping in the DIF cache, which is
+    derived from the checksum of the file, so replacing a mapping file never
+    serves a view of its previous version.
+    """
+
+    def __init__(self, size, max_bytes):
+        self.size = size
+        self.max_bytes = max_bytes
+        self.views = OrderedDict()
+        self.total_bytes = 0
+        self.lock = threading.Lock()
+
+    def open(self, path):
+        with self.lock:
+            item = self.views.pop(path, None)
+            if item is not None:
+                self.views[path] = item
+                return item[0]
+
+        size = os.path.getsize(path)
+        view = ProguardMappingView.open(path)
+
+        with self.lock:
+            if path not in self.views:
+                self.views[path] = (view, size)
+                self.total_bytes += size
+            while len(self.views) > 1 and (
+                len(self.views) > self.size or self.total_bytes > self.max_bytes
+            ):
+                _, (_, evicted_size) = self.views.popitem(last=False)
+                self.total_bytes -= evicted_size
+        return view
+
+    def clear(self):
+        with self.lock:
+            self.views.clear()
+            self.total_bytes = 0
+
+
+mapping_view_cache = MappingViewCache(MAPPING_VIEW_CACHE_SIZE, MAPPING_VIEW_CACHE_MAX_BYTES)
+
 
 def is_valid_image(image):
     return bool(image) and image.get("type") == "proguard" and image.get("uuid") is not None
@@ -57,7 +111,7 @@ class JavaStacktraceProcessor(StacktraceProcessor):
             if dif_path is None:
                 error_type = EventError.PROGUARD_MISSING_MAPPING
             else:
-                view = ProguardMappingView.open(dif_path)
+                view = mapping_view_cache.open(dif_path)
                 if not view.has_line_info:
                     error_type = EventError.PROGUARD_MISSING_LINENO
                 else:
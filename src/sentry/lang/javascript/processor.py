@@ -201,17 +201,23 @@ def discover_sourcemap(result):
 
 
 def fetch_release_file(filename, release, dist=None):
+    dist_name = dist and dist.name or None
+    filename_choices = ReleaseFile.normalize(filename)
+    filename_idents = [ReleaseFile.get_ident(f, dist_name) for f in filename_choices]
+
+    # Most files referenced by events (e.g. third party scripts) were never
+    # uploaded, which the manifest of the release answers from memory.
+    manifest = ReleaseFile.objects.get_manifest(release, dist)
+    if manifest is not None and manifest.isdisjoint(filename_idents):
+        metrics.incr("sourcemaps.release_file.manifest_miss", skip_internal=False)
+        return None
+
     cache_key = "releasefile:v1:%s:%s" % (release.id, md5_text(filename).hexdigest())
 
     logger.debug("Checking cache for release artifact %r (release_id=%s)", filename, release.id)
     result = cache.get(cache_key)
 
-    dist_name = dist and dist.name or None
-
     if result is None:
-        filename_choices = ReleaseFile.normalize(filename)
-        filename_idents = [ReleaseFile.get_ident(f, dist_name) for f in filename_choices]
-
         logger.debug(
             "Checking database for release artifact %r (release_id=%s)", filename, release.id
         )
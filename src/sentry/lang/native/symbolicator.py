@@ -4,10 +4,13 @@ import sys
 import jsonschema
 import logging
 import six
+import threading
 import time
+import uuid
 
 from django.conf import settings
 from django.core.urlresolvers import reverse
+from django.utils.encoding import force_text
 
 from requests.exceptions import RequestException
 from six.moves.urllib.parse import urljoin
@@ -118,6 +121,8 @@ class Symbolicator(object):
     def _process(self, create_task):
         task_id = default_cache.get(self.task_id_cache_key)
         json = None
+        deadline = time.time() + (options.get("symbolicator.poll-timeout") or 0)
+        polls = 0
 
         with self.sess:
             try:
@@ -134,6 +139,23 @@ class Symbolicator(object):
                     # have a response ready immediately, so we start polling after
                     # some timeout.
                     json = create_task()
+
+                # If configured, keep polling on the open connection while the
+                # poll budget allows for another poll (which symbolicator holds
+                # for up to the timeout we pass), rather than going through the
+                # queue after every response.
+                while (
+                    json["status"] == "pending" and time.time() + SYMBOLICATOR_TIMEOUT <= deadline
+                ):
+                    polls += 1
+                    response = self.sess.query_task(json["request_id"])
+                    if response is None:
+                        # Symbolicator lost the task. Create it only once more
+                        # and leave polling it to the retried task, so that
+                        # large minidumps are not uploaded over and over.
+                        json = create_task()
+                        break
+                    json = response
             except ServiceUnavailable:
                 # 503 can indicate that symbolicator is restarting. Wait for a
                 # reboot, then try again. This overrides the default behavior of
@@ -146,6 +168,7 @@ class Symbolicator(object):
                 "events.symbolicator.response",
                 tags={"response": json.get("status") or "null", "project_id": self.sess.project_id},
             )
+            metrics.timing("events.symbolicator.polls", polls)
 
             # Symbolication is still in progress. Bail out and try again
             # after some timeout. Symbolicator keeps the response for the
@@ -287,6 +310,94 @@ def get_sources_for_project(project):
     return sources
 
 
+class MultipartFileBody(object):
+    """
+    A ``multipart/form-data`` request body with form fields and a single
+    file from an attachment. The attachment is read in chunks while the
+    request is sent, instead of encoding the entire body in memory.
+    """
+
+    def __init__(self, fields, name, attachment):
+        self.boundary = uuid.uuid4().hex
+        self.content_type = "multipart/form-data; boundary=%s" % (self.boundary,)
+
+        head = []
+        for key, value in fields:
+            head.append(
+                u'--%s\r\nContent-Disposition: form-data; name="%s"\r\n\r\n%s\r\n'
+                % (self.boundary, key, force_text(value))
+            )
+        head.append(
+            u'--%s\r\nContent-Disposition: form-data; name="%s"; filename="%s"\r\n'
+            u"Content-Type: application/octet-stream\r\n\r\n"
+            % (self.boundary, name, force_text(attachment.name or name))
+        )
+        self._head = u"".join(head).encode("utf-8")
+        self._tail = (u"\r\n--%s--\r\n" % (self.boundary,)).encode("utf-8")
+        self._attachment = attachment
+        self._size = len(self._head) + attachment.size + len(self._tail)
+        self.seek(0)
+
+    def __len__(self):
+        return self._size
+
+    def tell(self):
+        return self._pos
+
+    def seek(self, pos, whence=0):
+        # The body can only be rewound, which is required to retry requests.
+        if pos != 0 or whence != 0:
+            raise IOError("Can only seek to the start of the body")
+
+        self._parts = iter(
+            [six.BytesIO(self._head), self._attachment.open(), six.BytesIO(self._tail)]
+        )
+        self._part = next(self._parts)
+        self._pos = 0
+
+    def read(self, size=-1):
+        result = []
+        while self._part is not None and size != 0:
+            data = self._part.read(size)
+            if not data:
+                self._part = next(self._parts, None)
+                continue
+            result.append(data)
+            self._pos += len(data)
+            if size > 0:
+                size -= len(data)
+
+        return b"".join(result)
+
+
+class SessionPool(threading.local):
+    """
+    Keeps one HTTP session per symbolicator URL and thread, so that
+    connections are kept alive across the events a worker processes.
+    """
+
+    def __init__(self):
+        self.sessions = {}
+
+    def get(self, url):
+        session = self.sessions.get(url)
+        if session is None:
+            session = self.sessions[url] = Session()
+        return session
+
+    def discard(self, url):
+        session = self.sessions.pop(url, None)
+        if session is not None:
+            session.close()
+
+    def clear(self):
+        for url in list(self.sessions):
+            self.discard(url)
+
+
+session_pool = SessionPool()
+
+
 class SymbolicatorSession(object):
     def __init__(self, url=None, sources=None, project_id=None, event_id=None, timeout=None):
         self.url = url
@@ -307,12 +418,12 @@ class SymbolicatorSession(object):
 
     def open(self):
         if self.session is None:
-            self.session = Session()
+            self.session = session_pool.get(self.url)
 
     def close(self):
-        if self.session is not None:
-            self.session.close()
-            self.session = None
+        # The session is returned to the pool and its connections are reused
+        # by the next event.
+        self.session = None
 
     def _ensure_open(self):
         if not self.session:
@@ -332,6 +443,9 @@ class SymbolicatorSession(object):
 
         while True:
             try:
+                if isinstance(kwargs.get("data"), MultipartFileBody):
+                    kwargs["data"].seek(0)
+
                 response = self.session.request(method, url, **kwargs)
 
                 metrics.incr(
@@ -361,6 +475,11 @@ class SymbolicatorSession(object):
                 return json
             except (IOError, RequestException):
                 attempts += 1
+
+                # Do not reuse connections that might be broken.
+                session_pool.discard(self.url)
+                self.session = session_pool.get(self.url)
+
                 # Any server error needs to be treated as a failure. We can
                 # retry a couple of times, but ultimately need to bail out.
                 #
@@ -380,23 +499,21 @@ class SymbolicatorSession(object):
 
         return self._request("post", "symbolicate", params=self._query_params, json=json)
 
-    def upload_minidump(self, minidump):
+    def _upload_attachment(self, path, name, attachment):
+        body = MultipartFileBody([("sources", json.dumps(self.sources))], name, attachment)
         return self._request(
             method="post",
-            path="minidump",
+            path=path,
             params=self._query_params,
-            data={"sources": json.dumps(self.sources)},
-            files={"upload_file_minidump": minidump},
+            data=body,
+            headers={"Content-Type": body.content_type},
         )
 
+    def upload_minidump(self, minidump):
+        return self._upload_attachment("minidump", "upload_file_minidump", minidump)
+
     def upload_applecrashreport(self, report):
-        return self._request(
-            method="post",
-            path="applecrashreport",
-            params=self._query_params,
-            data={"sources": json.dumps(self.sources)},
-            files={"apple_crash_report": report},
-        )
+        return self._upload_attachment("applecrashreport", "apple_crash_report", report)
 
     def query_task(self, task_id):
         task_url = "requests/%s" % (task_id,)
@@ -0,0 +1,185 @@
+from __future__ import absolute_import
+
+__all__ = ["AggregatingMetricsBackend"]
+
+import logging
+import math
+import six
+import threading
+import time
+import weakref
+
+from collections import defaultdict
+
+from sentry.utils.imports import import_string
+
+from .base import MetricsBackend
+
+logger = logging.getLogger("sentry.metrics")
+
+
+class TimingSketch(object):
+    """
+    A mergeable histogram of timings which answers percentile queries with a
+    bounded relative error (``accuracy``.) Values are counted in exponentially
+    sized buckets, so recording a value is a single dict update regardless of
+    how many values have been recorded.
+    """
+
+    def __init__(self, accuracy=0.01):
+        self.gamma = (1 + accuracy) / (1 - accuracy)
+        self.log_gamma = math.log(self.gamma)
+        self.buckets = defaultdict(int)
+        self.count = 0
+        self.total = 0.0
+        self.min = None
+        self.max = None
+
+    def add(self, value):
+        if value > 0:
+            self.buckets[int(math.ceil(math.log(value) / self.log_gamma))] += 1
+        else:
+            self.buckets[None] += 1
+        self.count += 1
+        self.total += value
+        if self.min is None or value < self.min:
+            self.min = value
+        if self.max is None or value > self.max:
+            self.max = value
+
+    def percentile(self, p):
+        """
+        Returns the approximate value below which ``p`` (between 0 and 1) of the
+        recorded values fall.
+        """
+        if not self.count:
+            return None
+
+        rank = p * (self.count - 1)
+        seen = self.buckets.get(None, 0)
+        if seen > rank:
+            return 0.0
+        for index in sorted(k for k in self.buckets if k is not None):
+            seen += self.buckets[index]
+            if seen > rank:
+                # The middle of the bucket, clamped to the observed range.
+                value = 2 * self.gamma ** index / (self.gamma + 1)
+                return min(max(value, self.min), self.max)
+        return self.max
+
+
+class MetricsAggregator(object):
+    """
+    Accumulates metrics in process, and periodically forwards them to a
+    backend from a background thread.
+    """
+
+    def __init__(self, backend, interval, percentiles):
+        self.backend = backend
+        self.interval = interval
+        self.percentiles = percentiles
+        self.lock = threading.Lock()
+        self.counters = defaultdict(int)
+        self.timings = {}
+        self._started = False
+
+    def _start(self):
+        def worker():
+            while True:
+                time.sleep(self.interval)
+                try:
+                    self.flush()
+                except Exception:
+                    logger.exception("Unable to flush aggregated metrics")
+
+        t = threading.Thread(target=worker)
+        t.setDaemon(True)
+        t.start()
+
+        self._started = True
+
+    def _get_key(self, key, instance, tags):
+        return (key, instance, tuple(sorted(six.iteritems(tags))) if tags else None)
+
+    def incr(self, key, instance, tags, amount):
+        key = self._get_key(key, instance, tags)
+        with self.lock:
+            if not self._started:
+                self._start()
+            self.counters[key] += amount
+
+    def timing(self, key, instance, tags, value):
+        key = self._get_key(key, instance, tags)
+        with self.lock:
+            if not self._started:
+                self._start()
+            sketch = self.timings.get(key)
+            if sketch is None:
+                sketch = self.timings[key] = TimingSketch()
+            sketch.add(value)
+
+    def flush(self):
+        with self.lock:
+            counters, self.counters = self.counters, defaultdict(int)
+            timings, self.timings = self.timings, {}
+
+        for (key, instance, tags), amount in six.iteritems(counters):
+            self.backend.incr(key, instance, dict(tags) if tags else None, amount)
+
+        for (key, instance, tags), sketch in six.iteritems(timings):
+            self.backend.incr(
+                u"{}.count".format(key), instance, dict(tags) if tags else None, sketch.count
+            )
+            values = [(u"{}.avg".format(key), sketch.total / sketch.count)]
+            values.append((u"{}.max".format(key), sketch.max))
+            for p in self.percentiles:
+                values.append((u"{}.p{:g}".format(key, p * 100), sketch.percentile(p)))
+            for name, value in values:
+                self.backend.timing(name, value, instance, dict(tags) if tags else None)
+
+
+# Backends are thread locals, which share the aggregator between all threads
+# of a process.
+_aggregators = weakref.WeakKeyDictionary()
+_aggregators_lock = threading.Lock()
+
+
+class AggregatingMetricsBackend(MetricsBackend):
+    """
+    Wraps another metrics backend, and aggregates all metrics in process so
+    that recording a metric is a dict update. Every ``interval`` seconds the
+    accumulated amount of each counter (per key, instance and tags) is
+    forwarded as a single increment.
+
+    Timings are summarized into ``<key>.count`` increments and ``<key>.avg``,
+    ``<key>.max`` and ``<key>.p<percentile>`` timings. Sampling is not
+    necessary when aggregating, every metric is counted.
+
+    Metrics recorded in the last interval before the process exits are lost.
+    """
+
+    def __init__(
+        self,
+        backend="sentry.metrics.dummy.DummyMetricsBackend",
+        backend_options=None,
+        interval=10,
+        percentiles=(0.5, 0.95, 0.99),
+        **kwargs
+    ):
+        super(AggregatingMetricsBackend, self).__init__(**kwargs)
+        with _aggregators_lock:
+            aggregator = _aggregators.get(self)
+            if aggregator is None:
+                aggregator = _aggregators[self] = MetricsAggregator(
+                    import_string(backend)(**(backend_options or {})), interval, percentiles
+                )
+        self.aggregator = aggregator
+
+    def incr(self, key, instance=None, tags=None, amount=1, sample_rate=1):
+        self.aggregator.incr(key, instance, tags, amount)
+
+    def timing(self, key, value, instance=None, tags=None, sample_rate=1):
+        self.aggregator.timing(key, instance, tags, value)
+
+    def flush(self):
+        self.aggregator.flush()
@@ -6,6 +6,7 @@ import six
 import uuid
 import time
 import errno
+import fcntl
 import shutil
 import hashlib
 import logging
@@ -20,6 +21,8 @@ from sentry.constants import KNOWN_DIF_FORMATS
 from sentry.db.models import FlexibleForeignKey, Model, sane_repr, BaseManager, JSONField
 from sentry.models.file import File
 from sentry.reprocessing import resolve_processing_issue, bump_reprocessing_revision
+from sentry.utils import metrics
+from sentry.utils.cache import cache
 from sentry.utils.zip import safe_extract_zip
 
 
@@ -32,6 +35,10 @@ ONE_DAY_AND_A_HALF = int(ONE_DAY * 1.5)
 # 10 minutes is assumed to be a reasonable value here.
 CONVERSION_ERROR_TTL = 60 * 10
 
+# How long the debug files resolved for a debug id are cached.  Uploads and
+# deletions of debug files invalidate this explicitly.
+DIF_LOOKUP_CACHE_TTL = 60 * 10
+
 DIF_MIMETYPES = dict((v, k) for k, v in KNOWN_DIF_FORMATS.items())
 
 _proguard_file_re = re.compile(r"/proguard/(?:mapping-)?(.*?)\.txt$")
@@ -87,24 +94,43 @@ class ProjectDebugFileManager(BaseManager):
 
         rv = {}
         for debug_id, group in six.iteritems(difs_by_id):
-            with_features = [dif for dif in group if "features" in (dif.data or ())]
+            dif = select_dif(
+                [(dif, dif.features if "features" in (dif.data or ()) else None) for dif in group],
+                features,
+            )
+            if dif is not None:
+                rv[debug_id] = dif
 
-            # In case we've never computed features for any of these files, we
-            # just take the first one and assume that it matches.
-            if not with_features:
-                rv[debug_id] = group[0]
-                continue
+        return rv
 
-            # There's at least one file with computed features. Older files are
-            # considered redundant and will be deleted. We search for the first
-            # file matching the given feature set. This might not resolve if no
-            # DIF matches the given feature set.
-            for dif in with_features:
-                if dif.features >= features:
-                    rv[debug_id] = dif
-                    break
+    def post_save(self, instance, **kwargs):
+        ProjectDebugFile.difcache.invalidate(instance.project_id, instance.debug_id)
+
+    def post_delete(self, instance, **kwargs):
+        ProjectDebugFile.difcache.invalidate(instance.project_id, instance.debug_id)
 
-        return rv
+
+def select_dif(candidates, features):
+    """Selects the debug file to use out of ``(dif, features)`` tuples for
+    the same debug identifier, ordered from newest to oldest.  ``features``
+    of a candidate is `None` if they have never been computed for it.
+    """
+    with_features = [
+        (dif, dif_features) for dif, dif_features in candidates if dif_features is not None
+    ]
+
+    # In case we've never computed features for any of these files, we
+    # just take the first one and assume that it matches.
+    if not with_features:
+        return candidates[0][0] if candidates else None
+
+    # There's at least one file with computed features. Older files are
+    # considered redundant and will be deleted. We search for the first
+    # file matching the given feature set. This might not resolve if no
+    # DIF matches the given feature set.
+    for dif, dif_features in with_features:
+        if dif_features >= features:
+            return dif
 
 
 class ProjectDebugFile(Model):
@@ -403,30 +429,134 @@ class DIFCache(object):
     def cache_path(self):
         return options.get("dsym.cache-path")
 
-    def get_project_path(self, project):
-        return os.path.join(self.cache_path, six.text_type(project.id))
+    def _get_lookup_key(self, project_id, debug_id):
+        return u"difcache:lookup:{}:{}".format(project_id, debug_id)
+
+    def invalidate(self, project_id, debug_id):
+        cache.delete(self._get_lookup_key(project_id, debug_id))
+
+    def resolve_difs(self, project, debug_ids, features=None):
+        """Like `ProjectDebugFileManager.find_by_debug_ids`, but returns a
+        ``(file_id, checksum)`` tuple per debug id.  The candidates for every
+        debug id are cached, so that steady-state lookups need no queries.
+        """
+        features = frozenset(features) if features is not None else frozenset()
+        keys = dict(
+            (self._get_lookup_key(project.id, debug_id), debug_id) for debug_id in debug_ids
+        )
+        candidates = dict(
+            (keys[key], value) for key, value in six.iteritems(cache.get_many(list(keys)))
+        )
+
+        missing = [debug_id for debug_id in debug_ids if debug_id not in candidates]
+        if missing:
+            to_cache = dict((debug_id, []) for debug_id in missing)
+            difs = (
+                ProjectDebugFile.objects.filter(project=project, debug_id__in=missing)
+                .select_related("file")
+                .order_by("-id")
+            )
+            for dif in difs:
+                to_cache[dif.debug_id].append(
+                    (
+                        (dif.file_id, dif.file.checksum),
+                        list(dif.features) if "features" in (dif.data or ()) else None,
+                    )
+                )
+            cache.set_many(
+                dict(
+                    (self._get_lookup_key(project.id, debug_id), value)
+                    for debug_id, value in six.iteritems(to_cache)
+                ),
+                DIF_LOOKUP_CACHE_TTL,
+            )
+            candidates.update(to_cache)
+
+        rv = {}
+        for debug_id, group in six.iteritems(candidates):
+            dif = select_dif(
+                [
+                    (tuple(dif), frozenset(dif_features) if dif_features is not None else None)
+                    for dif, dif_features in group
+                ],
+                features,
+            )
+            if dif is not None:
+                rv[debug_id] = dif
+        return rv
+
+    def get_file_path(self, checksum):
+        return os.path.join(self.cache_path, checksum[:2], checksum)
+
+    def get_lock_path(self, checksum):
+        # Locks are kept apart from the cached files, so that evictions
+        # never count or remove them.
+        return os.path.join(self.cache_path, ".locks", checksum + ".lock")
+
+    def fetch_file(self, file_id, checksum):
+        """Returns the path of the file with the given checksum in the cache,
+        and downloads it if necessary.  Only one process downloads a file,
+        while the others wait for it.
+        """
+        path = self.get_file_path(checksum)
+        try:
+            # Keeps track of the last use for evictions.
+            os.utime(path, None)
+        except OSError as e:
+            if e.errno != errno.ENOENT:
+                raise
+        else:
+            metrics.incr("dif_cache.hit", skip_internal=False)
+            return path
+
+        lock_path = self.get_lock_path(checksum)
+        for dirname in (os.path.dirname(path), os.path.dirname(lock_path)):
+            try:
+                os.makedirs(dirname)
+            except OSError:
+                pass
+
+        with open(lock_path, "a") as lock:
+            fcntl.flock(lock, fcntl.LOCK_EX)
+            try:
+                if os.path.isfile(path):
+                    metrics.incr("dif_cache.hit", skip_internal=False)
+                else:
+                    metrics.incr("dif_cache.miss", skip_internal=False)
+                    with metrics.timer("dif_cache.download"):
+                        File.objects.get(id=file_id).save_to(path)
+
+                # The lock is removed while it is still held.  Processes
+                # waiting for it find the file in place once they get it.
+                try:
+                    os.remove(lock_path)
+                except OSError:
+                    pass
+            finally:
+                fcntl.flock(lock, fcntl.LOCK_UN)
+
+        return path
 
     def fetch_difs(self, project, debug_ids, features=None):
         """Given some ids returns an id to path mapping for where the
-        debug symbol files are on the FS.
+        debug symbol files are on the FS.  Files are stored by their checksum,
+        so they are shared between projects, and a replaced debug file is
+        never confused with its previous version.
         """
         debug_ids = [six.text_type(debug_id).lower() for debug_id in debug_ids]
-        difs = ProjectDebugFile.objects.find_by_debug_ids(project, debug_ids, features)
+        difs = self.resolve_difs(project, debug_ids, features)
 
         rv = {}
-        for debug_id, dif in six.iteritems(difs):
-            dif_path = os.path.join(self.get_project_path(project), debug_id)
-            try:
-                os.stat(dif_path)
-            except OSError as e:
-                if e.errno != errno.ENOENT:
-                    raise
-                dif.file.save_to(dif_path)
-            rv[debug_id] = dif_path
+        for debug_id, (file_id, checksum) in six.iteritems(difs):
+            rv[debug_id] = self.fetch_file(file_id, checksum)
 
         return rv
 
     def clear_old_entries(self):
+        """Removes files which have not been used for a day and a half, and
+        the least recently used files while the cache is larger than
+        ``dsym.cache-max-size``.
+        """
         try:
             cache_folders = os.listdir(self.cache_path)
         except OSError:
@@ -434,7 +564,10 @@ class DIFCache(object):
 
         cutoff = int(time.time()) - ONE_DAY_AND_A_HALF
 
+        cached_files = []
         for cache_folder in cache_folders:
+            if cache_folder.startswith("."):
+                continue
             cache_folder = os.path.join(self.cache_path, cache_folder)
             try:
                 items = os.listdir(cache_folder)
@@ -443,14 +576,34 @@ class DIFCache(object):
             for cached_file in items:
                 cached_file = os.path.join(cache_folder, cached_file)
                 try:
-                    mtime = os.path.getmtime(cached_file)
+                    stat = os.stat(cached_file)
                 except OSError:
                     continue
-                if mtime < cutoff:
+                if stat.st_mtime < cutoff:
                     try:
                         os.remove(cached_file)
                     except OSError:
                         pass
+                    else:
+                        metrics.incr("dif_cache.evicted", tags={"reason": "age"})
+                else:
+                    cached_files.append((stat.st_mtime, stat.st_size, cached_file))
+
+        max_size = options.get("dsym.cache-max-size")
+        total_size = sum(size for _, size, _ in cached_files)
+        if not max_size or total_size <= max_size:
+            return
+
+        cached_files.sort()
+        for _, size, cached_file in cached_files:
+            if total_size <= max_size:
+                break
+            try:
+                os.remove(cached_file)
+            except OSError:
+                continue
+            total_size -= size
+            metrics.incr("dif_cache.evicted", tags={"reason": "size"})
 
 
 ProjectDebugFile.difcache = DIFCache()
@@ -50,6 +50,9 @@ class EventDict(CanonicalKeyDict):
         if not skip_renormalization and not is_renormalized:
             normalizer = StoreNormalizer(is_renormalize=True, enable_trimming=False)
             data = normalizer.normalize_event(dict(data))
+        elif isinstance(data, NodeData):
+            # Unwrap the node so its data can be copied as a whole.
+            data = data.data
 
         CanonicalKeyDict.__init__(self, data, **kwargs)
 
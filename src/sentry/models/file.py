@@ -3,7 +3,10 @@ from __future__ import absolute_import
 import os
 import six
 import mmap
+import bisect
+import errno
 import tempfile
+import threading
 
 from hashlib import sha1
 from uuid import uuid4
@@ -18,6 +21,7 @@ from django.core.files.storage import get_storage_class
 from django.db import models, transaction, IntegrityError
 from django.utils import timezone
 
+from sentry import options
 from sentry.app import locks
 from sentry.db.models import BoundedPositiveIntegerField, FlexibleForeignKey, JSONField, Model
 from sentry.tasks.files import delete_file as delete_file_task
@@ -31,6 +35,10 @@ UPLOAD_RETRY_TIME = getattr(settings, "SENTRY_UPLOAD_RETRY_TIME", 60)  # 1min
 DEFAULT_BLOB_SIZE = 1024 * 1024  # one mb
 CHUNK_STATE_HEADER = "__state"
 MULTI_BLOB_UPLOAD_CONCURRENCY = 8
+MULTI_BLOB_FETCH_CONCURRENCY = 8
+# The number of blobs fetched in the background while reading a file
+# sequentially.
+BLOB_READ_AHEAD = 2
 MAX_FILE_SIZE = 2 ** 31  # 2GB is the maximum offset supported by fileblob
 
 
@@ -78,6 +86,127 @@ class AssembleChecksumMismatch(Exception):
     pass
 
 
+_read_ahead_executor = None
+_read_ahead_executor_lock = threading.Lock()
+
+
+def _get_read_ahead_executor():
+    global _read_ahead_executor
+    with _read_ahead_executor_lock:
+        if _read_ahead_executor is None:
+            _read_ahead_executor = ThreadPoolExecutor(max_workers=MULTI_BLOB_FETCH_CONCURRENCY)
+        return _read_ahead_executor
+
+
+def _read_blob(blob):
+    with blob.getfile() as f:
+        return f.read()
+
+
+class BlobCache(object):
+    """
+    Keeps the contents of blobs on the local disk. Blobs are deduplicated by
+    checksum, so the cache is shared by all files. The cache is disabled
+    unless ``filestore.blob-cache-path`` is configured.
+    """
+
+    @property
+    def cache_path(self):
+        return options.get("filestore.blob-cache-path")
+
+    def get_path(self, checksum):
+        return os.path.join(self.cache_path, checksum[:2], checksum)
+
+    def getfile(self, blob):
+        path = self.get_path(blob.checksum)
+        try:
+            # Keeps track of the last use for evictions.
+            os.utime(path, None)
+            rv = open(path, "rb")
+        except (IOError, OSError) as e:
+            if e.errno != errno.ENOENT:
+                raise
+        else:
+            metrics.incr("filestore.blob_cache.hit", skip_internal=False)
+            return FileObj(rv)
+
+        metrics.incr("filestore.blob_cache.miss", skip_internal=False)
+        try:
+            os.makedirs(os.path.dirname(path))
+        except OSError:
+            pass
+
+        # Concurrent downloads of the same blob write separate temporary
+        # files and the last rename wins, they all have the same contents.
+        checksum = sha1(b"")
+        with tempfile.NamedTemporaryFile(
+            dir=os.path.dirname(path), prefix="._blob-", delete=False
+        ) as dst:
+            try:
+                with get_storage().open(blob.path) as src:
+                    for chunk in src.chunks():
+                        checksum.update(chunk)
+                        dst.write(chunk)
+            except Exception:
+                os.remove(dst.name)
+                raise
+
+        if checksum.hexdigest() != blob.checksum:
+            os.remove(dst.name)
+            metrics.incr("filestore.blob_cache.checksum_mismatch", skip_internal=False)
+            return get_storage().open(blob.path)
+
+        os.rename(dst.name, path)
+        return FileObj(open(path, "rb"))
+
+    def clear_old_entries(self):
+        """Removes the least recently used blobs while the cache is larger
+        than ``filestore.blob-cache-max-size``.
+        """
+        cache_path = self.cache_path
+        max_size = options.get("filestore.blob-cache-max-size")
+        if not cache_path or not max_size:
+            return
+
+        try:
+            cache_folders = os.listdir(cache_path)
+        except OSError:
+            return
+
+        cached_files = []
+        for cache_folder in cache_folders:
+            cache_folder = os.path.join(cache_path, cache_folder)
+            try:
+                items = os.listdir(cache_folder)
+            except OSError:
+                continue
+            for cached_file in items:
+                cached_file = os.path.join(cache_folder, cached_file)
+                try:
+                    stat = os.stat(cached_file)
+                except OSError:
+                    continue
+                cached_files.append((stat.st_mtime, stat.st_size, cached_file))
+
+        total_size = sum(size for _, size, _ in cached_files)
+        if total_size <= max_size:
+            return
+
+        cached_files.sort()
+        for _, size, cached_file in cached_files:
+            if total_size <= max_size:
+                break
+            try:
+                os.remove(cached_file)
+            except OSError:
+                continue
+            total_size -= size
+            metrics.incr("filestore.blob_cache.evicted")
+
+
+blob_cache = BlobCache()
+
+
 def get_storage():
     from sentry import options
 
@@ -126,24 +255,29 @@ class FileBlob(Model):
         checksums_seen = set()
         blobs_created = []
         blobs_to_save = []
+        blobs_to_own = []
+        futures = []
         locks = set()
         semaphore = Semaphore(value=MULTI_BLOB_UPLOAD_CONCURRENCY)
 
         def _upload_and_pend_chunk(fileobj, size, checksum, lock):
-            logger.debug(
-                "FileBlob.from_files._upload_and_pend_chunk.start",
-                extra={"checksum": checksum, "size": size},
-            )
-            blob = cls(size=size, checksum=checksum)
-            blob.path = cls.generate_unique_path()
-            storage = get_storage()
-            storage.save(blob.path, fileobj)
-            blobs_to_save.append((blob, lock))
-            metrics.timing("filestore.blob-size", size, tags={"function": "from_files"})
-            logger.debug(
-                "FileBlob.from_files._upload_and_pend_chunk.end",
-                extra={"checksum": checksum, "path": blob.path},
-            )
+            try:
+                logger.debug(
+                    "FileBlob.from_files._upload_and_pend_chunk.start",
+                    extra={"checksum": checksum, "size": size},
+                )
+                blob = cls(size=size, checksum=checksum)
+                blob.path = cls.generate_unique_path()
+                storage = get_storage()
+                storage.save(blob.path, fileobj)
+                blobs_to_save.append((blob, lock))
+                metrics.timing("filestore.blob-size", size, tags={"function": "from_files"})
+                logger.debug(
+                    "FileBlob.from_files._upload_and_pend_chunk.end",
+                    extra={"checksum": checksum, "path": blob.path},
+                )
+            finally:
+                semaphore.release()
 
         def _ensure_blob_owned(blob):
             if organization is None:
@@ -154,23 +288,57 @@ class FileBlob(Model):
             except IntegrityError:
                 pass
 
-        def _save_blob(blob):
-            logger.debug("FileBlob.from_files._save_blob.start", extra={"path": blob.path})
-            blob.save()
-            _ensure_blob_owned(blob)
-            logger.debug("FileBlob.from_files._save_blob.end", extra={"path": blob.path})
+        def _ensure_blobs_owned(blobs):
+            if organization is None or not blobs:
+                return
+            owned = set(
+                FileBlobOwner.objects.filter(organization=organization, blob__in=blobs).values_list(
+                    "blob_id", flat=True
+                )
+            )
+            try:
+                with transaction.atomic():
+                    FileBlobOwner.objects.bulk_create(
+                        [
+                            FileBlobOwner(organization=organization, blob=blob)
+                            for blob in blobs
+                            if blob.id not in owned
+                        ]
+                    )
+            except IntegrityError:
+                # Somebody else claimed some of the blobs concurrently.
+                for blob in blobs:
+                    _ensure_blob_owned(blob)
+
+        def _save_blobs(blobs):
+            logger.debug("FileBlob.from_files._save_blobs.start", extra={"count": len(blobs)})
+            cls.objects.bulk_create(blobs)
+            # `bulk_create` does not set the ids of the created rows.
+            ids = dict(
+                cls.objects.filter(checksum__in=[blob.checksum for blob in blobs]).values_list(
+                    "checksum", "id"
+                )
+            )
+            for blob in blobs:
+                blob.id = ids[blob.checksum]
+            _ensure_blobs_owned(blobs)
+            logger.debug("FileBlob.from_files._save_blobs.end", extra={"count": len(blobs)})
 
         def _flush_blobs():
+            pending = []
             while True:
                 try:
-                    blob, lock = blobs_to_save.pop()
+                    pending.append(blobs_to_save.pop())
                 except IndexError:
                     break
 
-                _save_blob(blob)
+            if not pending:
+                return
+
+            _save_blobs([blob for blob, lock in pending])
+            for blob, lock in pending:
                 lock.__exit__(None, None, None)
                 locks.discard(lock)
-                semaphore.release()
 
         try:
             with ThreadPoolExecutor(max_workers=MULTI_BLOB_UPLOAD_CONCURRENCY) as exe:
@@ -184,7 +352,8 @@ class FileBlob(Model):
                     # the checksums and compare it against the reference.  This
                     # also deduplicates duplicates uploaded in the same request.
                     # This is necessary because we acquire multiple locks in one
-                    # go which would let us deadlock otherwise.
+                    # go which would let us deadlock otherwise.  Checksums are
+                    # calculated while the previous files are being uploaded.
                     size, checksum = _get_size_and_checksum(fileobj)
                     if reference_checksum is not None and checksum != reference_checksum:
                         raise IOError("Checksum mismatch")
@@ -199,7 +368,7 @@ class FileBlob(Model):
                     if existing is not None:
                         lock.__exit__(None, None, None)
                         blobs_created.append(existing)
-                        _ensure_blob_owned(existing)
+                        blobs_to_own.append(existing)
                         continue
 
                     # Remember the lock to force unlock all at the end if we
@@ -213,10 +382,17 @@ class FileBlob(Model):
                     # `_flush_blobs` call will take all those uploaded
                     # blobs and associate them with the database.
                     semaphore.acquire()
-                    exe.submit(_upload_and_pend_chunk(fileobj, size, checksum, lock))
+                    futures.append(
+                        exe.submit(_upload_and_pend_chunk, fileobj, size, checksum, lock)
+                    )
                     logger.debug("FileBlob.from_files.end", extra={"checksum": reference_checksum})
 
             _flush_blobs()
+            _ensure_blobs_owned(blobs_to_own)
+
+            # Raise the first error of a failed upload.
+            for future in futures:
+                future.result()
         finally:
             for lock in locks:
                 try:
@@ -293,6 +469,9 @@ class FileBlob(Model):
         """
         assert self.path
 
+        if blob_cache.cache_path:
+            return blob_cache.getfile(self)
+
         storage = get_storage()
         return storage.open(self.path)
 
@@ -452,11 +631,23 @@ class FileBlobIndex(Model):
 
 
 class ChunkedFileBlobIndexWrapper(object):
-    def __init__(self, indexes, mode=None, prefetch=False, prefetch_to=None, delete=True):
+    def __init__(
+        self,
+        indexes,
+        mode=None,
+        prefetch=False,
+        prefetch_to=None,
+        delete=True,
+        read_ahead=BLOB_READ_AHEAD,
+    ):
         # eager load from database incase its a queryset
         self._indexes = list(indexes)
+        self._offsets = [idx.offset for idx in self._indexes]
+        self._read_ahead = read_ahead
+        self._pending = {}
         self._curfile = None
         self._curidx = None
+        self._curpos = None
         if prefetch:
             self.prefetched = True
             self._prefetch(prefetch_to, delete)
@@ -480,20 +671,44 @@ class ChunkedFileBlobIndexWrapper(object):
         rv.seek(0)
         return rv
 
-    def _nextidx(self):
-        assert not self.prefetched, "this makes no sense"
+    def _openidx(self, pos, read_ahead=False):
         old_file = self._curfile
         try:
-            try:
-                self._curidx = six.next(self._idxiter)
-                self._curfile = self._curidx.blob.getfile()
-            except StopIteration:
+            # Drop blobs that were read ahead but are not needed anymore.
+            for pending_pos in list(self._pending):
+                if not pos <= pending_pos <= pos + self._read_ahead:
+                    self._pending.pop(pending_pos).cancel()
+
+            if pos < len(self._indexes):
+                self._curpos = pos
+                self._curidx = self._indexes[pos]
+                future = self._pending.pop(pos, None)
+                if future is not None:
+                    self._curfile = six.BytesIO(future.result())
+                else:
+                    self._curfile = self._curidx.blob.getfile()
+            else:
+                self._curpos = None
                 self._curidx = None
                 self._curfile = None
         finally:
             if old_file is not None:
                 old_file.close()
 
+        # Fetch the next blobs in the background when reading sequentially,
+        # rather than waiting for every blob in turn.
+        if read_ahead and self._curidx is not None:
+            end = min(pos + 1 + self._read_ahead, len(self._indexes))
+            for ahead_pos in range(pos + 1, end):
+                if ahead_pos not in self._pending:
+                    self._pending[ahead_pos] = _get_read_ahead_executor().submit(
+                        _read_blob, self._indexes[ahead_pos].blob
+                    )
+
+    def _nextidx(self):
+        assert not self.prefetched, "this makes no sense"
+        self._openidx(self._curpos + 1, read_ahead=True)
+
     @property
     def size(self):
         return sum(i.blob.size for i in self._indexes)
@@ -525,18 +740,25 @@ class ChunkedFileBlobIndexWrapper(object):
                     mem[offset : offset + len(chunk)] = chunk
                     offset += len(chunk)
 
-        with ThreadPoolExecutor(max_workers=4) as exe:
-            for idx in self._indexes:
-                exe.submit(fetch_file, idx.offset, idx.blob.getfile)
+        with ThreadPoolExecutor(max_workers=MULTI_BLOB_FETCH_CONCURRENCY) as exe:
+            futures = [
+                exe.submit(fetch_file, idx.offset, idx.blob.getfile) for idx in self._indexes
+            ]
+            for future in futures:
+                future.result()
 
         mem.flush()
         self._curfile = f
 
     def close(self):
+        for future in six.itervalues(self._pending):
+            future.cancel()
+        self._pending = {}
         if self._curfile:
             self._curfile.close()
         self._curfile = None
         self._curidx = None
+        self._curpos = None
         self.closed = True
 
     def seek(self, pos):
@@ -548,14 +770,11 @@ class ChunkedFileBlobIndexWrapper(object):
 
         if pos < 0:
             raise IOError("Invalid argument")
-        for n, idx in enumerate(self._indexes[::-1]):
-            if idx.offset <= pos:
-                if idx != self._curidx:
-                    self._idxiter = iter(self._indexes[-(n + 1) :])
-                    self._nextidx()
-                break
-        else:
+        n = bisect.bisect_right(self._offsets, pos) - 1
+        if n < 0:
             raise ValueError("Cannot seek to pos")
+        if n != self._curpos:
+            self._openidx(n)
         self._curfile.seek(pos - self._curidx.offset)
 
     def tell(self):
@@ -141,7 +141,7 @@ class Organization(Model):
         default=1,
     )
 
-    objects = OrganizationManager(cache_fields=("pk", "slug"))
+    objects = OrganizationManager(cache_fields=("pk", "slug"), cache_local=True)
 
     class Meta:
         app_label = "sentry"
@@ -7,7 +7,7 @@ from django.db import models
 from sentry.db.models import Model, FlexibleForeignKey, sane_repr
 from sentry.db.models.fields import EncryptedPickledObjectField
 from sentry.db.models.manager import BaseManager
-from sentry.utils.cache import cache
+from sentry.utils.cache import cache, jitter_timeout, single_flight
 
 
 class OrganizationOptionManager(BaseManager):
@@ -63,9 +63,14 @@ class OrganizationOptionManager(BaseManager):
             cache_key = self._make_key(organization_id)
             result = cache.get(cache_key)
             if result is None:
-                result = self.reload_cache(organization_id)
-            else:
-                self.__cache[organization_id] = result
+                # Only one process reloads the options, while the others wait
+                # for them to show up in the cache.
+                result = single_flight(
+                    cache_key,
+                    lambda: cache.get(cache_key),
+                    lambda: self.reload_cache(organization_id),
+                )
+            self.__cache[organization_id] = result
         return self.__cache.get(organization_id, {})
 
     def clear_local_cache(self, **kwargs):
@@ -74,7 +79,7 @@ class OrganizationOptionManager(BaseManager):
     def reload_cache(self, organization_id):
         cache_key = self._make_key(organization_id)
         result = dict((i.key, i.value) for i in self.filter(organization=organization_id))
-        cache.set(cache_key, result)
+        cache.set(cache_key, result, jitter_timeout(self.cache_ttl))
         self.__cache[organization_id] = result
         return result
 
@@ -8,7 +8,7 @@ from sentry import projectoptions
 from sentry.db.models import Model, FlexibleForeignKey, sane_repr
 from sentry.db.models.fields import EncryptedPickledObjectField
 from sentry.db.models.manager import BaseManager
-from sentry.utils.cache import cache
+from sentry.utils.cache import cache, jitter_timeout, single_flight
 
 
 class ProjectOptionManager(BaseManager):
@@ -68,9 +68,12 @@ class ProjectOptionManager(BaseManager):
             cache_key = self._make_key(project_id)
             result = cache.get(cache_key)
             if result is None:
-                result = self.reload_cache(project_id)
-            else:
-                self.__cache[project_id] = result
+                # Only one process reloads the options, while the others wait
+                # for them to show up in the cache.
+                result = single_flight(
+                    cache_key, lambda: cache.get(cache_key), lambda: self.reload_cache(project_id)
+                )
+            self.__cache[project_id] = result
         return self.__cache.get(project_id, {})
 
     def clear_local_cache(self, **kwargs):
@@ -79,7 +82,7 @@ class ProjectOptionManager(BaseManager):
     def reload_cache(self, project_id):
         cache_key = self._make_key(project_id)
         result = dict((i.key, i.value) for i in self.filter(project=project_id))
-        cache.set(cache_key, result)
+        cache.set(cache_key, result, jitter_timeout(self.cache_ttl))
         self.__cache[project_id] = result
         return result
 
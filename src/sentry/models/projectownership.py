@@ -7,11 +7,59 @@ from django.db import models
 from django.db.models import Q
 from django.utils import timezone
 
-from sentry.db.models import Model, sane_repr
+from sentry.db.models import BaseManager, Model, sane_repr
 from sentry.db.models.fields import FlexibleForeignKey, JSONField
-from sentry.ownership.grammar import load_schema
+from sentry.db.models.manager import BaseQuerySet
+from sentry.ownership.grammar import compile_rules, load_schema
+from sentry.utils.cache import cache
 from functools import reduce
 
+OWNERSHIP_CACHE_TTL = 60 * 5
+COMPILED_RULES_CACHE_SIZE = 1000
+
+_compiled_rules = {}
+
+
+class ProjectOwnershipQuerySet(BaseQuerySet):
+    def update(self, **kwargs):
+        # Bulk updates do not send post_save, so the cached ownerships of the
+        # affected projects are dropped here.
+        project_ids = list(self.values_list("project_id", flat=True))
+        rv = super(ProjectOwnershipQuerySet, self).update(**kwargs)
+        self.model.objects.invalidate(project_ids)
+        return rv
+
+
+class ProjectOwnershipManager(BaseManager):
+    _queryset_class = ProjectOwnershipQuerySet
+
+    def _get_ownership_key(self, project_id):
+        return "projectownership:v1:%s" % (project_id,)
+
+    def get_for_project(self, project_id):
+        """
+        Returns the ownership of a project, or ``None`` if the project has
+        none. Both are cached until the ownership changes.
+        """
+        key = self._get_ownership_key(project_id)
+        ownership = cache.get(key)
+        if ownership is None:
+            try:
+                ownership = self.get(project_id=project_id)
+            except self.model.DoesNotExist:
+                ownership = False
+            cache.set(key, ownership, OWNERSHIP_CACHE_TTL)
+        return ownership or None
+
+    def invalidate(self, project_ids):
+        cache.delete_many([self._get_ownership_key(project_id) for project_id in project_ids])
+
+    def post_save(self, instance, **kwargs):
+        self.invalidate([instance.project_id])
+
+    def post_delete(self, instance, **kwargs):
+        self.invalidate([instance.project_id])
+
 
 class ProjectOwnership(Model):
     __core__ = True
@@ -25,6 +73,8 @@ class ProjectOwnership(Model):
     last_updated = models.DateTimeField(default=timezone.now)
     is_active = models.BooleanField(default=True)
 
+    objects = ProjectOwnershipManager()
+
     # An object to indicate ownership is implicitly everyone
     Everyone = object()
 
@@ -45,10 +95,7 @@ class ProjectOwnership(Model):
         If an empty list is returned, this means there are explicitly
         no owners.
         """
-        try:
-            ownership = cls.objects.get(project_id=project_id)
-        except cls.DoesNotExist:
-            ownership = cls(project_id=project_id)
+        ownership = cls.objects.get_for_project(project_id) or cls(project_id=project_id)
 
         rules = cls._matching_ownership_rules(ownership, project_id, data)
         if not rules:
@@ -64,11 +111,8 @@ class ProjectOwnership(Model):
 
         Will return None if there are no owners, or a list of owners.
         """
-        try:
-            ownership = cls.objects.get(project_id=project_id)
-        except cls.DoesNotExist:
-            return None
-        if not ownership.auto_assignment:
+        ownership = cls.objects.get_for_project(project_id)
+        if ownership is None or not ownership.auto_assignment:
             return None
 
         rules = cls._matching_ownership_rules(ownership, project_id, data)
@@ -93,14 +137,28 @@ class ProjectOwnership(Model):
         return actors[0].resolve()
 
     @classmethod
-    def _matching_ownership_rules(cls, ownership, project_id, data):
-        rules = []
-        if ownership.schema is not None:
-            for rule in load_schema(ownership.schema):
-                if rule.test(data):
-                    rules.append(rule)
+    def get_compiled_rules(cls, ownership):
+        """
+        Returns the compiled rules of an ownership schema. Compiled rules are
+        kept per process, keyed by project and the time of the last update.
+        """
+        if ownership.schema is None:
+            return None
+
+        key = (ownership.project_id, ownership.last_updated)
+        compiled = _compiled_rules.get(key)
+        if compiled is None:
+            if len(_compiled_rules) >= COMPILED_RULES_CACHE_SIZE:
+                _compiled_rules.clear()
+            compiled = _compiled_rules[key] = compile_rules(load_schema(ownership.schema))
+        return compiled
 
-        return rules
+    @classmethod
+    def _matching_ownership_rules(cls, ownership, project_id, data):
+        compiled = cls.get_compiled_rules(ownership)
+        if compiled is None:
+            return []
+        return compiled.match(data)
 
 
 def resolve_actors(owners, project_id):
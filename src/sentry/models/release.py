@@ -380,6 +380,7 @@ class Release(Model):
                 repos = {}
                 commit_author_by_commit = {}
                 head_commit_by_repo = {}
+                file_change_commit_ids = set()
                 latest_commit = None
                 for idx, data in enumerate(commit_list):
                     repo_name = data.get("repository") or u"organization-{}".format(
@@ -460,6 +461,8 @@ class Release(Model):
                                 )
                         except IntegrityError:
                             pass
+                        else:
+                            file_change_commit_ids.add(commit.id)
 
                     try:
                         with transaction.atomic():
@@ -512,6 +515,13 @@ class Release(Model):
         final_commit_ids = set(rc["commit_id"] for rc in release_commits)
         removed_commit_ids = initial_commit_ids - final_commit_ids
         added_commit_ids = final_commit_ids - initial_commit_ids
+        if file_change_commit_ids:
+            from sentry.utils.committers import invalidate_commit_file_indexes
+
+            # Files may have been added to commits which are part of other
+            # releases as well.
+            invalidate_commit_file_indexes(file_change_commit_ids)
+
         if removed_commit_ids or added_commit_ids:
             release_commits_updated.send_robust(
                 release=self,
@@ -1,11 +1,88 @@
 from __future__ import absolute_import
 
+import threading
+import time
+
+from collections import OrderedDict
 from django.db import models
 from six.moves.urllib.parse import urlsplit, urlunsplit
 
-from sentry.db.models import BoundedPositiveIntegerField, FlexibleForeignKey, Model, sane_repr
+from sentry.db.models import (
+    BaseManager,
+    BoundedPositiveIntegerField,
+    FlexibleForeignKey,
+    Model,
+    sane_repr,
+)
+from sentry.utils.cache import cache
 from sentry.utils.hashlib import sha1_text
 
+# Files are created within transactions, so a manifest built concurrently may
+# miss an uncommitted file.  Such a manifest is not kept for longer than
+# misses were cached before manifests existed.
+MANIFEST_CACHE_TTL = 60
+# Manifests are kept in memory for this many seconds before they are loaded
+# from the cache again, which bounds how long other processes see a stale
+# manifest after a release file was added.
+MANIFEST_LOCAL_TTL = 10
+LOCAL_MANIFEST_CACHE_SIZE = 100
+# Releases with more files than this are looked up in the database directly.
+MAX_MANIFEST_SIZE = 10000
+
+
+class ReleaseFileManager(BaseManager):
+    def __init__(self, *args, **kwargs):
+        super(ReleaseFileManager, self).__init__(*args, **kwargs)
+        self._local_manifests = OrderedDict()
+        self._local_manifests_lock = threading.Lock()
+
+    def _get_manifest_key(self, release_id, dist_id):
+        return "releasefile:manifest:v1:%s:%s" % (release_id, dist_id or "")
+
+    def get_manifest(self, release, dist=None):
+        """
+        Returns the set of idents of all files in the given release and
+        distribution, or ``None`` if the release has too many files to keep
+        a manifest.
+        """
+        dist_id = dist and dist.id or None
+        key = self._get_manifest_key(release.id, dist_id)
+
+        with self._local_manifests_lock:
+            local = self._local_manifests.pop(key, None)
+            if local is not None and local[0] > time.time():
+                self._local_manifests[key] = local
+                return local[1]
+
+        manifest = cache.get(key)
+        if manifest is None:
+            idents = list(
+                self.filter(release=release, dist=dist).values_list("ident", flat=True)[
+                    : MAX_MANIFEST_SIZE + 1
+                ]
+            )
+            manifest = idents if len(idents) <= MAX_MANIFEST_SIZE else -1
+            cache.set(key, manifest, MANIFEST_CACHE_TTL)
+
+        manifest = frozenset(manifest) if manifest != -1 else None
+        with self._local_manifests_lock:
+            self._local_manifests[key] = (time.time() + MANIFEST_LOCAL_TTL, manifest)
+            while len(self._local_manifests) > LOCAL_MANIFEST_CACHE_SIZE:
+                self._local_manifests.popitem(last=False)
+        return manifest
+
+    def invalidate_manifest(self, release_id, dist_id=None):
+        key = self._get_manifest_key(release_id, dist_id)
+        cache.delete(key)
+        with self._local_manifests_lock:
+            self._local_manifests.pop(key, None)
+
+    def post_save(self, instance, **kwargs):
+        self.invalidate_manifest(instance.release_id, instance.dist_id)
+
+    def post_delete(self, instance, **kwargs):
+        self.invalidate_manifest(instance.release_id, instance.dist_id)
+
 
 class ReleaseFile(Model):
     r"""
@@ -25,6 +102,8 @@ class ReleaseFile(Model):
     name = models.TextField()
     dist = FlexibleForeignKey("sentry.Distribution", null=True)
 
+    objects = ReleaseFileManager()
+
     __repr__ = sane_repr("release", "ident")
 
     class Meta:
@@ -46,6 +46,10 @@ register("redis.options", type=Dict, flags=FLAG_NOSTORE)
 register(
     "dsym.cache-path", type=String, default="/tmp/sentry-dsym-cache", flags=FLAG_PRIORITIZE_DISK
 )
+# The number of bytes the cache may use, `0` means unbounded
+register(
+    "dsym.cache-max-size", default=10 * 1024 ** 3, flags=FLAG_ALLOW_EMPTY | FLAG_PRIORITIZE_DISK
+)
 
 # Mail
 register("mail.backend", default="smtp", flags=FLAG_NOSTORE)
@@ -87,6 +91,19 @@ register("beacon.anonymous", type=Bool, flags=FLAG_REQUIRED)
 # Filestore
 register("filestore.backend", default="filesystem", flags=FLAG_NOSTORE)
 register("filestore.options", default={"location": "/tmp/sentry-files"}, flags=FLAG_NOSTORE)
+# A local directory in which file blobs are cached, disabled if empty
+register(
+    "filestore.blob-cache-path",
+    type=String,
+    default="",
+    flags=FLAG_ALLOW_EMPTY | FLAG_PRIORITIZE_DISK,
+)
+# The number of bytes the blob cache may use, `0` means unbounded
+register(
+    "filestore.blob-cache-max-size",
+    default=1024 ** 3,
+    flags=FLAG_ALLOW_EMPTY | FLAG_PRIORITIZE_DISK,
+)
 
 # Symbol server
 register("symbolserver.enabled", default=False, flags=FLAG_ALLOW_EMPTY | FLAG_PRIORITIZE_DISK)
@@ -98,6 +115,10 @@ register(
 
 # Symbolicator
 register("symbolicator.enabled", default=False, flags=FLAG_ALLOW_EMPTY | FLAG_PRIORITIZE_DISK)
+# The number of seconds a task keeps polling symbolicator for a pending
+# request before it is retried through the queue. This holds a worker, so it
+# is disabled (`0`) by default.
+register("symbolicator.poll-timeout", default=0, flags=FLAG_ALLOW_EMPTY | FLAG_PRIORITIZE_DISK)
 register(
     "symbolicator.options",
     default={"url": "http://localhost:3021"},
@@ -1,15 +1,22 @@
 from __future__ import absolute_import
 
+import re
+
 from collections import namedtuple
-from fnmatch import fnmatch
+from fnmatch import fnmatch, translate
 from parsimonious.grammar import Grammar, NodeVisitor
 from parsimonious.exceptions import ParseError  # noqa
 from sentry.utils.safe import get_path
 
-__all__ = ("parse_rules", "dump_schema", "load_schema")
+__all__ = ("parse_rules", "dump_schema", "load_schema", "compile_rules")
 
 VERSION = 1
 
+# Number of patterns which are combined into a single regex when compiling
+# rules. A value which doesn't match a combined regex can skip all of its
+# patterns, a value which does only has to be tested against those patterns.
+PATTERN_CHUNK_SIZE = 50
+
 # Grammar is defined in EBNF syntax.
 ownership_grammar = Grammar(
     r"""
@@ -151,7 +158,7 @@ class OwnershipVisitor(NodeVisitor):
     def visit_matcher_tag(self, node, children):
         if not children:
             return "path"
-        tag, = children
+        (tag,) = children
         type, _ = tag
         return type[0].text
 
@@ -198,6 +205,92 @@ def _iter_frames(data):
             continue
 
 
+def _iter_paths(data):
+    seen = set()
+    for frame in _iter_frames(data):
+        filename = frame.get("filename") or frame.get("abs_path")
+        if filename and filename not in seen:
+            seen.add(filename)
+            yield filename
+
+
+def _iter_urls(data):
+    try:
+        url = data["request"]["url"]
+    except KeyError:
+        return
+    yield url
+
+
+def _translate(pattern):
+    # Python 2's fnmatch appends the flags to the regex, which is not allowed
+    # within an alternation.
+    regex = translate(pattern)
+    if regex.endswith("(?ms)"):
+        regex = regex[:-5]
+    return regex
+
+
+class PatternSet(object):
+    """
+    A list of glob patterns compiled into regexes, which can be tested against
+    many values at once. Matches the same values as ``fnmatch``.
+    """
+
+    def __init__(self, patterns):
+        regexes = [_translate(p) for p in patterns]
+        self.patterns = [re.compile(r, re.M | re.S) for r in regexes]
+        self.chunks = []
+        for start in range(0, len(regexes), PATTERN_CHUNK_SIZE):
+            chunk = regexes[start : start + PATTERN_CHUNK_SIZE]
+            combined = re.compile("|".join("(?:%s)" % r for r in chunk), re.M | re.S)
+            self.chunks.append((combined, range(start, start + len(chunk))))
+
+    def match(self, values):
+        """
+        Returns the indexes of all patterns which match any of the values.
+        """
+        matched = set()
+        for combined, indexes in self.chunks:
+            for value in values:
+                if combined.match(value) is None:
+                    continue
+                for index in indexes:
+                    if index not in matched and self.patterns[index].match(value):
+                        matched.add(index)
+        return matched
+
+
+class CompiledRules(object):
+    """
+    A list of rules prepared to be tested against many events. Values are
+    extracted from an event only once and tested against the patterns of all
+    rules in a single pass.
+    """
+
+    extractors = {"path": _iter_paths, "url": _iter_urls}
+
+    def __init__(self, rules):
+        self.rules = rules
+        self.pattern_sets = []
+        for type, extract in sorted(self.extractors.items()):
+            indexes = [i for i, rule in enumerate(rules) if rule.matcher.type == type]
+            if indexes:
+                patterns = PatternSet([rules[i].matcher.pattern for i in indexes])
+                self.pattern_sets.append((extract, patterns, indexes))
+
+    def match(self, data):
+        """
+        Returns all rules which match the event data, in their original order.
+        """
+        matched = set()
+        for extract, patterns, indexes in self.pattern_sets:
+            values = list(extract(data))
+            if values:
+                matched.update(indexes[i] for i in patterns.match(values))
+        return [self.rules[i] for i in sorted(matched)]
+
+
 def parse_rules(data):
     """Convert a raw text input into a Rule tree"""
     tree = ownership_grammar.parse(data)
@@ -214,3 +307,8 @@ def load_schema(schema):
     if schema["$version"] != VERSION:
         raise RuntimeError("Invalid schema $version: %r" % schema["$version"])
     return [Rule.load(r) for r in schema["rules"]]
+
+
+def compile_rules(rules):
+    """Convert a Rule tree into CompiledRules"""
+    return CompiledRules(rules)
@@ -19,7 +19,7 @@ from sentry.models import (
     PullRequest,
     UserOption,
 )
-from sentry.signals import issue_resolved
+from sentry.signals import issue_resolved, release_commits_updated
 from sentry.tasks.clear_expired_resolutions import clear_expired_resolutions
 
 
@@ -212,6 +212,13 @@ def resolved_in_pull_request(instance, created, **kwargs):
                 )
 
 
+def invalidate_release_file_index(release, **kwargs):
+    from sentry.utils.committers import invalidate_release_file_indexes
+
+    # The index is rebuilt on the next lookup.
+    invalidate_release_file_indexes([release.id])
+
+
 post_save.connect(
     resolve_group_resolutions, sender=Release, dispatch_uid="resolve_group_resolutions", weak=False
 )
@@ -224,3 +231,7 @@ post_save.connect(
     dispatch_uid="resolved_in_pull_request",
     weak=False,
 )
+
+release_commits_updated.connect(
+    invalidate_release_file_index, dispatch_uid="invalidate_release_file_index", weak=False
+)
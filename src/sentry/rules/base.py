@@ -94,3 +94,8 @@ class EventState(object):
         self.is_regression = is_regression
         self.is_new_group_environment = is_new_group_environment
         self.has_reappeared = has_reappeared
+
+        # Results of lookups that can be shared between the conditions of all
+        # rules that are evaluated for the same event (see
+        # ``BaseEventFrequencyCondition``.)
+        self.cache = {}
@@ -61,7 +61,7 @@ class BaseEventFrequencyCondition(EventCondition):
         if not interval:
             return False
 
-        current_value = self.get_rate(event, interval, self.rule.environment_id)
+        current_value = self.get_shared_rate(event, state, interval, self.rule.environment_id)
 
         return current_value > value
 
@@ -70,6 +70,17 @@ class BaseEventFrequencyCondition(EventCondition):
         """
         raise NotImplementedError  # subclass must implement
 
+    def get_shared_rate(self, event, state, interval, environment_id):
+        """
+        Returns the rate for the interval, reusing the value computed by any
+        other condition of the same type (from another rule) that was
+        evaluated for this event with the same interval and environment.
+        """
+        key = (self.id, event.group_id, interval, environment_id)
+        if key not in state.cache:
+            state.cache[key] = self.get_rate(event, interval, environment_id)
+        return state.cache[key]
+
     def get_rate(self, event, interval, environment_id):
         _, duration = intervals[interval]
         end = timezone.now()
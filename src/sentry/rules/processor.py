@@ -1,5 +1,6 @@
 from __future__ import absolute_import
 
+import itertools
 import logging
 import six
 
@@ -15,6 +16,11 @@ from sentry.utils.safe import safe_execute
 
 RuleFuture = namedtuple("RuleFuture", ["rule", "kwargs"])
 
+# The maximum number of compiled rules that are kept in memory by each process.
+COMPILED_RULE_CACHE_SIZE = 5000
+
+_compiled_rules = {}
+
 
 # TODO(dcramer): come up with a clean way to kill this either by renaming
 # the Event.message attribute or updating all plugins (former is better)
@@ -40,6 +46,67 @@ class EventCompatibilityProxy(object):
         return self._event.real_message
 
 
+class CompiledRule(object):
+    """
+    A rule with its condition and action instances constructed up front, so
+    they can be reused when the rule is applied to later events.
+    """
+
+    logger = logging.getLogger("sentry.rules")
+
+    def __init__(self, rule, project):
+        self.rule = rule
+        self.project = project
+        self.match = rule.data.get("action_match") or Rule.DEFAULT_ACTION_MATCH
+        self.frequency = rule.data.get("frequency") or Rule.DEFAULT_FREQUENCY
+
+        self.conditions = []
+        for condition in rule.data.get("conditions", ()):
+            condition_cls = rules.get(condition["id"])
+            if condition_cls is None:
+                self.logger.warn("Unregistered condition %r", condition["id"])
+                self.conditions.append(None)
+                continue
+            self.conditions.append(condition_cls(project, data=condition, rule=rule))
+
+        self.actions = []
+        for action in rule.data.get("actions", ()):
+            action_cls = rules.get(action["id"])
+            if action_cls is None:
+                self.logger.warn("Unregistered action %r", action["id"])
+                continue
+            self.actions.append(action_cls(project, data=action, rule=rule))
+
+    def bind_project(self, project):
+        # Instances are shared between events, so make sure they refer to the
+        # project instance of the event that is currently being processed.
+        if project is self.project:
+            return
+        self.project = project
+        for instance in itertools.chain(self.conditions, self.actions):
+            if instance is not None:
+                instance.project = project
+
+
+def get_rule_version(rule):
+    return hash_values([rule.environment_id, rule.data])
+
+
+def compile_rule(rule, project):
+    """
+    Returns the ``CompiledRule`` for the current version of ``rule``, reusing
+    a previously compiled instance if the rule has not been changed since.
+    """
+    key = (rule.id, get_rule_version(rule))
+    compiled = _compiled_rules.get(key)
+    if compiled is None:
+        if len(_compiled_rules) >= COMPILED_RULE_CACHE_SIZE:
+            _compiled_rules.clear()
+        compiled = _compiled_rules[key] = CompiledRule(rule, project)
+    compiled.bind_project(project)
+    return compiled
+
+
 class RuleProcessor(object):
     logger = logging.getLogger("sentry.rules")
 
@@ -58,24 +125,50 @@ class RuleProcessor(object):
     def get_rules(self):
         return Rule.get_for_project(self.project.id)
 
+    def get_rule_status_cache_key(self, rule):
+        return "grouprulestatus:1:%s" % hash_values([self.group.id, rule.id])
+
     def get_rule_status(self, rule):
-        key = "grouprulestatus:1:%s" % hash_values([self.group.id, rule.id])
-        rule_status = cache.get(key)
-        if rule_status is None:
-            rule_status, _ = GroupRuleStatus.objects.get_or_create(
-                rule=rule, group=self.group, defaults={"project": self.project}
+        return self.get_rule_statuses([rule])[rule.id]
+
+    def get_rule_statuses(self, rule_list):
+        """
+        Returns a mapping of rule ID to ``GroupRuleStatus`` for the current
+        group, using a single cache round trip and a single query for all
+        rules that were not cached, creating any statuses that don't exist.
+        """
+        keys = {rule.id: self.get_rule_status_cache_key(rule) for rule in rule_list}
+        cached = cache.get_many(list(keys.values()))
+
+        statuses = {}
+        for rule_id, key in six.iteritems(keys):
+            if cached.get(key) is not None:
+                statuses[rule_id] = cached[key]
+
+        missing = [rule for rule in rule_list if rule.id not in statuses]
+        if not missing:
+            return statuses
+
+        loaded = {
+            status.rule_id: status
+            for status in GroupRuleStatus.objects.filter(
+                group=self.group, rule__in=[rule.id for rule in missing]
             )
-            cache.set(key, rule_status, 300)
-        return rule_status
+        }
+        for rule in missing:
+            if rule.id not in loaded:
+                loaded[rule.id], _ = GroupRuleStatus.objects.get_or_create(
+                    rule=rule, group=self.group, defaults={"project": self.project}
+                )
+
+        cache.set_many({keys[rule_id]: status for rule_id, status in six.iteritems(loaded)}, 300)
+        statuses.update(loaded)
+        return statuses
 
     def condition_matches(self, condition, state, rule):
-        condition_cls = rules.get(condition["id"])
-        if condition_cls is None:
-            self.logger.warn("Unregistered condition %r", condition["id"])
+        if condition is None:
             return
-
-        condition_inst = condition_cls(self.project, data=condition, rule=rule)
-        return safe_execute(condition_inst.passes, self.event, state, _with_transaction=False)
+        return safe_execute(condition.passes, self.event, state, _with_transaction=False)
 
     def get_state(self):
         return EventState(
@@ -85,34 +178,35 @@ class RuleProcessor(object):
             has_reappeared=self.has_reappeared,
         )
 
-    def apply_rule(self, rule):
-        match = rule.data.get("action_match") or Rule.DEFAULT_ACTION_MATCH
-        condition_list = rule.data.get("conditions", ())
-        frequency = rule.data.get("frequency") or Rule.DEFAULT_FREQUENCY
-
+    def is_applicable(self, compiled):
         # XXX(dcramer): if theres no condition should we really skip it,
         # or should we just apply it blindly?
-        if not condition_list:
-            return
+        if not compiled.conditions:
+            return False
+
+        environment_id = compiled.rule.environment_id
+        if environment_id is not None and self.event.get_environment().id != environment_id:
+            return False
+
+        return True
 
-        if (
-            rule.environment_id is not None
-            and self.event.get_environment().id != rule.environment_id
-        ):
+    def apply_rule(self, rule):
+        compiled = compile_rule(rule, self.project)
+        if not self.is_applicable(compiled):
             return
 
-        status = self.get_rule_status(rule)
+        self.apply_compiled_rule(rule, compiled, self.get_rule_status(rule), self.get_state())
 
+    def apply_compiled_rule(self, rule, compiled, status, state):
         now = timezone.now()
-        freq_offset = now - timedelta(minutes=frequency)
+        freq_offset = now - timedelta(minutes=compiled.frequency)
 
         if status.last_active and status.last_active > freq_offset:
             return
 
-        state = self.get_state()
-
-        condition_iter = (self.condition_matches(c, state, rule) for c in condition_list)
+        condition_iter = (self.condition_matches(c, state, rule) for c in compiled.conditions)
 
+        match = compiled.match
         if match == "all":
             passed = all(condition_iter)
         elif match == "any":
@@ -133,18 +227,12 @@ class RuleProcessor(object):
         if not passed:
             return
 
-        for action in rule.data.get("actions", ()):
-            action_cls = rules.get(action["id"])
-            if action_cls is None:
-                self.logger.warn("Unregistered action %r", action["id"])
-                continue
-
-            action_inst = action_cls(self.project, data=action, rule=rule)
+        for action_inst in compiled.actions:
             results = safe_execute(
                 action_inst.after, event=self.event, state=state, _with_transaction=False
             )
             if results is None:
-                self.logger.warn("Action %s did not return any futures", action["id"])
+                self.logger.warn("Action %s did not return any futures", action_inst.id)
                 continue
 
             for future in results:
@@ -158,6 +246,21 @@ class RuleProcessor(object):
 
     def apply(self):
         self.grouped_futures.clear()
+
+        applicable = []
         for rule in self.get_rules():
-            self.apply_rule(rule)
+            compiled = compile_rule(rule, self.project)
+            if self.is_applicable(compiled):
+                applicable.append((rule, compiled))
+
+        if not applicable:
+            return six.itervalues(self.grouped_futures)
+
+        statuses = self.get_rule_statuses([rule for rule, _ in applicable])
+
+        # The state is shared by all rules so that conditions can reuse the
+        # results of expensive lookups (e.g. frequency queries) between rules.
+        state = self.get_state()
+        for rule, compiled in applicable:
+            self.apply_compiled_rule(rule, compiled, statuses[rule.id], state)
         return six.itervalues(self.grouped_futures)
@@ -107,6 +107,20 @@ def multiprocess_worker(task_queue):
     show_default=True,
     help="The total number of concurrent worker processes to run.",
 )
+@click.option(
+    "--partitions",
+    type=int,
+    default=1,
+    show_default=True,
+    help="Split the id range of each bulk deleted table into this many partitions, "
+    "which are deleted concurrently (PostgreSQL only).",
+)
+@click.option(
+    "--checkpoint",
+    type=click.Path(dir_okay=False),
+    default=None,
+    help="File to save the progress of partitioned deletions to, and resume from.",
+)
 @click.option(
     "--silent", "-q", default=False, is_flag=True, help="Run quietly. No output on success."
 )
@@ -120,7 +134,7 @@ def multiprocess_worker(task_queue):
     help="Send the duration of this command to internal metrics.",
 )
 @log_options()
-def cleanup(days, project, concurrency, silent, model, router, timed):
+def cleanup(days, project, concurrency, partitions, checkpoint, silent, model, router, timed):
     """Delete a portion of trailing data based on creation date.
 
     All data that is older than `--days` will be deleted.  The default for
@@ -133,6 +147,10 @@ def cleanup(days, project, concurrency, silent, model, router, timed):
         click.echo("Error: Minimum concurrency is 1", err=True)
         raise click.Abort()
 
+    if partitions < 1:
+        click.echo("Error: Minimum partitions is 1", err=True)
+        raise click.Abort()
+
     os.environ["_SENTRY_CLEANUP"] = "1"
 
     # Make sure we fork off multiprocessing pool
@@ -151,17 +169,25 @@ def cleanup(days, project, concurrency, silent, model, router, timed):
 
     configure()
 
+    import time
     from django.db import router as db_router
     from sentry.app import nodestore
-    from sentry.db.deletion import BulkDeleteQuery
+    from sentry.db.deletion import BulkDeleteQuery, DeletionCheckpoint
     from sentry import models
+    from sentry.utils import db
 
     if timed:
-        import time
         from sentry.utils import metrics
 
         start_time = time.time()
 
+    if partitions > 1 and not db.is_postgres():
+        click.echo("Partitioned deletion is only available for PostgreSQL", err=True)
+        partitions = 1
+
+    if checkpoint is not None:
+        checkpoint = DeletionCheckpoint(checkpoint)
+
     # list of models which this query is restricted to
     model_list = {m.lower() for m in model}
 
@@ -261,9 +287,24 @@ def cleanup(days, project, concurrency, silent, model, router, timed):
             if not silent:
                 click.echo(">> Skipping %s" % model.__name__)
         else:
-            BulkDeleteQuery(
+            q = BulkDeleteQuery(
                 model=model, dtfield=dtfield, days=days, project_id=project_id, order_by=order_by
-            ).execute(chunk_size=chunk_size)
+            )
+            model_start_time = time.time()
+            if partitions > 1:
+                deleted = q.execute_partitioned(
+                    partitions, chunk_size=chunk_size, checkpoint=checkpoint
+                )
+            else:
+                deleted = q.execute(chunk_size=chunk_size)
+            duration = time.time() - model_start_time
+
+            if not silent:
+                click.echo(
+                    u">> Removed {deleted} rows in {duration:.1f}s ({rate:.0f} rows/s)".format(
+                        deleted=deleted, duration=duration, rate=deleted / max(duration, 0.001)
+                    )
+                )
 
     for model, dtfield, order_by in DELETES:
         if not silent:
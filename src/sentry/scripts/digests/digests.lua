@@ -106,13 +106,20 @@ local function zrange_scored_iterator(result)
     end
 end
 
-local function zrange_move_slice(source, destination, threshold, callback)
+local function zrange_move_slice(source, destination, threshold, callback, limit)
     local callback = callback
     if callback == nil then
         callback = noop
     end
 
-    local keys = redis.call('ZRANGEBYSCORE', source, 0, threshold, 'WITHSCORES')
+    -- A negative limit returns all matching items, which is the same as not
+    -- providing a limit at all.
+    local keys
+    if limit == nil then
+        keys = redis.call('ZRANGEBYSCORE', source, 0, threshold, 'WITHSCORES')
+    else
+        keys = redis.call('ZRANGEBYSCORE', source, 0, threshold, 'WITHSCORES', 'LIMIT', 0, limit)
+    end
     if #keys == 0 then
         return
     end
@@ -164,7 +171,7 @@ end
 
 -- Timeline and Schedule Operations
 
-local function schedule(configuration, deadline)
+local function schedule(configuration, deadline, limit)
     local response = {}
     local i = 0
     zrange_move_slice(
@@ -174,7 +181,8 @@ local function schedule(configuration, deadline)
         function (timeline_id, timestamp)
             i = i + 1
             response[i] = {timeline_id, timestamp}
-        end
+        end,
+        limit
     )
     return response
 end
@@ -385,11 +393,12 @@ end)
 
 local commands = {
     SCHEDULE = function (cursor, arguments)
-        local cursor, configuration, deadline = multiple_argument_parser(
+        local cursor, configuration, deadline, limit = multiple_argument_parser(
             configuration_argument_parser,
+            argument_parser(tonumber),
             argument_parser(tonumber)
         )(cursor, arguments)
-        return schedule(configuration, deadline)
+        return schedule(configuration, deadline, limit)
     end,
     MAINTENANCE = function (cursor, arguments)
         local cursor, configuration, deadline = multiple_argument_parser(
@@ -2,12 +2,14 @@ from __future__ import absolute_import
 
 import six
 import logging
+import threading
 from datetime import datetime
 from django.utils import timezone
 
 from collections import namedtuple, OrderedDict
 
 from sentry.models import Project, Release
+from sentry.utils import metrics
 from sentry.utils.cache import cache
 from sentry.utils.hashlib import hash_values
 from sentry.utils.safe import get_path, safe_execute
@@ -21,6 +23,50 @@ StacktraceInfo.__hash__ = lambda x: id(x)
 StacktraceInfo.__eq__ = lambda a, b: a is b
 StacktraceInfo.__ne__ = lambda a, b: a is not b
 
+FRAME_CACHE_TTL = 3600
+
+# The number of processed frames which are kept in process, so that frames
+# repeating across events of the same release don't hit the cache.
+LOCAL_FRAME_CACHE_SIZE = 5000
+
+
+class LocalFrameCache(object):
+    """
+    A size bounded, per-process LRU cache of processed frames (``pf:`` keys.)
+    Their keys are derived from everything the result depends on, so they
+    never need to be invalidated.
+    """
+
+    def __init__(self, size):
+        self.size = size
+        self.items = OrderedDict()
+        self.lock = threading.Lock()
+
+    def get_many(self, keys):
+        rv = {}
+        with self.lock:
+            for key in keys:
+                value = self.items.pop(key, None)
+                if value is not None:
+                    self.items[key] = value
+                    rv[key] = value
+        return rv
+
+    def set_many(self, items):
+        with self.lock:
+            for key, value in six.iteritems(items):
+                self.items.pop(key, None)
+                self.items[key] = value
+            while len(self.items) > self.size:
+                self.items.popitem(last=False)
+
+    def clear(self):
+        with self.lock:
+            self.items.clear()
+
+
+local_frame_cache = LocalFrameCache(LOCAL_FRAME_CACHE_SIZE)
+
 
 class ProcessableFrame(object):
     def __init__(self, frame, idx, processor, stacktrace_info, processable_frames):
@@ -31,6 +77,7 @@ class ProcessableFrame(object):
         self.data = None
         self.cache_key = None
         self.cache_value = None
+        self.cache_dirty = False
         self.processable_frames = processable_frames
 
     def __repr__(self):
@@ -64,8 +111,11 @@ class ProcessableFrame(object):
         return self.processable_frames[last_idx]
 
     def set_cache_value(self, value):
+        # The value is written to the cache together with those of all other
+        # frames once the stacktraces are processed.
         if self.cache_key is not None:
-            cache.set(self.cache_key, value, 3600)
+            self.cache_value = value
+            self.cache_dirty = True
             return True
         return False
 
@@ -411,12 +461,27 @@ def get_crash_frame_from_event_data(data, frame_filter=None):
 
 
 def lookup_frame_cache(keys):
-    rv = {}
-    for key in keys:
-        rv[key] = cache.get(key)
+    rv = local_frame_cache.get_many(keys)
+    missing = [key for key in keys if key not in rv]
+    if missing:
+        values = {k: v for k, v in six.iteritems(cache.get_many(missing)) if v is not None}
+        local_frame_cache.set_many(values)
+        rv.update(values)
     return rv
 
 
+def store_frame_cache(processing_task):
+    values = {}
+    for processable_frame in processing_task.iter_processable_frames():
+        if processable_frame.cache_dirty:
+            values[processable_frame.cache_key] = processable_frame.cache_value
+            processable_frame.cache_dirty = False
+
+    if values:
+        local_frame_cache.set_many(values)
+        cache.set_many(values, FRAME_CACHE_TTL)
+
+
 def get_stacktrace_processing_task(infos, processors):
     """Returns a list of all tasks for the processors.  This can skip over
     processors that seem to not handle any frames.
@@ -438,11 +503,20 @@ def get_stacktrace_processing_task(infos, processors):
                 processable_frame
             )
             if processable_frame.cache_key is not None:
-                to_lookup[processable_frame.cache_key] = processable_frame
+                to_lookup.setdefault(processable_frame.cache_key, []).append(processable_frame)
+
+    frame_cache = lookup_frame_cache(list(to_lookup))
+    hits = {}
+    for cache_key, processable_frames in six.iteritems(to_lookup):
+        cache_value = frame_cache.get(cache_key)
+        for processable_frame in processable_frames:
+            processable_frame.cache_value = cache_value
+            counts = hits.setdefault(type(processable_frame.processor).__name__, [0, 0])
+            counts[cache_value is None] += 1
 
-    frame_cache = lookup_frame_cache(to_lookup)
-    for cache_key, processable_frame in six.iteritems(to_lookup):
-        processable_frame.cache_value = frame_cache.get(cache_key)
+    for processor, (hit, miss) in six.iteritems(hits):
+        metrics.incr("stacktraces.frame_cache.hit", amount=hit, tags={"processor": processor})
+        metrics.incr("stacktraces.frame_cache.miss", amount=miss, tags={"processor": processor})
 
     return StacktraceProcessingTask(
         processable_stacktraces=by_stacktrace_info, processors=by_processor
@@ -503,6 +577,8 @@ def process_stacktraces(data, make_processors=None, set_raw_stacktrace=True):
                 data.setdefault("errors", []).extend(dedup_errors(errors))
                 changed = True
 
+        store_frame_cache(processing_task)
+
     finally:
         for processor in processors:
             processor.close()
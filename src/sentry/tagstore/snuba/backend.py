@@ -423,6 +423,7 @@ class SnubaTagStorage(TagStorage):
             orderby="-count",
             limitby=[value_limit, "tags_key"],
             referrer="tagstore.__get_tag_keys_and_top_values",
+            use_cache=True,
         )
 
         # Then supplement the key objects with the top values for each.
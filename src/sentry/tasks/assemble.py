@@ -261,6 +261,11 @@ def assemble_artifacts(org_id, version, checksum, chunks, **kwargs):
                     # we're upserting here anyway, yield to the faster actor and
                     # do not try again.
                     file.delete()
+                else:
+                    # The manifest is invalidated again once the file is
+                    # committed, as a concurrent lookup may have cached it
+                    # without the file in between.
+                    ReleaseFile.objects.invalidate_manifest(release.id, dist.id if dist else None)
             else:
                 old_file = release_file.file
                 release_file.update(file=file)
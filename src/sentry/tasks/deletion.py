@@ -1,5 +1,7 @@
 from __future__ import absolute_import
 
+import logging
+
 from uuid import uuid4
 
 from django.conf import settings
@@ -12,6 +14,8 @@ from sentry.exceptions import DeleteAborted
 from sentry.signals import pending_delete
 from sentry.tasks.base import instrumented_task, retry
 
+logger = logging.getLogger("sentry.deletions.async")
+
 # in prod we run with infinite retries to recover from errors
 # in debug/development, we assume these tasks generally shouldn't fail
 MAX_RETRIES = 1 if settings.DEBUG else None
@@ -222,6 +226,14 @@ def delete_groups(object_ids, transaction_id=None, eventstream_state=None, **kwa
         model=Group, query={"id__in": current_batch}, transaction_id=transaction_id
     )
     has_more = task.chunk()
+    logger.info(
+        "delete_groups.progress",
+        extra={
+            "transaction_id": transaction_id,
+            "batch_size": len(current_batch),
+            "remaining": len(object_ids) if has_more else len(rest),
+        },
+    )
     if has_more or rest:
         delete_groups.apply_async(
             kwargs={
@@ -2,7 +2,6 @@ from __future__ import absolute_import
 
 import logging
 from datetime import datetime
-import six
 
 from time import time
 from django.utils import timezone
@@ -12,7 +11,7 @@ from semaphore.processing import StoreNormalizer
 from sentry import features, reprocessing
 from sentry.constants import DEFAULT_STORE_NORMALIZER_ARGS
 from sentry.attachments import attachment_cache
-from sentry.cache import default_cache
+from sentry.eventstore.processing import event_processing_store
 from sentry.tasks.base import instrumented_task
 from sentry.utils import metrics
 from sentry.utils.safe import safe_execute
@@ -83,7 +82,7 @@ def submit_save_event(project, cache_key, event_id, start_time, data):
 
 def _do_preprocess_event(cache_key, data, start_time, event_id, process_task):
     if cache_key and data is None:
-        data = default_cache.get(cache_key)
+        data = event_processing_store.get(cache_key, "preprocess")
 
     if data is None:
         metrics.incr("events.failed", tags={"reason": "cache", "stage": "pre"}, skip_internal=False)
@@ -159,7 +158,7 @@ def _do_process_event(cache_key, start_time, event_id, process_task, data=None):
     from sentry.plugins import plugins
 
     if data is None:
-        data = default_cache.get(cache_key)
+        data = event_processing_store.get(cache_key, "process")
 
     if data is None:
         metrics.incr(
@@ -227,12 +226,14 @@ def _do_process_event(cache_key, start_time, event_id, process_task, data=None):
     assert data["project"] == project_id, "Project cannot be mutated by preprocessor"
     project = Project.objects.get_from_cache(id=project_id)
 
-    # We cannot persist canonical types in the cache, so we need to
-    # downgrade this.
-    if isinstance(data, CANONICAL_TYPES):
-        data = dict(data.items())
-
+    # Events that were not changed are not written back, the save stage reads
+    # the payload that was stored on ingestion.
     if has_changed:
+        # The normalizer needs a plain dictionary, so we need to downgrade
+        # canonical types.
+        if isinstance(data, CANONICAL_TYPES):
+            data = dict(data.items())
+
         # Run some of normalization again such that we don't:
         # - persist e.g. incredibly large stacktraces from minidumps
         # - store event timestamps that are older than our retention window
@@ -240,7 +241,7 @@ def _do_process_event(cache_key, start_time, event_id, process_task, data=None):
         normalizer = StoreNormalizer(
             remove_other=False, is_renormalize=True, **DEFAULT_STORE_NORMALIZER_ARGS
         )
-        data = normalizer.normalize_event(dict(data))
+        data = normalizer.normalize_event(data)
 
         issues = data.get("processing_issues")
 
@@ -263,7 +264,7 @@ def _do_process_event(cache_key, start_time, event_id, process_task, data=None):
             process_task.delay(cache_key, start_time=start_time, event_id=event_id)
             return
 
-        default_cache.set(cache_key, data, 3600)
+        event_processing_store.store(cache_key, data, "process")
 
     submit_save_event(project, cache_key, event_id, start_time, data)
 
@@ -364,7 +365,7 @@ def create_failed_event(
     # from the last processing step because we do not want any
     # modifications to take place.
     delete_raw_event(project_id, event_id)
-    data = default_cache.get(cache_key)
+    data = event_processing_store.get(cache_key, "raw")
     if data is None:
         metrics.incr("events.failed", tags={"reason": "cache", "stage": "raw"}, skip_internal=False)
         error_logger.error("process.failed_raw.empty", extra={"cache_key": cache_key})
@@ -389,7 +390,7 @@ def create_failed_event(
             data=issue["data"],
         )
 
-    default_cache.delete(cache_key)
+    event_processing_store.delete(cache_key)
 
     return True
 
@@ -414,7 +415,7 @@ def save_attachment(event, attachment):
         type=attachment.type,
         headers={"Content-Type": attachment.content_type},
     )
-    file.putfile(six.BytesIO(attachment.data))
+    file.putfile(attachment.open())
 
     EventAttachment.objects.create(
         event_id=event.event_id, project_id=event.project_id, name=attachment.name, file=file
@@ -433,7 +434,7 @@ def _do_save_event(
     from sentry.utils.outcomes import Outcome, track_outcome
 
     if cache_key and data is None:
-        data = default_cache.get(cache_key)
+        data = event_processing_store.get(cache_key, "save")
 
     if data is not None:
         data = CanonicalKeyDict(data)
@@ -519,7 +520,7 @@ def _do_save_event(
 
     finally:
         if cache_key:
-            default_cache.delete(cache_key)
+            event_processing_store.delete(cache_key)
 
             # For the unlikely case that we did not manage to persist the
             # event we also delete the key always.
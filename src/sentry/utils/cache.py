@@ -1,12 +1,55 @@
 from __future__ import absolute_import, print_function
 
 import functools
+import random
+import time
 
 from django.core.cache import cache
 
 default_cache = cache
 
 
+def jitter_timeout(timeout, jitter=0.1):
+    """
+    Spreads a cache timeout randomly by up to ``jitter`` (a fraction of the
+    timeout) in either direction, so that keys which are populated together
+    don't all expire together.
+    """
+    if not timeout:
+        return timeout
+    return max(1, int(round(timeout * (1 + random.uniform(-jitter, jitter)))))
+
+
+def single_flight(key, fetch, compute, lock_timeout=5, wait=0.5, interval=0.05):
+    """
+    Coalesces the recomputation of a missing cache value across processes.
+
+    Only the process which holds a short lock on ``key`` calls ``compute``
+    (which is expected to store the value in the cache), while the others
+    poll ``fetch`` for the value it stores. A process which waited for longer
+    than ``wait`` seconds, or which finds the lock released without a value
+    (e.g. because ``compute`` failed), computes the value itself.
+
+    >>> single_flight(key, lambda: cache.get(key), compute)
+    """
+    lock_key = u"{}:lock".format(key)
+    deadline = time.time() + wait
+    while True:
+        if default_cache.add(lock_key, 1, lock_timeout):
+            try:
+                return compute()
+            finally:
+                default_cache.delete(lock_key)
+
+        if time.time() >= deadline:
+            return compute()
+
+        time.sleep(interval)
+        value = fetch()
+        if value is not None:
+            return value
+
+
 class memoize(object):
     """
     Memoize the result of a property call.
@@ -39,6 +39,10 @@ CANONICAL_KEY_MAPPING = {
     "sentry.interfaces.DebugMeta": ("debug_meta",),
 }
 
+# Keys which are translated by `get_legacy_name` and `get_canonical_name`.
+_LEGACY_ALIASES = frozenset(LEGACY_KEY_MAPPING)
+_CANONICAL_ALIASES = frozenset(CANONICAL_KEY_MAPPING)
+
 
 def get_canonical_name(key):
     return CANONICAL_KEY_MAPPING.get(key, (key,))[0]
@@ -94,6 +98,18 @@ class CanonicalKeyDict(collections.MutableMapping):
             legacy = settings.PREFER_CANONICAL_LEGACY_KEYS
         norm_func = legacy and get_legacy_name or get_canonical_name
         self._norm_func = norm_func
+
+        # Keys are stored normalized, so payloads that have been normalized
+        # before (which is nearly all of them) can be copied as a whole.
+        if isinstance(data, CanonicalKeyDict) and data._norm_func is norm_func:
+            self.data = dict(data.data)
+            return
+        if isinstance(data, dict):
+            aliases = legacy and _LEGACY_ALIASES or _CANONICAL_ALIASES
+            if aliases.isdisjoint(data):
+                self.data = dict(data)
+                return
+
         self.data = {}
         for key, value in six.iteritems(data):
             canonical_key = norm_func(key)
@@ -123,14 +139,23 @@ class CanonicalKeyDict(collections.MutableMapping):
     def __iter__(self):
         return iter(self.data)
 
+    # Every stored key is already normalized, so a key that is found as-is
+    # does not need to be translated.
+
     def __contains__(self, key):
-        return self._norm_func(key) in self.data
+        return key in self.data or self._norm_func(key) in self.data
 
     def __getitem__(self, key):
-        return self.data[self._norm_func(key)]
+        try:
+            return self.data[key]
+        except KeyError:
+            return self.data[self._norm_func(key)]
 
     def __setitem__(self, key, value):
-        self.data[self._norm_func(key)] = value
+        if key in self.data:
+            self.data[key] = value
+        else:
+            self.data[self._norm_func(key)] = value
 
     def __delitem__(self, key):
         del self.data[self._norm_func(key)]
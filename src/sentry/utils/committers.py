@@ -19,6 +19,11 @@ from functools import reduce
 
 PATH_SEPERATORS = frozenset(["/", "\\"])
 
+RELEASE_FILE_INDEX_TTL = 60 * 60
+# Releases with more file changes than this are not indexed, their files are
+# matched with a database query instead.
+MAX_RELEASE_FILE_INDEX_SIZE = 10000
+
 
 def tokenize_path(path):
     for sep in PATH_SEPERATORS:
@@ -56,39 +61,165 @@ def _get_commits(releases):
     )
 
 
-def _get_commit_file_changes(commits, path_name_set):
-    # Get distinct file names and bail if there are no files.
-    filenames = {next(tokenize_path(path), None) for path in path_name_set}
-    filenames = {path for path in filenames if path is not None}
-    if not len(filenames):
-        return []
+def _get_file_index_key(path):
+    filename = next(tokenize_path(path), None)
+    if filename is not None:
+        return filename.lower()
 
-    # build a single query to get all of the commit file that might match the first n frames
-    path_query = reduce(operator.or_, (Q(filename__iendswith=path) for path in filenames))
 
-    commit_file_change_matches = CommitFileChange.objects.filter(path_query, commit__in=commits)
+def _get_release_file_index_cache_key(release_id):
+    return "release-file-index:1:%s" % release_id
 
-    return list(commit_file_change_matches)
 
+def build_release_file_index(release_id):
+    """
+    Builds (and caches) the reverse path index of all files changed by the
+    commits of a release, which maps the lowercased filename (the last path
+    token) to a list of ``(path, commit_id)`` tuples.
 
-def _match_commits_path(commit_file_changes, path):
-    # find commits that match the run time path the best.
+    Returns ``None`` if the release changed too many files to be indexed.
+    """
+    file_changes = list(
+        CommitFileChange.objects.filter(
+            commit__in=ReleaseCommit.objects.filter(release=release_id).values("commit_id")
+        ).values_list("filename", "commit_id")[: MAX_RELEASE_FILE_INDEX_SIZE + 1]
+    )
+
+    if len(file_changes) > MAX_RELEASE_FILE_INDEX_SIZE:
+        index = None
+    else:
+        index = defaultdict(list)
+        for filename, commit_id in file_changes:
+            key = _get_file_index_key(filename)
+            if key is not None:
+                index[key].append((filename, commit_id))
+        index = dict(index)
+
+    cache.set(
+        _get_release_file_index_cache_key(release_id),
+        index if index is not None else -1,
+        RELEASE_FILE_INDEX_TTL,
+    )
+    return index
+
+
+def invalidate_release_file_indexes(release_ids):
+    cache.delete_many([_get_release_file_index_cache_key(release_id) for release_id in release_ids])
+
+
+def invalidate_commit_file_indexes(commit_ids):
+    """
+    Drops the file indexes of all releases which contain one of the commits.
+    """
+    invalidate_release_file_indexes(
+        set(
+            ReleaseCommit.objects.filter(commit__in=commit_ids).values_list("release_id", flat=True)
+        )
+    )
+
+
+def _get_release_file_indexes(releases):
+    """
+    Returns the file indexes of the releases, and the ids of the releases
+    which are too large to be indexed.
+    """
+    cache_keys = {_get_release_file_index_cache_key(r.id): r.id for r in releases}
+    cached = cache.get_many(list(cache_keys))
+
+    indexes = []
+    unindexed_release_ids = []
+    for cache_key, release_id in six.iteritems(cache_keys):
+        index = cached.get(cache_key)
+        if index is None:
+            index = build_release_file_index(release_id)
+        elif index == -1:
+            index = None
+
+        if index is None:
+            unindexed_release_ids.append(release_id)
+        else:
+            indexes.append(index)
+    return indexes, unindexed_release_ids
+
+
+def _get_release_file_changes(release_ids, path_set):
+    """
+    Returns the ``(path, commit_id)`` tuples of all files changed by the
+    commits of the releases which share a filename with one of the paths.
+    """
+    filenames = {_get_file_index_key(path) for path in path_set}
+    filenames.discard(None)
+    if not filenames:
+        return []
+
+    path_query = reduce(operator.or_, (Q(filename__iendswith=path) for path in filenames))
+    return list(
+        CommitFileChange.objects.filter(
+            path_query,
+            commit__in=ReleaseCommit.objects.filter(release__in=release_ids).values("commit_id"),
+        ).values_list("filename", "commit_id")
+    )
+
+
+def _match_path(candidates, path):
+    # find the files that match the run time path the best, returns the
+    # `(commit_id, score)` of every matching commit.
     matching_commits = {}
     best_score = 1
-    for file_change in commit_file_changes:
-        score = score_path_match_length(file_change.filename, path)
+    for filename, commit_id in candidates:
+        score = score_path_match_length(filename, path)
         if score > best_score:
             # reset matches for better match.
             best_score = score
             matching_commits = {}
         if score == best_score:
             # skip 1-score matches when file change is longer than 1 token
-            if score == 1 and len(list(tokenize_path(file_change.filename))) > 1:
+            if score == 1 and len(list(tokenize_path(filename))) > 1:
                 continue
             #  we want a list of unique commits that tie for longest match
-            matching_commits[file_change.commit.id] = (file_change.commit, score)
+            matching_commits[commit_id] = score
+
+    return list(matching_commits.items())
 
-    return matching_commits.values()
+
+def _match_commits_path(commit_file_changes, path):
+    commits = {file_change.commit.id: file_change.commit for file_change in commit_file_changes}
+    return [
+        (commits[commit_id], score)
+        for commit_id, score in _match_path(
+            ((fc.filename, fc.commit.id) for fc in commit_file_changes), path
+        )
+    ]
+
+
+def _get_commit_path_matches(releases, path_set):
+    """
+    Matches every path against the files changed by the commits of the
+    releases, using the release file indexes. Returns the `(commit_id, score)`
+    matches by path.
+    """
+    if not path_set:
+        return {}
+
+    key = "get_commit_path_matches:1:%s" % hash_values(
+        [sorted(r.id for r in releases), sorted(path_set)]
+    )
+    rv = cache.get(key)
+    if rv is None:
+        indexes, unindexed_release_ids = _get_release_file_indexes(releases)
+        if unindexed_release_ids:
+            file_changes = _get_release_file_changes(unindexed_release_ids, path_set)
+        else:
+            file_changes = []
+
+        rv = {}
+        for path in path_set:
+            index_key = _get_file_index_key(path)
+            candidates = [c for index in indexes for c in index.get(index_key, ())]
+            candidates.extend(c for c in file_changes if _get_file_index_key(c[0]) == index_key)
+            rv[path] = _match_path(candidates, path)
+        cache.set(key, rv, 60)
+    return rv
 
 
 def _get_commits_committer(commits, author_id):
@@ -185,7 +316,7 @@ def get_event_file_committers(project, event, frame_limit=25):
         raise Commit.DoesNotExist
 
     frames = _get_frame_paths(event) or ()
-    app_frames = [frame for frame in frames if frame["in_app"]][-frame_limit:]
+    app_frames = [frame for frame in frames if frame.get("in_app")][-frame_limit:]
     if not app_frames:
         app_frames = [frame for frame in frames][-frame_limit:]
 
@@ -212,11 +343,15 @@ def get_event_file_committers(project, event, frame_limit=25):
         f for f in (frame.get("filename") or frame.get("abs_path") for frame in app_frames) if f
     }
 
-    file_changes = []
-    if path_set:
-        file_changes = _get_commit_file_changes(commits, path_set)
-
-    commit_path_matches = {path: _match_commits_path(file_changes, path) for path in path_set}
+    commits_by_id = {commit.id: commit for commit in commits}
+    commit_path_matches = {
+        path: [
+            (commits_by_id[commit_id], score)
+            for commit_id, score in matches
+            if commit_id in commits_by_id
+        ]
+        for path, matches in six.iteritems(_get_commit_path_matches(releases, path_set))
+    }
 
     annotated_frames = [
         {
@@ -3,6 +3,7 @@ from __future__ import absolute_import
 
 from enum import Enum
 from simplejson import JSONEncoder, _default_decoder
+import codecs
 import datetime
 import uuid
 import six
@@ -87,6 +88,10 @@ _default_escaped_encoder = JSONEncoderForHTML(
 )
 
 
+def iterencode(value):
+    return _default_encoder.iterencode(value)
+
+
 def dump(value, fp, **kwargs):
     for chunk in _default_encoder.iterencode(value):
         fp.write(chunk)
@@ -103,6 +108,110 @@ def loads(value, **kwargs):
     return _default_decoder.decode(value)
 
 
+class _StreamReader(object):
+    """
+    Buffers an iterable of byte string chunks and decodes JSON values from it
+    as soon as enough data is available.
+    """
+
+    whitespace = u" \t\n\r"
+
+    def __init__(self, chunks):
+        self.chunks = iter(chunks)
+        self.decoder = codecs.getincrementaldecoder("utf-8")()
+        self.buffer = u""
+        self.pos = 0
+
+    def fill(self):
+        for chunk in self.chunks:
+            text = self.decoder.decode(chunk)
+            if text:
+                self.buffer = self.buffer[self.pos :] + text
+                self.pos = 0
+                return True
+        return False
+
+    def peek(self):
+        while True:
+            while self.pos < len(self.buffer) and self.buffer[self.pos] in self.whitespace:
+                self.pos += 1
+            if self.pos < len(self.buffer):
+                return self.buffer[self.pos]
+            if not self.fill():
+                raise ValueError("Unexpected end of JSON input")
+
+    def expect(self, characters):
+        character = self.peek()
+        if character not in characters:
+            raise ValueError(u"Expected one of {!r}, got {!r}".format(list(characters), character))
+        self.pos += 1
+        return character
+
+    def value(self):
+        self.peek()
+        while True:
+            try:
+                value, end = _default_decoder.raw_decode(self.buffer, self.pos)
+            except ValueError:
+                # The value is (most likely) incomplete, try again once more
+                # data has been read.
+                if not self.fill():
+                    raise
+                continue
+
+            # A value that ends exactly at the end of the buffer might have
+            # been truncated (e.g. a number), so make sure it's complete.
+            if end == len(self.buffer) and self.fill():
+                continue
+
+            self.pos = end
+            return value
+
+
+def load_streaming(chunks, key):
+    """
+    Incrementally decodes a JSON object from an iterable of byte string
+    chunks, without loading the array that is stored under ``key`` at once.
+
+    Returns a tuple of ``(obj, items)``, where ``obj`` is a dictionary of the
+    object members and ``items`` is an iterator that decodes the elements of
+    the ``key`` array one at a time. Members that appear after the array in
+    the document are only added to ``obj`` once ``items`` has been exhausted.
+    """
+    reader = _StreamReader(chunks)
+    obj = {}
+
+    reader.expect(u"{")
+    if reader.peek() == u"}":
+        return obj, iter(())
+
+    while True:
+        name = reader.value()
+        reader.expect(u":")
+        if name == key:
+            break
+        obj[name] = reader.value()
+        if reader.expect(u",}") == u"}":
+            return obj, iter(())
+
+    def items():
+        reader.expect(u"[")
+        if reader.peek() == u"]":
+            reader.pos += 1
+        else:
+            while True:
+                yield reader.value()
+                if reader.expect(u",]") == u"]":
+                    break
+
+        while reader.expect(u",}") == u",":
+            name = reader.value()
+            reader.expect(u":")
+            obj[name] = reader.value()
+
+    return obj, items()
+
+
 def dumps_htmlsafe(value):
     return mark_safe(_default_escaped_encoder.encode(value))
 
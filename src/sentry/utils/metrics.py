@@ -5,12 +5,13 @@ __all__ = ["timing", "incr"]
 import logging
 
 import functools
+import six
+from collections import defaultdict
 from contextlib import contextmanager
 from django.conf import settings
 from random import random
-from time import time
-from threading import Thread
-from six.moves.queue import Queue
+from time import sleep, time
+from threading import Lock, Thread
 
 
 metrics_skip_internal_prefixes = tuple(settings.SENTRY_METRICS_SKIP_INTERNAL_PREFIXES)
@@ -45,29 +46,23 @@ def _sampled_value(value, sample_rate):
 
 
 class InternalMetrics(object):
-    def __init__(self):
+    """
+    Records metrics in the internal TSDB model. Increments are accumulated in
+    process and written with a single ``tsdb.incr_multi`` per distinct
+    amount every ``interval`` seconds.
+    """
+
+    def __init__(self, interval=10):
+        self.interval = interval
+        self.lock = Lock()
+        self.counts = defaultdict(int)
         self._started = False
 
     def _start(self):
-        self.q = q = Queue()
-
         def worker():
-            from sentry import tsdb
-
             while True:
-                key, instance, tags, amount, sample_rate = q.get()
-                amount = _sampled_value(amount, sample_rate)
-                if instance:
-                    full_key = u"{}.{}".format(key, instance)
-                else:
-                    full_key = key
-                try:
-                    tsdb.incr(tsdb.models.internal, full_key, count=amount)
-                except Exception:
-                    logger = logging.getLogger("sentry.errors")
-                    logger.exception("Unable to incr internal metric")
-                finally:
-                    q.task_done()
+                sleep(self.interval)
+                self.flush()
 
         t = Thread(target=worker)
         t.setDaemon(True)
@@ -75,6 +70,23 @@ class InternalMetrics(object):
 
         self._started = True
 
+    def flush(self):
+        from sentry import tsdb
+
+        with self.lock:
+            counts, self.counts = self.counts, defaultdict(int)
+
+        keys_by_amount = defaultdict(list)
+        for full_key, amount in six.iteritems(counts):
+            keys_by_amount[amount].append(full_key)
+
+        for amount, keys in six.iteritems(keys_by_amount):
+            try:
+                tsdb.incr_multi([(tsdb.models.internal, key) for key in keys], count=amount)
+            except Exception:
+                logger = logging.getLogger("sentry.errors")
+                logger.exception("Unable to incr internal metric")
+
     def incr(
         self,
         key,
@@ -83,9 +95,16 @@ class InternalMetrics(object):
         amount=1,
         sample_rate=settings.SENTRY_METRICS_SAMPLE_RATE,
     ):
-        if not self._started:
-            self._start()
-        self.q.put((key, instance, tags, amount, sample_rate))
+        amount = _sampled_value(amount, sample_rate)
+        if instance:
+            full_key = u"{}.{}".format(key, instance)
+        else:
+            full_key = key
+
+        with self.lock:
+            if not self._started:
+                self._start()
+            self.counts[full_key] += amount
 
 
 internal = InternalMetrics()
@@ -81,6 +81,11 @@ def pytest_configure(config):
     settings.SENTRY_TSDB = "sentry.tsdb.inmemory.InMemoryTSDB"
     settings.SENTRY_TSDB_OPTIONS = {}
 
+    # Cached query results would leak between (and within) tests that write
+    # events, so tests that exercise the cache have to enable it explicitly.
+    settings.SENTRY_SNUBA_CACHE_TIERS = ()
+    settings.SENTRY_MODEL_CACHE_LOCAL_TTL = 0
+
     if settings.SENTRY_NEWSLETTER == "sentry.newsletter.base.Newsletter":
         settings.SENTRY_NEWSLETTER = "sentry.newsletter.dummy.DummyNewsletter"
         settings.SENTRY_NEWSLETTER_OPTIONS = {}
@@ -295,8 +295,14 @@ def bulk_delete_objects(
             params.append(value)
 
     for column, value in filters.items():
-        query.append("%s = %%s" % (quote_name(column),))
-        params.append(value)
+        if column.endswith("__in"):
+            query.append(
+                "%s IN (%s)" % (quote_name(column[:-4]), ", ".join(["%s"] * len(value)) or "NULL")
+            )
+            params.extend(value)
+        else:
+            query.append("%s = %%s" % (quote_name(column),))
+            params.append(value)
 
     if db.is_postgres():
         query = """
@@ -44,64 +44,113 @@ def safe_execute(func, *args, **kwargs):
         return result
 
 
-def trim(
-    value,
-    max_size=settings.SENTRY_MAX_VARIABLE_SIZE,
-    max_depth=6,
-    object_hook=None,
-    _depth=0,
-    _size=0,
-    **kwargs
-):
+def _dumps_prefix(value, length):
     """
-    Truncates a value to ```MAX_VARIABLE_SIZE```.
-
-    The method of truncation depends on the type of value.
+    Returns ``json.dumps(value)``, or a prefix of it which is longer than
+    ``length`` characters. Only as much of the value is encoded as necessary.
     """
-    options = {
-        "max_depth": max_depth,
-        "max_size": max_size,
-        "object_hook": object_hook,
-        "_depth": _depth + 1,
-    }
+    chunks = []
+    size = 0
+    for chunk in json.iterencode(value):
+        chunks.append(chunk)
+        size += len(chunk)
+        if size > length:
+            break
+    return "".join(chunks)
+
+
+def _text_len(value, text_len=None):
+    if text_len is not None:
+        return text_len
+    if isinstance(value, six.text_type):
+        return len(value)
+    return len(force_text(value))
 
+
+def _trim(value, max_size, max_depth, object_hook, _depth, _size):
+    """
+    Returns the trimmed value, the length of its ``repr`` and the length of
+    its text (``force_text``), either of which is ``None`` if unknown. The
+    lengths of a container are summed up from its items, so that measuring
+    every level of a tree doesn't serialize its subtrees again. Other values
+    are only converted to text by the container that needs their length.
+    """
     if _depth > max_depth:
         if not isinstance(value, six.string_types):
-            value = json.dumps(value)
-        return trim(value, _size=_size, max_size=max_size)
+            value = _dumps_prefix(value, max_size - _size)
+        result = truncatechars(value, max_size - _size)
+        return result, len(repr(result)), None
 
     elif isinstance(value, dict):
         result = {}
         _size += 2
+        repr_len = 2
         for k in sorted(value.keys()):
-            v = value[k]
-            trim_v = trim(v, _size=_size, **options)
+            trim_v, v_repr_len, v_text_len = _trim(
+                value[k], max_size, max_depth, object_hook, _depth + 1, _size
+            )
             result[k] = trim_v
-            _size += len(force_text(trim_v)) + 1
+            _size += _text_len(trim_v, v_text_len) + 1
+            if repr_len is not None:
+                repr_len = None if v_repr_len is None else repr_len + len(repr(k)) + 4 + v_repr_len
             if _size >= max_size:
                 break
+        if result and repr_len is not None:
+            # No trailing separator
+            repr_len -= 2
+        text_len = repr_len
 
     elif isinstance(value, (list, tuple)):
         result = []
         _size += 2
+        repr_len = 2
         for v in value:
-            trim_v = trim(v, _size=_size, **options)
+            trim_v, v_repr_len, v_text_len = _trim(
+                v, max_size, max_depth, object_hook, _depth + 1, _size
+            )
             result.append(trim_v)
-            _size += len(force_text(trim_v))
+            _size += _text_len(trim_v, v_text_len)
+            if repr_len is not None:
+                repr_len = None if v_repr_len is None else repr_len + v_repr_len + 2
             if _size >= max_size:
                 break
+        if result and repr_len is not None:
+            # No trailing separator, unless this is a single item tuple
+            repr_len -= 1 if isinstance(value, tuple) and len(result) == 1 else 2
         if isinstance(value, tuple):
             result = tuple(result)
+        text_len = repr_len
 
     elif isinstance(value, six.string_types):
         result = truncatechars(value, max_size - _size)
+        repr_len = len(repr(result))
+        text_len = None
 
     else:
         result = value
+        repr_len = len(repr(result))
+        text_len = None
 
-    if object_hook is None:
-        return result
-    return object_hook(result)
+    if object_hook is not None:
+        return object_hook(result), None, None
+    return result, repr_len, text_len
+
+
+def trim(
+    value,
+    max_size=settings.SENTRY_MAX_VARIABLE_SIZE,
+    max_depth=6,
+    object_hook=None,
+    _depth=0,
+    _size=0,
+    **kwargs
+):
+    """
+    Truncates a value to ```MAX_VARIABLE_SIZE```.
+
+    The method of truncation depends on the type of value.
+    """
+    return _trim(value, max_size, max_depth, object_hook, _depth, _size)[0]
 
 
 def trim_pairs(iterable, max_items=settings.SENTRY_MAX_DICTIONARY_ITEMS, **kwargs):
@@ -10,11 +10,12 @@ import os
 import pytz
 import re
 import six
+import threading
 import time
 import urllib3
 import uuid
 
-from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures import Future, ThreadPoolExecutor
 from django.conf import settings
 
 from sentry import quotas
@@ -30,6 +31,7 @@ from sentry.models import (
 from sentry.net.http import connection_from_url
 from sentry.utils import metrics, json
 from sentry.utils.dates import to_timestamp
+from sentry.utils.hashlib import md5_text
 
 # TODO remove this when Snuba accepts more than 500 issues
 MAX_ISSUES = 500
@@ -302,6 +304,95 @@ _snuba_pool = connection_from_url(
 )
 _query_thread_pool = ThreadPoolExecutor(max_workers=10)
 
+# The size (in bytes) of the chunks that are read from streamed responses.
+STREAM_CHUNK_SIZE = 64 * 1024
+
+# The bounds (in seconds) of the TTL of cached query results. Queries whose
+# time window ends close to the current time use the minimum TTL, the TTL then
+# grows with the distance between the end of the window and now, since older
+# data is much less likely to change.
+QUERY_CACHE_MIN_TTL = 10
+QUERY_CACHE_MAX_TTL = 60 * 5
+
+# The TTL is a fraction of the time between the end of the queried window and
+# now, e.g. a query that ends an hour ago is cached for 6 minutes.
+QUERY_CACHE_TTL_RATIO = 0.1
+
+SnubaResponse = namedtuple("SnubaResponse", ("status", "data"))
+
+
+class LocalQueryCache(object):
+    """
+    A size bounded, per-process LRU cache where each item expires after its
+    own TTL.
+    """
+
+    def __init__(self, size):
+        self.size = size
+        self.items = OrderedDict()
+        self.lock = threading.Lock()
+
+    def get(self, key):
+        with self.lock:
+            item = self.items.pop(key, None)
+            if item is None:
+                return None
+
+            expires, value = item
+            if expires < time.time():
+                return None
+
+            self.items[key] = item
+            return value
+
+    def set(self, key, value, ttl):
+        with self.lock:
+            self.items.pop(key, None)
+            self.items[key] = (time.time() + ttl, value)
+            while len(self.items) > self.size:
+                self.items.popitem(last=False)
+
+    def clear(self):
+        with self.lock:
+            self.items.clear()
+
+
+class SingleFlight(object):
+    """
+    Ensures that only one of the threads requesting the same key performs the
+    computation, while the others wait for (and share) its result.
+    """
+
+    def __init__(self):
+        self.calls = {}
+        self.lock = threading.Lock()
+
+    def do(self, key, function):
+        with self.lock:
+            future = self.calls.get(key)
+            leader = future is None
+            if leader:
+                future = self.calls[key] = Future()
+
+        if not leader:
+            return future.result()
+
+        try:
+            result = function()
+        except Exception as error:
+            future.set_exception(error)
+            raise
+        else:
+            future.set_result(result)
+            return result
+        finally:
+            with self.lock:
+                del self.calls[key]
+
+
+_local_query_cache = LocalQueryCache(settings.SENTRY_SNUBA_CACHE_LOCAL_SIZE)
+_query_single_flight = SingleFlight()
+
 
 epoch_naive = datetime(1970, 1, 1, tzinfo=None)
 
@@ -544,6 +635,11 @@ def transform_aliases_and_query(skip_conditions=False, **kwargs):
     having = kwargs.get("having", [])
     dataset = detect_dataset(kwargs, aliased_conditions=skip_conditions)
 
+    stream = kwargs.get("stream", False)
+    if stream and rollup and rollup > 0:
+        # Zerofilling needs all rows at once.
+        stream = kwargs["stream"] = False
+
     if selected_columns:
         for (idx, col) in enumerate(selected_columns):
             if isinstance(col, list):
@@ -627,13 +723,26 @@ def transform_aliases_and_query(skip_conditions=False, **kwargs):
 
     result = dataset_query(**kwargs)
 
-    # Translate back columns that were converted to snuba format
-    for col in result["meta"]:
-        col["name"] = translated_columns.get(col["name"], col["name"])
+    def translate_meta():
+        # Translate back columns that were converted to snuba format
+        for col in result["meta"]:
+            col["name"] = translated_columns.get(col["name"], col["name"])
 
     def get_row(row):
         return {translated_columns.get(key, key): value for key, value in row.items()}
 
+    if stream:
+        # The meta of a streamed result follows its rows, so it is only
+        # translated once they have been consumed.
+        def iter_rows(rows):
+            for row in rows:
+                yield get_row(row) if translated_columns else row
+            translate_meta()
+
+        result["data"] = iter_rows(result["data"])
+        return result
+
+    translate_meta()
     if len(translated_columns):
         result["data"] = [get_row(row) for row in result["data"]]
         if rollup and rollup > 0:
@@ -789,11 +898,13 @@ def raw_query(
     rollup=None,
     referrer=None,
     is_grouprelease=False,
+    use_cache=False,
+    stream=False,
     **kwargs
 ):
     """
     Sends a query to snuba.  See `SnubaQueryParams` docstring for param
-    descriptions.
+    descriptions. See `bulk_raw_query` for `use_cache` and `stream`.
     """
     snuba_params = SnubaQueryParams(
         dataset=dataset,
@@ -807,39 +918,183 @@ def raw_query(
         is_grouprelease=is_grouprelease,
         **kwargs
     )
-    return bulk_raw_query([snuba_params], referrer=referrer)[0]
+    return bulk_raw_query([snuba_params], referrer=referrer, use_cache=use_cache, stream=stream)[0]
+
 
+def get_query_cache_ttl(end, now=None):
+    """
+    Returns the number of seconds the result of a query with a time window
+    ending at ``end`` (a naive UTC datetime) can be cached for.
+    """
+    if now is None:
+        now = datetime.utcnow()
+    age = (now - end).total_seconds()
+    return int(max(QUERY_CACHE_MIN_TTL, min(QUERY_CACHE_MAX_TTL, age * QUERY_CACHE_TTL_RATIO)))
 
-def bulk_raw_query(snuba_param_list, referrer=None):
+
+def get_query_cache_key(query_params, ttl, now=None):
+    """
+    Returns a key identifying the prepared query body. Windows that end
+    within the TTL of the current time are relative to it (e.g. the last 24
+    hours), so they are truncated to the TTL to share the cached result.
+    All other windows are identified by their exact bounds.
+    """
+    if now is None:
+        now = datetime.utcnow()
+
+    body = dict(query_params)
+    if body.get("to_date"):
+        end = parse_datetime(body["to_date"])
+        if end >= now - timedelta(seconds=ttl):
+            for name in ("from_date", "to_date"):
+                if body.get(name):
+                    timestamp = to_naive_timestamp(parse_datetime(body[name]))
+                    body[name] = int(timestamp - timestamp % ttl)
+    return "snuba:query:%s" % md5_text(json.dumps(body, sort_keys=True)).hexdigest()
+
+
+def _get_cache_tiers():
+    tiers = []
+    for tier in settings.SENTRY_SNUBA_CACHE_TIERS:
+        if tier == "local":
+            tiers.append((tier, _local_query_cache))
+        elif tier == "redis":
+            from sentry.cache import default_cache
+
+            tiers.append((tier, default_cache))
+        else:
+            raise ValueError(u"Unknown Snuba cache tier: {!r}".format(tier))
+    return tiers
+
+
+def _cache_get(tiers, key, referrer):
+    for i, (name, cache) in enumerate(tiers):
+        if name == "local":
+            value = cache.get(key)
+        else:
+            value = cache.get(key, raw=True)
+
+        if value is not None:
+            metrics.incr(
+                "snuba.client.cache", tags={"referrer": referrer, "tier": name, "result": "hit"}
+            )
+            # Backfill the faster tiers that did not have the value.
+            for _, other in tiers[:i]:
+                other.set(key, value, QUERY_CACHE_MIN_TTL)
+            return value
+
+    metrics.incr("snuba.client.cache", tags={"referrer": referrer, "result": "miss"})
+    return None
+
+
+def _cache_set(tiers, key, value, ttl):
+    for name, cache in tiers:
+        if name == "local":
+            cache.set(key, value, ttl)
+        else:
+            cache.set(key, value, ttl, raw=True)
+
+
+def _stream_response_body(response, reverse):
+    """
+    Returns the body of a successful (streamed) query response, where `data`
+    is an iterator that decodes and translates the rows as they are consumed.
+    Members of the response that follow the rows (such as `meta`) are only
+    available once all rows have been consumed.
+    """
+    try:
+        body, rows = json.load_streaming(response.stream(STREAM_CHUNK_SIZE), "data")
+    except ValueError as error:
+        response.close()
+        response.release_conn()
+        raise UnexpectedResponseError(u"Could not decode JSON response: {}".format(error))
+
+    def iter_rows():
+        complete = False
+        try:
+            for row in rows:
+                yield reverse(row)
+            complete = True
+        except ValueError as error:
+            raise UnexpectedResponseError(u"Could not decode JSON response: {}".format(error))
+        finally:
+            # Don't return a connection with unread data to the pool if the
+            # rows were not fully consumed.
+            if not complete:
+                response.close()
+            response.release_conn()
+
+    body["data"] = iter_rows()
+    return body
+
+
+def bulk_raw_query(snuba_param_list, referrer=None, use_cache=False, stream=False):
+    """
+    Sends multiple queries to snuba in parallel.
+
+    If `use_cache` is set, results of queries that do not require consistency
+    are looked up in (and stored to) the tiers configured by
+    `SENTRY_SNUBA_CACHE_TIERS`, and concurrent identical queries within the
+    process only result in a single request.
+
+    If `stream` is set, the `data` of each result is an iterator of rows that
+    are decoded from the response while they are consumed, rather than a
+    list (see `_stream_response_body`.) Streamed results are never cached.
+    """
     headers = {}
     if referrer:
         headers["referer"] = referrer
 
     query_param_list = map(_prepare_query_params, snuba_param_list)
 
-    def snuba_query(params):
-        query_params, forward, reverse = params
+    def snuba_query(query_params):
         try:
             with timer("snuba_query"):
-                return (
-                    _snuba_pool.urlopen(
-                        "POST", "/query", body=json.dumps(query_params), headers=headers
-                    ),
-                    forward,
-                    reverse,
+                return _snuba_pool.urlopen(
+                    "POST",
+                    "/query",
+                    body=json.dumps(query_params),
+                    headers=headers,
+                    preload_content=not stream,
                 )
         except urllib3.exceptions.HTTPError as err:
             raise SnubaError(err)
 
+    cache_tiers = _get_cache_tiers() if use_cache and not stream else []
+
+    def cached_snuba_query(params):
+        query_params, forward, reverse = params
+        if not cache_tiers or query_params.get("consistent"):
+            return snuba_query(query_params), forward, reverse
+
+        ttl = get_query_cache_ttl(parse_datetime(query_params["to_date"]))
+        key = get_query_cache_key(query_params, ttl)
+
+        def fetch():
+            data = _cache_get(cache_tiers, key, referrer)
+            if data is not None:
+                return SnubaResponse(200, data)
+
+            response = snuba_query(query_params)
+            if response.status == 200:
+                _cache_set(cache_tiers, key, response.data, ttl)
+            return SnubaResponse(response.status, response.data)
+
+        return _query_single_flight.do(key, fetch), forward, reverse
+
     if len(snuba_param_list) > 1:
-        query_results = _query_thread_pool.map(snuba_query, query_param_list)
+        query_results = _query_thread_pool.map(cached_snuba_query, query_param_list)
     else:
         # No need to submit to the thread pool if we're just performing a
         # single query
-        query_results = [snuba_query(query_param_list[0])]
+        query_results = [cached_snuba_query(query_param_list[0])]
 
     results = []
     for response, _, reverse in query_results:
+        if stream and response.status == 200:
+            results.append(_stream_response_body(response, reverse))
+            continue
+
         try:
             body = json.loads(response.data)
         except ValueError:
@@ -3,11 +3,11 @@ from __future__ import absolute_import, print_function
 import base64
 import math
 
-import io
 import jsonschema
 import logging
 import random
 import six
+import tempfile
 import traceback
 import uuid
 
@@ -18,6 +18,7 @@ from django.contrib.auth.models import AnonymousUser
 from django.core.cache import cache
 from django.core.urlresolvers import reverse
 from django.core.files import uploadhandler
+from django.core.files.base import File as FileObj
 from django.http import HttpResponse, HttpResponseRedirect, HttpResponseNotAllowed
 from django.http.multipartparser import MultiPartParser
 from django.utils.encoding import force_bytes
@@ -677,6 +678,26 @@ class EventAttachmentStoreView(StoreView):
         return HttpResponse(status=201)
 
 
+def spool_request_body(request, name=None):
+    """
+    Reads the request body into a temporary file in chunks. Small bodies are
+    kept in memory, larger ones are written to disk.
+    """
+    spooled = tempfile.SpooledTemporaryFile(max_size=settings.FILE_UPLOAD_MAX_MEMORY_SIZE)
+    size = 0
+    while True:
+        chunk = request.read(65536)
+        if not chunk:
+            break
+        spooled.write(chunk)
+        size += len(chunk)
+
+    spooled.seek(0)
+    rv = FileObj(spooled, name=name)
+    rv.size = size
+    return rv
+
+
 class MinidumpView(StoreView):
     auth_helper_cls = MinidumpAuthHelper
     dump_types = ("application/octet-stream", "application/x-dmp")
@@ -748,8 +769,8 @@ class MinidumpView(StoreView):
         content_type = request.META.get("CONTENT_TYPE")
 
         if content_type in self.dump_types:
-            minidump = io.BytesIO(request.body)
             minidump_name = "Minidump"
+            minidump = spool_request_body(request, minidump_name)
             data = {}
         else:
             minidump = request_files.get("upload_file_minidump")
@@ -850,12 +871,11 @@ class MinidumpView(StoreView):
         # distinguish it from regular attachments for processing. Also, it might
         # not be part of `request_files` if it has been uploaded as raw request
         # body instead of a multipart formdata request.
-        minidump.seek(0)
         attachments.append(
             CachedAttachment(
                 name=minidump_name,
                 content_type="application/octet-stream",
-                data=minidump.read(),
+                fileobj=minidump,
                 type=MINIDUMP_ATTACHMENT_TYPE,
             )
         )
@@ -1028,7 +1048,7 @@ class UnrealView(StoreView):
                 attachments.append(
                     CachedAttachment(
                         name=file.name,
-                        data=file.open_stream().read(),
+                        fileobj=file.open_stream(),
                         type=unreal_attachment_type(file),
                     )
                 )
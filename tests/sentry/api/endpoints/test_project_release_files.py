@@ -4,9 +4,11 @@ import six
 
 from django.core.files.uploadedfile import SimpleUploadedFile
 from django.core.urlresolvers import reverse
+from django.db.models.signals import post_save
 
 from sentry.models import File, Release, ReleaseFile
 from sentry.testutils import APITestCase
+from sentry.utils.cache import cache
 
 
 class ReleaseFilesListTest(APITestCase):
@@ -81,6 +83,47 @@ class ReleaseFileCreateTest(APITestCase):
             "X-SourceMap": "http://example.com",
         }
 
+    def test_manifest_built_before_commit(self):
+        project = self.create_project(name="foo")
+
+        release = Release.objects.create(organization_id=project.organization_id, version="1")
+        release.add_project(project)
+
+        # Simulates a concurrent lookup which builds the manifest after it
+        # was invalidated, but before the new file is committed.
+        def build_stale_manifest(instance, **kwargs):
+            cache.set(ReleaseFile.objects._get_manifest_key(release.id, None), [], 60)
+
+        post_save.connect(build_stale_manifest, sender=ReleaseFile, weak=False)
+        self.addCleanup(post_save.disconnect, build_stale_manifest, sender=ReleaseFile)
+
+        url = reverse(
+            "sentry-api-0-project-release-files",
+            kwargs={
+                "organization_slug": project.organization.slug,
+                "project_slug": project.slug,
+                "version": release.version,
+            },
+        )
+
+        self.login_as(user=self.user)
+
+        response = self.client.post(
+            url,
+            {
+                "name": "http://example.com/application.js",
+                "file": SimpleUploadedFile(
+                    "application.js", b"function() { }", content_type="application/javascript"
+                ),
+            },
+            format="multipart",
+        )
+
+        assert response.status_code == 201, response.content
+        assert ReleaseFile.objects.get_manifest(release) == frozenset(
+            [ReleaseFile.get_ident("http://example.com/application.js")]
+        )
+
     def test_no_file(self):
         project = self.create_project(name="foo")
 
@@ -518,3 +518,43 @@ class GenericOffsetPaginatorTest(TestCase):
         assert list(result2) == [5]
         assert result2.prev == Cursor(0, 0, True, True)
         assert result2.next == Cursor(0, 10, False, False)
+
+    def test_iterator(self):
+        def data_fn(offset=None, limit=None):
+            return iter(range(offset, 12))
+
+        paginator = GenericOffsetPaginator(data_fn=data_fn)
+
+        result = paginator.get_result(5)
+        assert list(result) == [0, 1, 2, 3, 4]
+        assert result.next == Cursor(0, 5, False, True)
+
+    def test_dict_with_iterator(self):
+        def data_fn(offset=None, limit=None):
+            return {"data": iter(range(offset, 7)), "meta": []}
+
+        paginator = GenericOffsetPaginator(data_fn=data_fn)
+
+        result = paginator.get_result(5)
+        assert result.results["data"] == [0, 1, 2, 3, 4]
+        assert result.next == Cursor(0, 5, False, True)
+
+    def test_dict_with_iterator_trailing_members(self):
+        def data_fn(offset=None, limit=None):
+            # Members following the rows of a streamed snuba response are
+            # only available once all rows have been read.
+            result = {}
+
+            def rows():
+                for i in range(offset, offset + limit):
+                    yield i
+                result["meta"] = [{"name": "count"}]
+
+            result["data"] = rows()
+            return result
+
+        paginator = GenericOffsetPaginator(data_fn=data_fn)
+
+        result = paginator.get_result(5)
+        assert result.results == {"data": [0, 1, 2, 3, 4], "meta": [{"name": "count"}]}
+        assert result.next == Cursor(0, 5, False, True)
@@ -0,0 +1,79 @@
+from __future__ import absolute_import
+
+import mock
+import zlib
+
+from six import BytesIO
+
+from sentry.attachments.base import BaseAttachmentCache, CachedAttachment
+from sentry.testutils import TestCase
+
+
+class InMemoryCache(object):
+    def __init__(self):
+        self.data = {}
+
+    def set(self, key, value, timeout, raw=False):
+        self.data[key] = value
+
+    def get(self, key, raw=False):
+        return self.data.get(key)
+
+    def delete(self, key):
+        del self.data[key]
+
+
+class BaseAttachmentCacheTest(TestCase):
+    def setUp(self):
+        self.inner = InMemoryCache()
+        self.cache = BaseAttachmentCache(self.inner)
+
+    @mock.patch("sentry.attachments.base.ATTACHMENT_CHUNK_SIZE", 4)
+    def test_chunked_roundtrip(self):
+        fileobj = BytesIO(b"Hello World!")
+        self.cache.set(
+            "foo",
+            [
+                CachedAttachment(name="foo.txt", content_type="text/plain", fileobj=fileobj),
+                CachedAttachment(name="bar.txt", content_type="text/plain", data=b"Bar"),
+            ],
+        )
+
+        assert sorted(self.inner.data) == [
+            "foo:a",
+            "foo:a:0:0",
+            "foo:a:0:1",
+            "foo:a:0:2",
+            "foo:a:1:0",
+        ]
+
+        foo, bar = self.cache.get("foo")
+        assert foo.meta() == {
+            "type": "event.attachment",
+            "name": "foo.txt",
+            "content_type": "text/plain",
+        }
+        assert foo.size == 12
+        assert list(foo.chunks()) == [b"Hell", b"o Wo", b"rld!"]
+
+        reader = foo.open()
+        assert reader.read(5) == b"Hello"
+        assert reader.read(100) == b" World!"
+        assert reader.read(100) == b""
+
+        assert foo.data == b"Hello World!"
+        assert bar.data == b"Bar"
+
+        self.cache.delete("foo")
+        assert self.inner.data == {}
+
+    def test_legacy_values(self):
+        self.inner.data["foo:a"] = [{"name": "foo.txt", "content_type": "text/plain"}]
+        self.inner.data["foo:a:0"] = zlib.compress(b"Hello World!")
+
+        (attachment,) = self.cache.get("foo")
+        assert attachment.size == 12
+        assert attachment.data == b"Hello World!"
+
+        self.cache.delete("foo")
+        assert self.inner.data == {}
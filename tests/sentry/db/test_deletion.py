@@ -1,9 +1,13 @@
 from __future__ import absolute_import
 
+import os
+import shutil
+import tempfile
+
 from datetime import timedelta
 from django.utils import timezone
 
-from sentry.db.deletion import BulkDeleteQuery
+from sentry.db.deletion import BulkDeleteQuery, DeletionCheckpoint
 from sentry.models import Group, Project
 from sentry.testutils import TestCase, TransactionTestCase
 
@@ -58,3 +62,47 @@ class BulkDeleteQueryIteratorTestCase(TransactionTestCase):
             results.update(chunk)
 
         assert results == expected_group_ids
+
+
+class BulkDeleteQueryPartitionedTestCase(TransactionTestCase):
+    def setUp(self):
+        super(BulkDeleteQueryPartitionedTestCase, self).setUp()
+        self.tmpdir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.tmpdir)
+
+    def test_get_partitions(self):
+        groups = [self.create_group() for i in range(5)]
+        partitions = BulkDeleteQuery(model=Group).get_partitions(2)
+        assert len(partitions) == 2
+        assert partitions[0][0] == min(g.id for g in groups)
+        assert partitions[0][1] == partitions[1][0]
+        assert partitions[1][1] == max(g.id for g in groups) + 1
+
+    def test_execute_partitioned(self):
+        target_project = self.project
+        for i in range(5):
+            self.create_group(target_project)
+
+        other_project = self.create_project()
+        other_group = self.create_group(other_project)
+
+        path = os.path.join(self.tmpdir, "checkpoint.json")
+        query = BulkDeleteQuery(model=Group, project_id=target_project.id)
+        deleted = query.execute_partitioned(3, chunk_size=1, checkpoint=DeletionCheckpoint(path))
+
+        assert deleted == 5
+        assert not Group.objects.filter(project=target_project).exists()
+        assert Group.objects.filter(id=other_group.id).exists()
+        assert DeletionCheckpoint(path).get(query.get_checkpoint_key()) is None
+
+    def test_execute_partitioned_resume(self):
+        groups = [self.create_group() for i in range(4)]
+        query = BulkDeleteQuery(model=Group, project_id=self.project.id)
+
+        # Pretend that an earlier run already finished up to the third group.
+        path = os.path.join(self.tmpdir, "checkpoint.json")
+        checkpoint = DeletionCheckpoint(path)
+        checkpoint.set(query.get_checkpoint_key(), [[groups[2].id, groups[3].id + 1]])
+
+        assert query.execute_partitioned(2, checkpoint=DeletionCheckpoint(path)) == 2
+        assert set(Group.objects.values_list("id", flat=True)) == {groups[0].id, groups[1].id}
@@ -2,6 +2,7 @@ from __future__ import absolute_import
 
 from uuid import uuid4
 
+from sentry import nodestore
 from sentry.models import (
     Event,
     Group,
@@ -13,7 +14,7 @@ from sentry.models import (
     ScheduledDeletion,
     UserReport,
 )
-from sentry.tasks.deletion import run_deletion
+from sentry.tasks.deletion import delete_groups, run_deletion
 from sentry.testutils import TestCase
 from sentry.testutils.helpers.datetime import iso_format, before_now
 
@@ -58,3 +59,37 @@ class DeleteGroupTest(TestCase):
         assert not GroupRedirect.objects.filter(group_id=group.id).exists()
         assert not GroupHash.objects.filter(group_id=group.id).exists()
         assert not Group.objects.filter(id=group.id).exists()
+
+    def test_multiple_groups(self):
+        project = self.create_project()
+        groups = [self.create_group(project=project) for i in range(3)]
+        events = [self.create_event(group=group) for group in groups]
+        for group in groups:
+            GroupHash.objects.create(project=project, group=group, hash=uuid4().hex)
+            GroupMeta.objects.create(group=group, key="foo", value="bar")
+            UserReport.objects.create(group_id=group.id, project_id=project.id, name="Jane Doe")
+        node_ids = [Event.generate_node_id(project.id, e.event_id) for e in events]
+
+        other_group = self.create_group(project=project)
+        other_event = self.create_event(group=other_group)
+        GroupHash.objects.create(project=project, group=other_group, hash=uuid4().hex)
+
+        with self.tasks():
+            delete_groups(object_ids=[group.id for group in groups[:2]])
+
+        group_ids = [group.id for group in groups[:2]]
+        assert not Group.objects.filter(id__in=group_ids).exists()
+        assert not Event.objects.filter(group_id__in=group_ids).exists()
+        assert not GroupHash.objects.filter(group_id__in=group_ids).exists()
+        assert not GroupMeta.objects.filter(group_id__in=group_ids).exists()
+        assert not UserReport.objects.filter(group_id__in=group_ids).exists()
+        assert nodestore.get(node_ids[0]) is None
+        assert nodestore.get(node_ids[1]) is None
+
+        for group in (groups[2], other_group):
+            assert Group.objects.filter(id=group.id).exists()
+            assert GroupHash.objects.filter(group_id=group.id).exists()
+        assert Event.objects.filter(id__in=[events[2].id, other_event.id]).count() == 2
+        assert GroupMeta.objects.filter(group_id=groups[2].id).exists()
+        assert UserReport.objects.filter(group_id=groups[2].id).exists()
+        assert nodestore.get(node_ids[2]) is not None
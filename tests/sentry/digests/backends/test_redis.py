@@ -154,3 +154,20 @@ class RedisBackendTestCase(TestCase):
 
         with backend.digest("timeline", 0) as records:
             assert len(set(records)) == n
+
+    def test_schedule_limit(self):
+        backend = RedisBackend(schedule_limit=2)
+
+        t = time.time()
+        for i in xrange(5):
+            timeline = u"timeline:{}".format(i)
+            backend.add(timeline, Record(u"record:{}".format(i), "value", t))
+            with backend.digest(timeline, 0) as records:
+                pass
+
+        # Only up to the limit of timelines are scheduled at a time, the
+        # remaining ones are picked up by subsequent calls.
+        scheduled = [set(entry.key for entry in backend.schedule(t + 600)) for _ in xrange(3)]
+        assert [len(keys) for keys in scheduled] == [2, 2, 1]
+        assert set.union(*scheduled) == set(u"timeline:{}".format(i) for i in xrange(5))
+        assert set(backend.schedule(t + 600)) == set()
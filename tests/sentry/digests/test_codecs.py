@@ -0,0 +1,58 @@
+from __future__ import absolute_import
+
+from sentry.digests.codecs import CompactNotificationCodec, CompressedPickleCodec
+from sentry.digests.notifications import (
+    EventReference,
+    Notification,
+    event_to_record,
+    rehydrate_records,
+)
+from sentry.testutils import TestCase
+
+
+class CompactNotificationCodecTestCase(TestCase):
+    codec = CompactNotificationCodec()
+
+    def test_roundtrip(self):
+        rule = self.project.rule_set.all()[0]
+        record = event_to_record(self.event, (rule,))
+
+        value = self.codec.decode(self.codec.encode(record.value))
+        assert value == Notification(EventReference.from_event(self.event), [rule.id])
+
+    def test_decodes_pickled_values(self):
+        record = event_to_record(self.event, (self.project.rule_set.all()[0],))
+        value = CompressedPickleCodec().encode(record.value)
+        assert self.codec.decode(value) == record.value
+
+    def test_non_notification_values(self):
+        assert self.codec.decode(self.codec.encode("value")) == "value"
+
+    def test_encoded_size(self):
+        rule = self.project.rule_set.all()[0]
+        event = self.store_event(
+            data={
+                "message": "x" * 1024,
+                "extra": {"key-%s" % i: "value" * 20 for i in range(50)},
+                "tags": {"tag-%s" % i: "value-%s" % i for i in range(20)},
+            },
+            project_id=self.project.id,
+        )
+        record = event_to_record(event, (rule,))
+
+        compact = len(self.codec.encode(record.value))
+        pickled = len(CompressedPickleCodec().encode(record.value))
+        assert compact * 10 <= pickled
+
+    def test_rehydrate_records(self):
+        rule = self.project.rule_set.all()[0]
+        event = self.store_event(data={"message": "hello world"}, project_id=self.project.id)
+        record = event_to_record(event, (rule,))
+        encoded = record._replace(value=self.codec.decode(self.codec.encode(record.value)))
+
+        (rehydrated,) = rehydrate_records([encoded])
+        assert rehydrated.key == record.key
+        assert rehydrated.value.rules == [rule.id]
+        assert rehydrated.value.event.event_id == event.event_id
+        assert rehydrated.value.event.group_id == event.group_id
+        assert rehydrated.value.event.data["logentry"] == event.data["logentry"]
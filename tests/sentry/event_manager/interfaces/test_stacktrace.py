@@ -5,6 +5,7 @@ from __future__ import absolute_import
 
 import pytest
 import mock
+from six.moves import cPickle as pickle
 from django.conf import settings
 
 from sentry.interfaces.stacktrace import get_context, is_url
@@ -155,3 +156,57 @@ def test_get_stacktrace_with_filename_function_lineno_and_context(make_stacktrac
             ]
         )
     )
+
+
+def test_frames_share_event_data():
+    frames = [
+        {
+            "function": "fn%d" % i,
+            "instruction_addr": "0x%x" % (0x1000 + i),
+            "package": "/usr/lib/libfoo.so",
+            "in_app": i % 2 == 0,
+        }
+        for i in range(1000)
+    ]
+    mgr = EventManager(data={"platform": "native", "stacktrace": {"frames": frames}})
+    mgr.normalize()
+    evt = Event(data=mgr.get_data())
+
+    interface = evt.interfaces["stacktrace"]
+    raw_frames = evt.data["stacktrace"]["frames"]
+    assert len(interface.frames) == 1000
+
+    frame = interface.frames[1]
+    # Frames are slotted
+    assert type(frame).__dictoffset__ == 0
+    assert frame.get_api_context()["function"] == "fn1"
+    assert frame.lineno is None
+    with pytest.raises(KeyError):
+        frame.not_an_attribute
+
+    # Reading frames neither copies nor modifies the event data
+    assert frame._data is raw_frames[1]
+    assert "lineno" not in raw_frames[1]
+    assert (
+        frame.to_json()
+        == frame.to_json()
+        == {
+            "function": "fn1",
+            "instruction_addr": "0x1001",
+            "package": "/usr/lib/libfoo.so",
+            "in_app": False,
+        }
+    )
+
+    # Modifications are private to the frame
+    frame.in_app = True
+    assert frame.to_json()["in_app"] is True
+    assert raw_frames[1]["in_app"] is False
+
+    frame = interface.frames[2]
+    frame.get_raw_data()["function"] = "other"
+    assert frame.function == "other"
+    assert frame.to_json()["function"] == "other"
+    assert raw_frames[2]["function"] == "fn2"
+
+    assert pickle.loads(pickle.dumps(interface)) == interface
@@ -0,0 +1,38 @@
+from __future__ import absolute_import
+
+from sentry.cache import default_cache
+from sentry.eventstore.processing import event_processing_store
+from sentry.testutils import TestCase
+from sentry.utils import json
+from sentry.utils.canonical import CanonicalKeyDict
+
+
+class EventProcessingStoreTest(TestCase):
+    def test_roundtrip(self):
+        data = CanonicalKeyDict(
+            {
+                "event_id": "a" * 32,
+                "project": 1,
+                "sentry.interfaces.Message": {"message": "foo"},
+                "extra": {"bar": [1, 2.5, None, True]},
+            }
+        )
+        event_processing_store.store("e:1", data, "ingest")
+
+        value = default_cache.get("e:1", raw=True)
+        assert event_processing_store.decode(value)[0] == "ingest"
+
+        assert event_processing_store.get("e:1", "save") == {
+            "event_id": "a" * 32,
+            "project": 1,
+            "logentry": {"message": "foo"},
+            "extra": {"bar": [1, 2.5, None, True]},
+        }
+
+        event_processing_store.delete("e:1")
+        assert event_processing_store.get("e:1", "save") is None
+
+    def test_legacy_values(self):
+        data = {"event_id": "a" * 32, "project": 1}
+        assert event_processing_store.decode(data) == (None, data)
+        assert event_processing_store.decode(json.dumps(data)) == (None, data)
@@ -1,5 +1,8 @@
 from __future__ import absolute_import
 
+import os
+import shutil
+import tempfile
 import zipfile
 from six import BytesIO
 
@@ -7,6 +10,7 @@ from django.core.urlresolvers import reverse
 from django.core.files.uploadedfile import SimpleUploadedFile
 
 from sentry import eventstore
+from sentry.lang.java.plugin import MappingViewCache
 from sentry.testutils import TestCase
 from sentry.utils import json
 
@@ -190,3 +194,43 @@ class BasicResolvingIntegrationTest(TestCase):
             "mapping_uuid": u"071207ac-b491-4a74-957c-2c94fd9594f2",
             "type": "proguard_missing_lineno",
         }
+
+
+class MappingViewCacheTest(TestCase):
+    def setUp(self):
+        super(MappingViewCacheTest, self).setUp()
+        self.tmpdir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.tmpdir)
+
+    def write_mapping(self, name):
+        path = os.path.join(self.tmpdir, name)
+        with open(path, "wb") as f:
+            f.write(PROGUARD_SOURCE)
+        return path
+
+    def test_simple(self):
+        cache = MappingViewCache(size=2, max_bytes=1024 * 1024)
+        path1 = self.write_mapping("mapping1")
+        path2 = self.write_mapping("mapping2")
+        path3 = self.write_mapping("mapping3")
+
+        view = cache.open(path1)
+        assert view.has_line_info
+        assert cache.open(path1) is view
+        assert cache.open(path2) is not view
+
+        # Evicts the least recently used view
+        cache.open(path1)
+        cache.open(path3)
+        assert list(cache.views) == [path1, path3]
+        assert cache.total_bytes == 2 * len(PROGUARD_SOURCE)
+
+    def test_max_bytes(self):
+        cache = MappingViewCache(size=10, max_bytes=len(PROGUARD_SOURCE))
+        path1 = self.write_mapping("mapping1")
+        path2 = self.write_mapping("mapping2")
+
+        cache.open(path1)
+        cache.open(path2)
+        assert list(cache.views) == [path2]
+        assert cache.total_bytes == len(PROGUARD_SOURCE)
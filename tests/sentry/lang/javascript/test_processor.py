@@ -179,6 +179,32 @@ class FetchReleaseFileTest(TestCase):
             "utf-8",
         )
 
+    def test_manifest(self):
+        project = self.project
+        release = Release.objects.create(organization_id=project.organization_id, version="abc")
+        release.add_project(project)
+
+        assert fetch_release_file("file.min.js", release) is None
+        assert ReleaseFile.objects.get_manifest(release) == frozenset()
+
+        # Misses are answered by the manifest, without querying release files.
+        with self.assertNumQueries(0):
+            assert fetch_release_file("http://example.com/jquery.min.js", release) is None
+
+        file = File.objects.create(
+            name="file.min.js",
+            type="release.file",
+            headers={"Content-Type": "application/json; charset=utf-8"},
+        )
+        file.putfile(six.BytesIO(b"foo"))
+
+        # Adding a file invalidates the manifest.
+        releasefile = ReleaseFile.objects.create(
+            name="file.min.js", release=release, organization_id=project.organization_id, file=file
+        )
+        assert fetch_release_file("file.min.js", release).body == b"foo"
+        assert ReleaseFile.objects.get_manifest(release) == frozenset([releasefile.ident])
+
 
 class FetchFileTest(TestCase):
     @responses.activate
@@ -1,9 +1,23 @@
 from __future__ import absolute_import
 
 import pytest
+import threading
 
-from sentry.lang.native.symbolicator import get_sources_for_project
-from sentry.testutils.helpers import Feature
+from six import BytesIO
+from six.moves.BaseHTTPServer import BaseHTTPRequestHandler, HTTPServer
+from six.moves.socketserver import ThreadingMixIn
+
+from sentry.attachments import CachedAttachment, attachment_cache
+from sentry.cache import default_cache
+from sentry.lang.native.symbolicator import (
+    MultipartFileBody,
+    Symbolicator,
+    get_sources_for_project,
+    session_pool,
+)
+from sentry.tasks.store import RetrySymbolication
+from sentry.testutils.helpers import Feature, override_options
+from sentry.utils import json
 
 
 CUSTOM_SOURCE_CONFIG = """
@@ -102,3 +116,155 @@ def test_sources_custom_disabled(default_project):
 
     source_ids = map(lambda s: s["id"], sources)
     assert source_ids == ["sentry:project"]
+
+
+class StandInSymbolicator(ThreadingMixIn, HTTPServer):
+    daemon_threads = True
+
+    def __init__(self, polls):
+        HTTPServer.__init__(self, ("127.0.0.1", 0), StandInHandler)
+        self.polls = polls
+        self.lost = set()
+        self.connections = 0
+        self.requests = []
+        self.bodies = []
+
+
+class StandInHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def setup(self):
+        BaseHTTPRequestHandler.setup(self)
+        self.server.connections += 1
+
+    def log_message(self, *args):
+        pass
+
+    def respond(self, request_id):
+        self.server.requests.append(self.command)
+        polls = self.server.polls.setdefault(request_id, 0)
+        self.server.polls[request_id] = polls - 1
+        if polls > 0:
+            body = {"status": "pending", "request_id": request_id, "retry_after": 0}
+        else:
+            body = {"status": "completed", "stacktraces": [], "modules": []}
+
+        body = json.dumps(body).encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_POST(self):
+        self.server.bodies.append(self.rfile.read(int(self.headers["Content-Length"])))
+        self.respond(self.headers["x-sentry-event-id"])
+
+    def do_GET(self):
+        request_id = self.path.split("?")[0].rsplit("/", 1)[-1]
+        if request_id in self.server.lost:
+            self.server.requests.append(self.command)
+            self.send_response(404)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+        else:
+            self.respond(request_id)
+
+
+@pytest.fixture
+def symbolicator_server():
+    server = StandInSymbolicator({"a" * 32: 2, "b" * 32: 1})
+    thread = threading.Thread(target=server.serve_forever)
+    thread.daemon = True
+    thread.start()
+
+    url = "http://127.0.0.1:%s/" % (server.server_address[1],)
+    with override_options({"symbolicator.options": {"url": url}, "symbolicator.poll-timeout": 30}):
+        yield server
+
+    server.shutdown()
+    server.server_close()
+    session_pool.clear()
+
+
+@pytest.mark.django_db
+def test_process_polls_on_pooled_session(default_project, symbolicator_server):
+    for event_id in ("a" * 32, "b" * 32):
+        symbolicator = Symbolicator(project=default_project, event_id=event_id)
+        response = symbolicator.process_payload(stacktraces=[], modules=[])
+        assert response["status"] == "completed"
+
+    # Pending requests are polled within the task, and both events share one
+    # connection.
+    assert symbolicator_server.requests == ["POST", "GET", "GET", "POST", "GET"]
+    assert symbolicator_server.connections == 1
+
+
+@pytest.mark.django_db
+def test_process_poll_timeout(default_project, symbolicator_server):
+    symbolicator = Symbolicator(project=default_project, event_id="a" * 32)
+
+    with override_options({"symbolicator.poll-timeout": 0}):
+        with pytest.raises(RetrySymbolication):
+            symbolicator.process_payload(stacktraces=[], modules=[])
+
+    assert default_cache.get(symbolicator.task_id_cache_key) == "a" * 32
+    assert symbolicator_server.requests == ["POST"]
+
+    response = symbolicator.process_payload(stacktraces=[], modules=[])
+    assert response["status"] == "completed"
+    assert symbolicator_server.requests == ["POST", "GET", "GET"]
+    assert default_cache.get(symbolicator.task_id_cache_key) is None
+
+
+@pytest.mark.django_db
+def test_process_lost_task(default_project, symbolicator_server):
+    symbolicator_server.lost.add("a" * 32)
+    symbolicator = Symbolicator(project=default_project, event_id="a" * 32)
+
+    # A lost task is created once more, but not polled within the same task.
+    with pytest.raises(RetrySymbolication):
+        symbolicator.process_payload(stacktraces=[], modules=[])
+
+    assert symbolicator_server.requests == ["POST", "GET", "POST"]
+    assert default_cache.get(symbolicator.task_id_cache_key) == "a" * 32
+
+
+@pytest.mark.django_db
+def test_process_minidump_streams_attachment(default_project, symbolicator_server):
+    minidump = b"MDMP" + b"\x01" * (8 << 20)
+    attachment_cache.set(
+        "minidump", [CachedAttachment(name="minidump.dmp", fileobj=BytesIO(minidump))]
+    )
+    (attachment,) = attachment_cache.get("minidump")
+
+    symbolicator = Symbolicator(project=default_project, event_id="c" * 32)
+    response = symbolicator.process_minidump(attachment)
+    assert response["status"] == "completed"
+
+    (body,) = symbolicator_server.bodies
+    assert b'name="upload_file_minidump"; filename="minidump.dmp"' in body
+    assert minidump in body
+    attachment_cache.delete("minidump")
+
+
+def test_multipart_body_reads_in_chunks():
+    attachment = CachedAttachment(name="minidump.dmp", data=b"MDMP" + b"\x01" * (4 << 20))
+    body = MultipartFileBody([("sources", "[]")], "upload_file_minidump", attachment)
+
+    sizes = []
+    while True:
+        data = body.read(65536)
+        if not data:
+            break
+        sizes.append(len(data))
+
+    assert max(sizes) == 65536
+    assert sum(sizes) == len(body) == body.tell()
+
+    # Rewinding produces the same body, which is required for retries.
+    body.seek(0)
+    data = body.read()
+    assert len(data) == len(body)
+    assert data.startswith(b"--" + body.boundary.encode("ascii"))
+    assert data.endswith(b"--" + body.boundary.encode("ascii") + b"--\r\n")
@@ -1,5 +1,8 @@
 from __future__ import absolute_import
 
+import mock
+
+from sentry.db.models.manager import local_model_cache
 from sentry.models import Group, Project, Team, User
 from sentry.testutils import TestCase
 
@@ -93,3 +96,47 @@ class ProjectManagerTest(TestCase):
             team=team, user=user, _skip_team_check=False, scope="project:read"
         )
         assert result == [project2, project]
+
+
+class GetManyFromCacheTest(TestCase):
+    def test_simple(self):
+        project = self.create_project()
+        project2 = self.create_project()
+
+        # Prime the cache with the first project only
+        Project.objects.get_from_cache(id=project.id)
+
+        with self.assertNumQueries(1):
+            result = Project.objects.get_many_from_cache([project2.id, project.id, 0])
+        assert result == [project2, project]
+
+        with self.assertNumQueries(0):
+            result = Project.objects.get_many_from_cache([project, project2.id])
+        assert result == [project, project2]
+
+    def test_invalidated_on_save(self):
+        project = self.create_project(name="foo")
+        Project.objects.get_many_from_cache([project.id])
+
+        project.update(name="bar")
+        with self.assertNumQueries(0):
+            result = Project.objects.get_many_from_cache([project.id])
+        assert result[0].name == "bar"
+
+    def test_local_cache(self):
+        project = self.create_project(name="foo")
+
+        with self.settings(SENTRY_MODEL_CACHE_LOCAL_TTL=60):
+            local_model_cache.clear()
+            Project.objects.get_from_cache(id=project.id)
+
+            with mock.patch("sentry.db.models.manager.cache") as remote:
+                result = Project.objects.get_from_cache(id=project.id)
+                assert not remote.get.called
+            assert result == project
+            assert result is not Project.objects.get_from_cache(id=project.id)
+
+            project.name = "bar"
+            project.save()
+            assert local_model_cache.items == {}
+            assert Project.objects.get_from_cache(id=project.id).name == "bar"
@@ -0,0 +1,66 @@
+from __future__ import absolute_import
+
+from mock import call, patch
+
+from sentry.metrics.aggregating import AggregatingMetricsBackend, TimingSketch
+from sentry.testutils import TestCase
+
+
+class TimingSketchTest(TestCase):
+    def test_percentile(self):
+        sketch = TimingSketch()
+        assert sketch.percentile(0.5) is None
+
+        for value in range(1, 1001):
+            sketch.add(value / 1000.0)
+        sketch.add(0)
+
+        assert sketch.count == 1001
+        assert sketch.min == 0
+        assert sketch.max == 1.0
+        for p in (0.5, 0.95, 0.99):
+            assert abs(sketch.percentile(p) - p) <= p * 0.01 + 0.001
+        assert sketch.percentile(0) == 0
+
+
+class AggregatingMetricsBackendTest(TestCase):
+    def setUp(self):
+        self.backend = AggregatingMetricsBackend(
+            backend="sentry.metrics.logging.LoggingBackend", percentiles=(0.5,)
+        )
+        self.backend.flush()
+
+    @patch("sentry.metrics.logging.LoggingBackend.incr")
+    def test_incr(self, mock_incr):
+        self.backend.incr("foo")
+        self.backend.incr("foo", amount=2)
+        self.backend.incr("foo", tags={"a": "b"})
+        self.backend.incr("foo", instance="bar")
+        assert not mock_incr.called
+
+        self.backend.flush()
+        assert sorted(mock_incr.call_args_list) == sorted(
+            [
+                call("foo", None, None, 3),
+                call("foo", None, {"a": "b"}, 1),
+                call("foo", "bar", None, 1),
+            ]
+        )
+
+        mock_incr.reset_mock()
+        self.backend.flush()
+        assert not mock_incr.called
+
+    @patch("sentry.metrics.logging.LoggingBackend.timing")
+    @patch("sentry.metrics.logging.LoggingBackend.incr")
+    def test_timing(self, mock_incr, mock_timing):
+        self.backend.timing("foo", 1.0, tags={"a": "b"})
+        self.backend.timing("foo", 3.0, tags={"a": "b"})
+        self.backend.flush()
+
+        mock_incr.assert_called_once_with("foo.count", None, {"a": "b"}, 2)
+        assert mock_timing.call_args_list == [
+            call("foo.avg", 2.0, None, {"a": "b"}),
+            call("foo.max", 3.0, None, {"a": "b"}),
+            call("foo.p50", 1.0, None, {"a": "b"}),
+        ]
@@ -1,10 +1,13 @@
 from __future__ import absolute_import
 
 import os
+import shutil
+import tempfile
 import time
 import zipfile
 from six import BytesIO, text_type
 
+from django.core.files.base import ContentFile
 from django.core.files.uploadedfile import SimpleUploadedFile
 from django.core.urlresolvers import reverse
 
@@ -110,6 +113,38 @@ class DebugFileTest(TestCase):
         )
         assert debug_id not in difs
 
+    def test_resolve_difs(self):
+        debug_id1 = "dfb8e43a-f242-3d73-a453-aeb6a777ef75"
+        debug_id2 = "19bd7a09-3e31-4911-a5cd-8e829b845407"
+        debug_id3 = "7d402821-fae6-4ebc-bbb2-152f8e3b3352"
+
+        self.create_dif_file(debug_id=debug_id1, features=["debug"])
+        dif1 = self.create_dif_file(debug_id=debug_id1, features=["unwind"])
+        dif2 = self.create_dif_file(debug_id=debug_id2)
+
+        debug_ids = [debug_id1, debug_id2, debug_id3]
+        difs = ProjectDebugFile.difcache.resolve_difs(self.project, debug_ids, ["unwind"])
+        assert difs == {
+            debug_id1: (dif1.file_id, dif1.file.checksum),
+            debug_id2: (dif2.file_id, dif2.file.checksum),
+        }
+
+        # Lookups are cached, including misses
+        with self.assertNumQueries(0):
+            assert (
+                ProjectDebugFile.difcache.resolve_difs(self.project, debug_ids, ["unwind"]) == difs
+            )
+
+        # Uploads invalidate the cached lookup
+        dif3 = self.create_dif_file(debug_id=debug_id3)
+        difs = ProjectDebugFile.difcache.resolve_difs(self.project, debug_ids, ["unwind"])
+        assert difs[debug_id3] == (dif3.file_id, dif3.file.checksum)
+
+        # And so do deletions
+        dif1.delete()
+        difs = ProjectDebugFile.difcache.resolve_difs(self.project, debug_ids, ["unwind"])
+        assert debug_id1 not in difs
+
 
 class CreateDebugFileTest(APITestCase):
     @property
@@ -290,3 +325,42 @@ class DebugFilesClearTest(APITestCase):
 
         # But it's gone now
         assert not os.path.isfile(difs[PROGUARD_UUID])
+
+    def test_shared_files_and_size_limit(self):
+        cache_path = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, cache_path)
+
+        file1 = File.objects.create(name="a", type="project.dif")
+        file1.putfile(ContentFile(b"a" * 100))
+        file2 = File.objects.create(name="b", type="project.dif")
+        file2.putfile(ContentFile(b"b" * 100))
+
+        project1 = self.create_project()
+        project2 = self.create_project()
+        debug_id = "dfb8e43a-f242-3d73-a453-aeb6a777ef75"
+        self.create_dif_file(project=project1, debug_id=debug_id, file=file1)
+        self.create_dif_file(project=project2, debug_id=debug_id, file=file1)
+
+        with self.options({"dsym.cache-path": cache_path, "dsym.cache-max-size": 150}):
+            path1 = ProjectDebugFile.difcache.fetch_difs(project1, [debug_id])[debug_id]
+            path2 = ProjectDebugFile.difcache.fetch_difs(project2, [debug_id])[debug_id]
+
+            # Both projects share the same file, and no locks are left behind
+            assert path1 == path2
+            assert os.listdir(os.path.join(cache_path, ".locks")) == []
+            with open(path1, "rb") as f:
+                assert f.read() == b"a" * 100
+
+            # Evicts the least recently used file to stay within the limit
+            os.utime(path1, (time.time() - 60, time.time() - 60))
+            path3 = ProjectDebugFile.difcache.fetch_file(file2.id, file2.checksum)
+
+            # Locks held by other processes are not considered for eviction
+            lock_path = ProjectDebugFile.difcache.get_lock_path(file1.checksum)
+            open(lock_path, "w").close()
+            os.utime(lock_path, (time.time() - 120, time.time() - 120))
+
+            ProjectDebugFile.difcache.clear_old_entries()
+            assert not os.path.isfile(path1)
+            assert os.path.isfile(path3)
+            assert os.path.isfile(lock_path)
@@ -1,10 +1,16 @@
 from __future__ import absolute_import
 
+import mock
 import os
+import pytest
+import shutil
+import tempfile
 
 from django.core.files.base import ContentFile
+from hashlib import sha1
 
-from sentry.models import File, FileBlob
+from sentry.models import File, FileBlob, FileBlobOwner
+from sentry.models.file import blob_cache
 from sentry.testutils import TestCase
 
 
@@ -24,6 +30,42 @@ class FileBlobTest(TestCase):
         assert my_file1.checksum == my_file2.checksum
         assert my_file1.path == my_file2.path
 
+    def test_from_files(self):
+        existing = FileBlob.from_file(ContentFile(b"existing"))
+        contents = [b"existing", b"foo", b"bar", b"foo"] + [b"blob %d" % i for i in range(20)]
+        files = [(ContentFile(content), sha1(content).hexdigest()) for content in contents]
+
+        FileBlob.from_files(files, organization=self.organization)
+
+        checksums = set(sha1(content).hexdigest() for content in contents)
+        blobs = FileBlob.objects.filter(checksum__in=checksums)
+        assert len(blobs) == len(checksums) == 23
+        assert existing in blobs
+        for blob in blobs:
+            assert blob.path
+            assert blob.size == len(blob.getfile().read())
+        assert set(
+            FileBlobOwner.objects.filter(organization=self.organization).values_list(
+                "blob_id", flat=True
+            )
+        ) == set(blob.id for blob in blobs)
+
+    def test_from_files_checksum_mismatch(self):
+        with pytest.raises(IOError):
+            FileBlob.from_files([(ContentFile(b"foo"), sha1(b"bar").hexdigest())])
+        assert not FileBlob.objects.exists()
+
+    def test_from_files_upload_error(self):
+        with mock.patch("sentry.models.file.get_storage") as get_storage:
+            get_storage.return_value.save.side_effect = IOError("upload failed")
+            with pytest.raises(IOError):
+                FileBlob.from_files([ContentFile(b"foo"), ContentFile(b"bar")])
+        assert not FileBlob.objects.exists()
+
+        # The blobs are no longer locked.
+        FileBlob.from_files([ContentFile(b"foo")])
+        assert FileBlob.objects.get().checksum == sha1(b"foo").hexdigest()
+
     def test_generate_unique_path(self):
         path = FileBlob.generate_unique_path()
         assert path
@@ -83,3 +125,45 @@ class FileTest(TestCase):
 
         f = file.getfile(prefetch=True)
         assert f.read() == random_data
+
+    def test_multi_chunk_read_ahead(self):
+        random_data = os.urandom(1 << 20)
+
+        fileobj = ContentFile(random_data)
+        file = File.objects.create(name="test.bin", type="default", size=len(random_data))
+        file.putfile(fileobj, blob_size=1 << 16)
+
+        with file.getfile() as f:
+            assert f.read() == random_data
+            f.seek(70000)
+            assert f.read(100000) == random_data[70000:170000]
+            f.seek(5)
+            assert f.read(10) == random_data[5:15]
+
+    def test_blob_cache(self):
+        file = File.objects.create(name="baz.js", type="default", size=7)
+        file.putfile(ContentFile(b"foo bar"), 3)
+
+        cache_path = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, cache_path)
+
+        with self.options(
+            {"filestore.blob-cache-path": cache_path, "filestore.blob-cache-max-size": 4}
+        ):
+            with file.getfile() as fp:
+                assert fp.read() == b"foo bar"
+
+            paths = [blob_cache.get_path(blob.checksum) for blob in file.blobs.all()]
+            assert all(os.path.isfile(path) for path in paths)
+
+            # Blobs are now read from the local disk.
+            with mock.patch("sentry.models.file.get_storage") as get_storage:
+                with file.getfile() as fp:
+                    assert fp.read() == b"foo bar"
+            assert not get_storage.called
+
+            blob_cache.clear_old_entries()
+            assert sum(os.path.getsize(path) for path in paths if os.path.isfile(path)) <= 4
+
+            with file.getfile() as fp:
+                assert fp.read() == b"foo bar"
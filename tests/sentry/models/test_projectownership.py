@@ -1,5 +1,7 @@
 from __future__ import absolute_import
 
+from django.utils import timezone
+
 from sentry.testutils import TestCase
 from sentry.api.fields.actor import Actor
 from sentry.models import ProjectOwnership, User, Team
@@ -61,6 +63,40 @@ class ProjectOwnershipTestCase(TestCase):
             self.project.id, {"stacktrace": {"frames": [{"filename": "xxxx"}]}}
         ) == ([], None)
 
+    def test_get_compiled_rules(self):
+        rule_a = Rule(Matcher("path", "*.py"), [Owner("team", self.team.slug)])
+        rule_b = Rule(Matcher("path", "src/*"), [Owner("user", self.user.email)])
+
+        ownership = ProjectOwnership.objects.create(
+            project_id=self.project.id, schema=dump_schema([rule_a])
+        )
+        compiled = ProjectOwnership.get_compiled_rules(ownership)
+        assert compiled.rules == [rule_a]
+        assert ProjectOwnership.get_compiled_rules(ownership) is compiled
+
+        # Updating the schema results in a new version
+        ownership.schema = dump_schema([rule_a, rule_b])
+        ownership.last_updated = timezone.now()
+        assert ProjectOwnership.get_compiled_rules(ownership).rules == [rule_a, rule_b]
+
+        ownership.schema = None
+        assert ProjectOwnership.get_compiled_rules(ownership) is None
+
+    def test_get_for_project(self):
+        assert ProjectOwnership.objects.get_for_project(self.project.id) is None
+
+        ownership = ProjectOwnership.objects.create(project_id=self.project.id)
+        assert ProjectOwnership.objects.get_for_project(self.project.id) == ownership
+
+        ownership.update(auto_assignment=True)
+        assert ProjectOwnership.objects.get_for_project(self.project.id).auto_assignment
+
+        ProjectOwnership.objects.filter(project_id=self.project.id).update(auto_assignment=False)
+        assert not ProjectOwnership.objects.get_for_project(self.project.id).auto_assignment
+
+        ownership.delete()
+        assert ProjectOwnership.objects.get_for_project(self.project.id) is None
+
 
 class ResolveActorsTestCase(TestCase):
     def test_no_actors(self):
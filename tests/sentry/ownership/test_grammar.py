@@ -1,6 +1,14 @@
 from __future__ import absolute_import
 
-from sentry.ownership.grammar import Rule, Matcher, Owner, parse_rules, dump_schema, load_schema
+from sentry.ownership.grammar import (
+    Rule,
+    Matcher,
+    Owner,
+    parse_rules,
+    dump_schema,
+    load_schema,
+    compile_rules,
+)
 
 fixture_data = """
 # cool stuff comment
@@ -97,3 +105,45 @@ def test_matcher_test_stacktrace():
     assert not Matcher("path", "*.jsx").test(data)
     assert not Matcher("url", "*.py").test(data)
     assert not Matcher("path", "*.py").test({})
+
+
+def test_compile_rules():
+    rules = parse_rules(fixture_data)
+    compiled = compile_rules(rules)
+
+    assert compiled.match({}) == []
+    assert compiled.match({"request": {"url": "http://google.com/foo"}}) == [rules[1]]
+    assert (
+        compiled.match(
+            {
+                "request": {"url": "http://google.com/foo"},
+                "stacktrace": {"frames": [{"filename": "src/sentry/app.js"}]},
+            }
+        )
+        == rules
+    )
+
+
+def test_compile_rules_large():
+    # 500 rules tested against a 100 frame stacktrace have to match exactly
+    # the rules which match one by one.
+    rules = []
+    for i in range(500):
+        pattern = ("src/app%d/*.py", "*/module%d/?.js", "lib/[ab]%d*")[i % 3] % i
+        rules.append(Rule(Matcher("path", pattern), [Owner("team", "team-%d" % i)]))
+    rules.append(Rule(Matcher("url", "*/checkout/*"), [Owner("team", "payments")]))
+
+    frames = []
+    for i in range(100):
+        filename = ("src/app%d/views.py", "vendor/module%d/a.js", "lib/b%d.c", "other/%d")[
+            i % 4
+        ] % (i * 7)
+        frames.append({"filename": filename})
+    data = {
+        "exception": {"values": [{"stacktrace": {"frames": frames}}]},
+        "request": {"url": "https://example.com/checkout/"},
+    }
+
+    expected = [r for r in rules if r.test(data)]
+    assert len(expected) == 28
+    assert compile_rules(rules).match(data) == expected
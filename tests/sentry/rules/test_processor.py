@@ -2,13 +2,15 @@
 
 from __future__ import absolute_import
 
+import mock
+
 from datetime import timedelta
 from django.utils import timezone
 
 from sentry.models import GroupRuleStatus, Rule
 from sentry.plugins import plugins
 from sentry.testutils import TestCase
-from sentry.rules.processor import EventCompatibilityProxy, RuleProcessor
+from sentry.rules.processor import EventCompatibilityProxy, RuleProcessor, compile_rule
 
 
 class RuleProcessorTest(TestCase):
@@ -52,6 +54,63 @@ class RuleProcessorTest(TestCase):
         results = list(rp.apply())
         assert len(results) == 1
 
+    def test_multiple_rules(self):
+        event = self.create_event()
+
+        action_data = {"id": "sentry.rules.actions.notify_event.NotifyEventAction"}
+        condition_data = {
+            "id": "sentry.rules.conditions.event_frequency.EventFrequencyCondition",
+            "interval": "1h",
+            "value": 0,
+        }
+
+        Rule.objects.filter(project=event.project).delete()
+        rules = [
+            Rule.objects.create(
+                project=event.project,
+                data={"conditions": [condition_data], "actions": [action_data]},
+            )
+            for _ in range(5)
+        ]
+
+        rp = RuleProcessor(
+            event,
+            is_new=True,
+            is_regression=True,
+            is_new_group_environment=True,
+            has_reappeared=True,
+        )
+
+        with mock.patch(
+            "sentry.rules.conditions.event_frequency.EventFrequencyCondition.query", return_value=1,
+        ) as query:
+            results = list(rp.apply())
+
+        # All rules share the same frequency query result.
+        assert query.call_count == 1
+        assert len(results) == 1
+        callback, futures = results[0]
+        assert set(future.rule for future in futures) == set(rules)
+        assert GroupRuleStatus.objects.filter(group=event.group).count() == 5
+
+    def test_compile_rule(self):
+        rule = Rule.objects.create(
+            project=self.project,
+            data={
+                "conditions": [{"id": "sentry.rules.conditions.every_event.EveryEventCondition"}],
+                "actions": [{"id": "sentry.rules.actions.notify_event.NotifyEventAction"}],
+            },
+        )
+
+        compiled = compile_rule(rule, self.project)
+        assert compile_rule(Rule.objects.get(id=rule.id), self.project) is compiled
+        assert len(compiled.conditions) == 1
+        assert len(compiled.actions) == 1
+
+        rule.data["action_match"] = "any"
+        rule.save()
+        assert compile_rule(Rule.objects.get(id=rule.id), self.project) is not compiled
+
 
 class EventCompatibilityProxyTest(TestCase):
     def test_simple(self):
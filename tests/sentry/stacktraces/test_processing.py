@@ -0,0 +1,73 @@
+from __future__ import absolute_import
+
+from sentry.stacktraces.processing import (
+    StacktraceProcessor,
+    local_frame_cache,
+    process_stacktraces,
+)
+from sentry.testutils import TestCase
+from sentry.utils.cache import cache
+
+
+class UppercaseProcessor(StacktraceProcessor):
+    calls = 0
+
+    def handles_frame(self, frame, stacktrace_info):
+        return True
+
+    def preprocess_frame(self, processable_frame):
+        processable_frame.set_cache_key_from_values(["upper", processable_frame["function"]])
+
+    def process_frame(self, processable_frame, processing_task):
+        function = processable_frame.cache_value
+        if function is None:
+            UppercaseProcessor.calls += 1
+            function = processable_frame["function"].upper()
+            processable_frame.set_cache_value(function)
+        return [dict(processable_frame.frame, function=function)], None, None
+
+
+class FrameCacheTest(TestCase):
+    def setUp(self):
+        UppercaseProcessor.calls = 0
+        local_frame_cache.clear()
+        self.addCleanup(local_frame_cache.clear)
+
+    def make_data(self):
+        return {
+            "project": self.project.id,
+            "platform": "python",
+            "stacktrace": {
+                "frames": [{"function": "foo"}, {"function": "bar"}, {"function": "foo"}]
+            },
+        }
+
+    def process(self):
+        data = process_stacktraces(
+            self.make_data(),
+            make_processors=lambda data, infos: [UppercaseProcessor(data, infos, self.project)],
+        )
+        return [frame["function"] for frame in data["stacktrace"]["frames"]]
+
+    def test_simple(self):
+        assert self.process() == ["FOO", "BAR", "FOO"]
+        # Repeated frames are processed again, as their value is only
+        # written at the end.
+        assert UppercaseProcessor.calls == 3
+
+        assert self.process() == ["FOO", "BAR", "FOO"]
+        assert UppercaseProcessor.calls == 3
+
+    def test_shared_cache(self):
+        assert self.process() == ["FOO", "BAR", "FOO"]
+        assert UppercaseProcessor.calls == 3
+
+        # Values are loaded from the shared cache into the local cache.
+        local_frame_cache.clear()
+        assert self.process() == ["FOO", "BAR", "FOO"]
+        assert UppercaseProcessor.calls == 3
+        assert len(local_frame_cache.items) == 2
+
+        cache.clear()
+        assert self.process() == ["FOO", "BAR", "FOO"]
+        assert UppercaseProcessor.calls == 3
@@ -75,8 +75,8 @@ class StoreTasksTest(PluginTestCase):
         assert mock_save_event.delay.call_count == 1
 
     @mock.patch("sentry.tasks.store.save_event")
-    @mock.patch("sentry.tasks.store.default_cache")
-    def test_process_event_mutate_and_save(self, mock_default_cache, mock_save_event):
+    @mock.patch("sentry.tasks.store.event_processing_store")
+    def test_process_event_mutate_and_save(self, mock_event_processing_store, mock_save_event):
         project = self.create_project()
 
         data = {
@@ -86,24 +86,24 @@ class StoreTasksTest(PluginTestCase):
             "extra": {"foo": "bar"},
         }
 
-        mock_default_cache.get.return_value = data
+        mock_event_processing_store.get.return_value = data
 
         process_event(cache_key="e:1", start_time=1)
 
         # The event mutated, so make sure we save it back
-        (_, (key, event, duration), _), = mock_default_cache.set.mock_calls
+        ((_, (key, event, stage), _),) = mock_event_processing_store.store.mock_calls
 
         assert key == "e:1"
         assert "extra" not in event
-        assert duration == 3600
+        assert stage == "process"
 
         mock_save_event.delay.assert_called_once_with(
             cache_key="e:1", data=None, start_time=1, event_id=None, project_id=project.id
         )
 
     @mock.patch("sentry.tasks.store.save_event")
-    @mock.patch("sentry.tasks.store.default_cache")
-    def test_process_event_no_mutate_and_save(self, mock_default_cache, mock_save_event):
+    @mock.patch("sentry.tasks.store.event_processing_store")
+    def test_process_event_no_mutate_and_save(self, mock_event_processing_store, mock_save_event):
         project = self.create_project()
 
         data = {
@@ -113,20 +113,20 @@ class StoreTasksTest(PluginTestCase):
             "extra": {"foo": "bar"},
         }
 
-        mock_default_cache.get.return_value = data
+        mock_event_processing_store.get.return_value = data
 
         process_event(cache_key="e:1", start_time=1)
 
         # The event did not mutate, so we shouldn't reset it in cache
-        assert mock_default_cache.set.call_count == 0
+        assert mock_event_processing_store.store.call_count == 0
 
         mock_save_event.delay.assert_called_once_with(
             cache_key="e:1", data=None, start_time=1, event_id=None, project_id=project.id
         )
 
     @mock.patch("sentry.tasks.store.save_event")
-    @mock.patch("sentry.tasks.store.default_cache")
-    def test_process_event_unprocessed(self, mock_default_cache, mock_save_event):
+    @mock.patch("sentry.tasks.store.event_processing_store")
+    def test_process_event_unprocessed(self, mock_event_processing_store, mock_save_event):
         project = self.create_project()
 
         data = {
@@ -136,14 +136,14 @@ class StoreTasksTest(PluginTestCase):
             "extra": {"foo": "bar"},
         }
 
-        mock_default_cache.get.return_value = data
+        mock_event_processing_store.get.return_value = data
 
         process_event(cache_key="e:1", start_time=1)
 
-        (_, (key, event, duration), _), = mock_default_cache.set.mock_calls
+        ((_, (key, event, stage), _),) = mock_event_processing_store.store.mock_calls
         assert key == "e:1"
         assert event["unprocessed"] is True
-        assert duration == 3600
+        assert stage == "process"
 
         mock_save_event.delay.assert_called_once_with(
             cache_key="e:1", data=None, start_time=1, event_id=None, project_id=project.id
@@ -151,6 +151,29 @@ class CanonicalKeyDictTests(unittest.TestCase):
             == 3
         )
 
+    def test_rewrap(self):
+        d = CanonicalKeyDict(
+            {"release": "asdf", "sentry.interfaces.User": {"id": "DemoUser"}}, legacy=False
+        )
+        rewrapped = CanonicalKeyDict(d, legacy=False)
+        assert rewrapped.data == {"release": "asdf", "user": {"id": "DemoUser"}}
+        assert rewrapped.data is not d.data
+        assert rewrapped["sentry.interfaces.User"] == {"id": "DemoUser"}
+
+        rewrapped["release"] = "other"
+        assert d["release"] == "asdf"
+
+        legacy = CanonicalKeyDict(d, legacy=True)
+        assert legacy.data == {"release": "asdf", "sentry.interfaces.User": {"id": "DemoUser"}}
+
+    def test_message_alias(self):
+        d = CanonicalKeyDict({"logentry": {"formatted": "foo"}}, legacy=False)
+        assert "message" in d
+        assert d["message"] == {"formatted": "foo"}
+
+        d["message"] = {"formatted": "bar"}
+        assert d.data == {"logentry": {"formatted": "bar"}}
+
 
 class LegacyCanonicalKeyDictTests(unittest.TestCase):
     canonical_data = {
@@ -48,3 +48,34 @@ class JSONTest(TestCase):
         enum = Enum("foo", "a b c")
         res = enum.a
         self.assertEquals(json.dumps(res), "1")
+
+
+class LoadStreamingTest(TestCase):
+    def chunked(self, value, size):
+        return [value[i : i + size] for i in range(0, len(value), size)]
+
+    def test_streaming(self):
+        rows = [{"id": i, "value": u'héllo "%s"' % i, "list": [1.5, None, True]} for i in range(50)]
+        document = json.dumps({"data": rows, "meta": [{"name": "id"}], "count": 12345})
+
+        for size in (1, 3, 64, len(document)):
+            obj, items = json.load_streaming(self.chunked(document, size), "data")
+            assert list(items) == rows
+            assert obj == {"meta": [{"name": "id"}], "count": 12345}
+
+    def test_members_before_key(self):
+        document = b'{"meta": [], "count": 10, "data": [{"id": 1}], "extra": true}'
+        obj, items = json.load_streaming(self.chunked(document, 2), "data")
+        assert obj == {"meta": [], "count": 10}
+        assert list(items) == [{"id": 1}]
+        assert obj == {"meta": [], "count": 10, "extra": True}
+
+    def test_missing_key(self):
+        obj, items = json.load_streaming([b'{"meta": []}'], "data")
+        assert obj == {"meta": []}
+        assert list(items) == []
+
+    def test_invalid(self):
+        obj, items = json.load_streaming([b'{"data": [{"id": 1}, {"id"'], "data")
+        with self.assertRaises(ValueError):
+            list(items)
@@ -0,0 +1,49 @@
+from __future__ import absolute_import
+
+import mock
+
+from sentry.testutils import TestCase
+from sentry.utils.cache import default_cache, jitter_timeout, single_flight
+
+
+class JitterTimeoutTest(TestCase):
+    def test_simple(self):
+        for i in range(100):
+            assert 270 <= jitter_timeout(300) <= 330
+        assert jitter_timeout(None) is None
+        assert jitter_timeout(0) == 0
+        assert jitter_timeout(1) >= 1
+
+
+class SingleFlightTest(TestCase):
+    def test_compute(self):
+        compute = mock.Mock(return_value="value")
+        assert single_flight("single-flight", lambda: None, compute) == "value"
+        assert compute.call_count == 1
+        # The lock is released again.
+        assert default_cache.get("single-flight:lock") is None
+
+    def test_compute_error(self):
+        compute = mock.Mock(side_effect=ValueError)
+        with self.assertRaises(ValueError):
+            single_flight("single-flight", lambda: None, compute)
+        assert default_cache.get("single-flight:lock") is None
+
+    def test_wait(self):
+        default_cache.set("single-flight:lock", 1, 5)
+        fetch = mock.Mock(side_effect=[None, "value"])
+        compute = mock.Mock()
+        assert single_flight("single-flight", fetch, compute, interval=0) == "value"
+        assert fetch.call_count == 2
+        assert not compute.called
+
+    def test_wait_timeout(self):
+        default_cache.set("single-flight:lock", 1, 5)
+        compute = mock.Mock(return_value="value")
+        assert (
+            single_flight("single-flight", lambda: None, compute, wait=0.01, interval=0) == "value"
+        )
+        assert compute.call_count == 1
+        # The lock held by another process is left alone.
+        assert default_cache.get("single-flight:lock") == 1
+        default_cache.delete("single-flight:lock")
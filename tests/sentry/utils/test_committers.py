@@ -4,13 +4,16 @@ import unittest
 
 from datetime import timedelta
 from django.utils import timezone
-from mock import Mock
+from mock import Mock, patch
 from uuid import uuid4
 
-from sentry.models import Commit, CommitAuthor, CommitFileChange, Release, Repository
+from sentry.models import Commit, CommitAuthor, CommitFileChange, Release, ReleaseCommit, Repository
 from sentry.testutils import TestCase
 from sentry.utils.committers import (
-    _get_commit_file_changes,
+    _get_commit_path_matches,
+    _get_release_file_indexes,
+    build_release_file_index,
+    invalidate_commit_file_indexes,
     _get_frame_paths,
     _match_commits_path,
     get_serialized_event_file_committers,
@@ -126,30 +129,6 @@ class GetFramePathsTestCase(unittest.TestCase):
         assert [] == _get_frame_paths(self.event)
 
 
-class GetCommitFileChangesTestCase(CommitTestCase):
-    def setUp(self):
-        super(GetCommitFileChangesTestCase, self).setUp()
-        file_change_1 = self.create_commitfilechange(filename="hello/app.py", type="A")
-        file_change_2 = self.create_commitfilechange(filename="hello/templates/app.html", type="A")
-        file_change_3 = self.create_commitfilechange(filename="hello/app.py", type="M")
-
-        # ensuring its not just getting all filechanges
-        self.create_commitfilechange(filename="goodbye/app.py", type="A")
-
-        self.file_changes = [file_change_1, file_change_2, file_change_3]
-        self.commits = [file_change.commit for file_change in self.file_changes]
-        self.path_name_set = {file_change.filename for file_change in self.file_changes}
-
-    def test_no_paths(self):
-        assert [] == _get_commit_file_changes(self.commits, {})
-
-    def test_no_valid_paths(self):
-        assert [] == _get_commit_file_changes(self.commits, {"/"})
-
-    def test_simple(self):
-        assert _get_commit_file_changes(self.commits, self.path_name_set) == self.file_changes
-
-
 class MatchCommitsPathTestCase(CommitTestCase):
     def test_simple(self):
         file_change = self.create_commitfilechange(filename="hello/app.py", type="A")
@@ -180,6 +159,72 @@ class MatchCommitsPathTestCase(CommitTestCase):
         )
 
 
+class ReleaseFileIndexTestCase(CommitTestCase):
+    def setUp(self):
+        super(ReleaseFileIndexTestCase, self).setUp()
+        self.release = self.create_release(project=self.project, version="v12")
+        self.commit = self.create_commit()
+        self.other_commit = self.create_commit()
+        for order, commit in enumerate([self.commit, self.other_commit]):
+            ReleaseCommit.objects.create(
+                organization_id=self.organization.id,
+                release=self.release,
+                commit=commit,
+                order=order,
+            )
+        self.create_commitfilechange(commit=self.commit, filename="hello/app.py")
+        self.create_commitfilechange(commit=self.other_commit, filename="world/hello/App.py")
+        self.create_commitfilechange(commit=self.other_commit, filename="hello/app.js")
+        # not part of the release
+        self.create_commitfilechange(filename="hello/app.py")
+
+    def test_build(self):
+        index = build_release_file_index(self.release.id)
+        assert sorted(index) == ["app.js", "app.py"]
+        assert sorted(index["app.py"]) == sorted(
+            [("hello/app.py", self.commit.id), ("world/hello/App.py", self.other_commit.id)]
+        )
+        assert index["app.js"] == [("hello/app.js", self.other_commit.id)]
+
+    def test_invalidate_commit_file_indexes(self):
+        (index,), _ = _get_release_file_indexes([self.release])
+        assert "app.rb" not in index
+
+        self.create_commitfilechange(commit=self.commit, filename="hello/app.rb")
+        (index,), _ = _get_release_file_indexes([self.release])
+        assert "app.rb" not in index
+
+        invalidate_commit_file_indexes([self.commit.id])
+        (index,), _ = _get_release_file_indexes([self.release])
+        assert index["app.rb"] == [("hello/app.rb", self.commit.id)]
+
+    @patch("sentry.utils.committers.MAX_RELEASE_FILE_INDEX_SIZE", 2)
+    def test_get_commit_path_matches_unindexed(self):
+        assert build_release_file_index(self.release.id) is None
+        assert _get_release_file_indexes([self.release]) == ([], [self.release.id])
+
+        matches = _get_commit_path_matches(
+            [self.release], {"src/hello/app.py", "world/hello/app.py", "other.py"}
+        )
+        assert sorted(matches["src/hello/app.py"]) == sorted(
+            [(self.commit.id, 2), (self.other_commit.id, 2)]
+        )
+        assert matches["world/hello/app.py"] == [(self.other_commit.id, 3)]
+        assert matches["other.py"] == []
+
+    def test_get_commit_path_matches(self):
+        assert _get_commit_path_matches([self.release], set()) == {}
+
+        matches = _get_commit_path_matches(
+            [self.release], {"src/hello/app.py", "world/hello/app.py", "other.py"}
+        )
+        assert sorted(matches["src/hello/app.py"]) == sorted(
+            [(self.commit.id, 2), (self.other_commit.id, 2)]
+        )
+        assert matches["world/hello/app.py"] == [(self.other_commit.id, 3)]
+        assert matches["other.py"] == []
+
+
 class GetPreviousReleasesTestCase(TestCase):
     def test_simple(self):
         current_datetime = timezone.now()
@@ -45,3 +45,32 @@ def test_wraps():
         args, kwargs = timing.call_args
         assert args[0] == "key"
         assert args[3] == {"foo": True, "result": "success"}
+
+
+def test_internal_metrics_flush():
+    from sentry import tsdb
+
+    internal = metrics.InternalMetrics()
+    internal._started = True
+    internal.incr("foo")
+    internal.incr("foo")
+    internal.incr("bar", instance="baz", amount=2)
+    internal.incr("qux", amount=1, sample_rate=0.5)
+
+    with mock.patch("sentry.tsdb.incr_multi") as incr_multi:
+        internal.flush()
+
+        assert incr_multi.call_count == 1
+        args, kwargs = incr_multi.call_args
+        assert sorted(args[0]) == sorted(
+            [
+                (tsdb.models.internal, "foo"),
+                (tsdb.models.internal, "bar.baz"),
+                (tsdb.models.internal, "qux"),
+            ]
+        )
+        assert kwargs == {"count": 2}
+
+        incr_multi.reset_mock()
+        internal.flush()
+        assert incr_multi.call_count == 0
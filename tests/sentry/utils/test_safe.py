@@ -2,13 +2,18 @@ from __future__ import absolute_import
 
 from collections import OrderedDict
 from functools import partial
+import os
 import pytest
+import six
 import unittest
 
+from django.utils.encoding import force_text
 from mock import patch, Mock
 from sentry.testutils import TestCase
+from sentry.utils import json
 from sentry.utils.canonical import CanonicalKeyDict
 from sentry.utils.safe import safe_execute, trim, trim_dict, get_path, set_path, setdefault_path
+from sentry.utils.strings import truncatechars
 
 a_very_long_string = "a" * 1024
 
@@ -24,6 +29,12 @@ class TrimTest(unittest.TestCase):
         assert trim({"x": "\xc3\xbc"}) == {"x": "\xc3\xbc"}
         assert trim(["x", "\xc3\xbc"]) == ["x", "\xc3\xbc"]
 
+    def test_invalid_utf8(self):
+        # Top-level values are not converted to text
+        assert trim(b"\xff") == b"\xff"
+        assert trim(b"\xff" * 1024, max_size=10) == b"\xff" * 7 + b"..."
+        assert trim_dict({"x": b"\xff"}) == {"x": b"\xff"}
+
     def test_idempotent(self):
         trm = partial(trim, max_depth=2)
         a = {"a": {"b": {"c": {"d": 1}}}}
@@ -56,6 +67,81 @@ class TrimTest(unittest.TestCase):
         assert trm(a) == {"a": {"b": {"c": "[]"}}}
 
 
+def reference_trim(value, max_size=512, max_depth=6, object_hook=None, _depth=0, _size=0):
+    # The original, recursive implementation of ``trim``
+    options = {
+        "max_depth": max_depth,
+        "max_size": max_size,
+        "object_hook": object_hook,
+        "_depth": _depth + 1,
+    }
+
+    if _depth > max_depth:
+        if not isinstance(value, six.string_types):
+            value = json.dumps(value)
+        return reference_trim(value, _size=_size, max_size=max_size)
+
+    elif isinstance(value, dict):
+        result = {}
+        _size += 2
+        for k in sorted(value.keys()):
+            trim_v = reference_trim(value[k], _size=_size, **options)
+            result[k] = trim_v
+            _size += len(force_text(trim_v)) + 1
+            if _size >= max_size:
+                break
+
+    elif isinstance(value, (list, tuple)):
+        result = []
+        _size += 2
+        for v in value:
+            trim_v = reference_trim(v, _size=_size, **options)
+            result.append(trim_v)
+            _size += len(force_text(trim_v))
+            if _size >= max_size:
+                break
+        if isinstance(value, tuple):
+            result = tuple(result)
+
+    elif isinstance(value, six.string_types):
+        result = truncatechars(value, max_size - _size)
+
+    else:
+        result = value
+
+    if object_hook is None:
+        return result
+    return object_hook(result)
+
+
+class TrimCorpusTest(unittest.TestCase):
+    def get_corpus(self):
+        samples = os.path.join(os.path.dirname(__file__), os.pardir, os.pardir, os.pardir)
+        samples = os.path.join(samples, "src", "sentry", "data", "samples")
+        for filename in sorted(os.listdir(samples)):
+            with open(os.path.join(samples, filename)) as f:
+                yield json.load(f)
+
+        yield {
+            "extra": {
+                "k%d" % i: {"a": [{"b": {"c": [u"\xfc" * i, 1.1, None, (i,)]}}] * 3, "d": i}
+                for i in range(50)
+            },
+            "contexts": {"os": {"name": "Linux", "version": ("1", 2, 3.0, True)}},
+            "tuple": ("x" * 600,),
+        }
+
+    def test_matches_reference(self):
+        for value in self.get_corpus():
+            for options in (
+                {"max_size": 512},
+                {"max_size": 512, "max_depth": 2},
+                {"max_size": 100},
+                {"max_size": 512, "object_hook": list},
+            ):
+                assert repr(trim(value, **options)) == repr(reference_trim(value, **options))
+
+
 class TrimDictTest(unittest.TestCase):
     def test_large_dict(self):
         value = dict((k, k) for k in range(500))
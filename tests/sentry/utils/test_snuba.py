@@ -1,12 +1,13 @@
 from __future__ import absolute_import
 
-from datetime import datetime
+from datetime import datetime, timedelta
 from mock import patch
 import pytz
 
 from sentry.models import GroupRelease, Release
 from sentry.testutils import TestCase, SnubaTestCase
 from sentry.testutils.helpers.datetime import iso_format, before_now
+from sentry.utils import json
 from sentry.utils.snuba import (
     get_snuba_translators,
     zerofill,
@@ -15,6 +16,16 @@ from sentry.utils.snuba import (
     detect_dataset,
     transform_aliases_and_query,
     Dataset,
+    LocalQueryCache,
+    QUERY_CACHE_MAX_TTL,
+    QUERY_CACHE_MIN_TTL,
+    SnubaError,
+    SnubaResponse,
+    _local_query_cache,
+    get_query_cache_key,
+    get_query_cache_ttl,
+    options_override,
+    raw_query,
 )
 
 
@@ -547,6 +558,30 @@ class TransformAliasesAndQueryTransactionsTest(TestCase):
             groupby=None,
         )
 
+    @patch("sentry.utils.snuba.raw_query")
+    def test_stream(self, mock_query):
+        # Like a streamed response, meta only follows once the rows are read.
+        result = {}
+
+        def rows():
+            yield {"transaction_name": "api.do_things", "duration": 200}
+            result["meta"] = [{"name": "transaction_name"}, {"name": "duration"}]
+
+        result["data"] = rows()
+        mock_query.return_value = result
+
+        result = transform_aliases_and_query(
+            selected_columns=["transaction", "transaction.duration"],
+            filter_keys={"project_id": [self.project.id]},
+            stream=True,
+        )
+        assert mock_query.call_args[1]["stream"] is True
+        assert "meta" not in result
+        assert list(result["data"]) == [
+            {"transaction": "api.do_things", "transaction.duration": 200}
+        ]
+        assert result["meta"] == [{"name": "transaction"}, {"name": "transaction.duration"}]
+
 
 class DetectDatasetTest(TestCase):
     def test_dataset_key(self):
@@ -607,3 +642,125 @@ class DetectDatasetTest(TestCase):
 
         query = {"aggregations": [["uniq", "transaction.name", "uniq_transaction"]]}
         assert detect_dataset(query) == Dataset.Transactions
+
+
+class QueryCacheTest(TestCase):
+    def setUp(self):
+        _local_query_cache.clear()
+        self.response = SnubaResponse(200, json.dumps({"data": [{"count": 1}], "meta": []}))
+
+    def query(self, **kwargs):
+        kwargs.setdefault("start", datetime.utcnow() - timedelta(days=1))
+        kwargs.setdefault("end", datetime.utcnow())
+        kwargs.setdefault("filter_keys", {"project_id": [self.project.id]})
+        kwargs.setdefault("aggregations", [["count()", "", "count"]])
+        return raw_query(referrer="test", **kwargs)
+
+    def test_ttl(self):
+        now = datetime.utcnow()
+        assert get_query_cache_ttl(now, now) == QUERY_CACHE_MIN_TTL
+        assert get_query_cache_ttl(now + timedelta(minutes=5), now) == QUERY_CACHE_MIN_TTL
+        assert get_query_cache_ttl(now - timedelta(minutes=10), now) == 60
+        assert get_query_cache_ttl(now - timedelta(days=1), now) == QUERY_CACHE_MAX_TTL
+
+    def test_cache_key(self):
+        now = datetime(2019, 10, 1, 12, 0, 5)
+
+        def key(start, end):
+            params = {"from_date": start.isoformat(), "to_date": end.isoformat()}
+            return get_query_cache_key(params, get_query_cache_ttl(end, now), now)
+
+        # Windows that end now are truncated to the TTL.
+        day = timedelta(days=1)
+        assert key(now - day, now) == key(
+            now - day - timedelta(seconds=3), now - timedelta(seconds=3)
+        )
+
+        # Absolute windows in the past are keyed on their exact bounds, even
+        # though they share a long TTL.
+        end = now - timedelta(days=1)
+        assert get_query_cache_ttl(end, now) == QUERY_CACHE_MAX_TTL
+        assert key(end - day, end) != key(
+            end - day - timedelta(minutes=2), end - timedelta(minutes=2)
+        )
+
+    def test_local_cache_expiry_and_size(self):
+        cache = LocalQueryCache(2)
+        cache.set("a", 1, 60)
+        cache.set("b", 2, 60)
+        assert cache.get("a") == 1
+        cache.set("c", 3, 60)
+        # "b" was the least recently used item
+        assert cache.get("b") is None
+        assert cache.get("a") == 1
+        assert cache.get("c") == 3
+
+        with patch("sentry.utils.snuba.time.time", return_value=0):
+            cache.set("d", 4, 60)
+        assert cache.get("d") is None
+
+    @patch("sentry.utils.snuba._snuba_pool.urlopen")
+    def test_cached(self, urlopen):
+        urlopen.return_value = self.response
+
+        with self.settings(SENTRY_SNUBA_CACHE_TIERS=("local", "redis")):
+            first = self.query(use_cache=True)
+            assert self.query(use_cache=True) == first
+            assert urlopen.call_count == 1
+
+            _local_query_cache.clear()
+            assert self.query(use_cache=True) == first
+            assert urlopen.call_count == 1
+
+            # Queries that don't opt in always go to Snuba.
+            self.query()
+            assert urlopen.call_count == 2
+
+    @patch("sentry.utils.snuba._snuba_pool.urlopen")
+    def test_consistent_not_cached(self, urlopen):
+        urlopen.return_value = self.response
+
+        with self.settings(SENTRY_SNUBA_CACHE_TIERS=("local",)):
+            with options_override({"consistent": True}):
+                self.query(use_cache=True)
+                self.query(use_cache=True)
+            assert urlopen.call_count == 2
+
+    @patch("sentry.utils.snuba._snuba_pool.urlopen")
+    def test_errors_not_cached(self, urlopen):
+        urlopen.return_value = SnubaResponse(
+            500, json.dumps({"error": {"type": "internal", "message": "error"}})
+        )
+
+        with self.settings(SENTRY_SNUBA_CACHE_TIERS=("local",)):
+            for _ in range(2):
+                with self.assertRaises(SnubaError):
+                    self.query(use_cache=True)
+            assert urlopen.call_count == 2
+
+
+class StreamingQueryTest(TestCase):
+    @patch("sentry.utils.snuba._snuba_pool.urlopen")
+    def test_stream(self, urlopen):
+        document = json.dumps({"data": [{"count": i} for i in range(10)], "meta": []})
+        response = urlopen.return_value
+        response.status = 200
+        response.stream.return_value = [document[i : i + 7] for i in range(0, len(document), 7)]
+
+        result = raw_query(
+            start=datetime.utcnow() - timedelta(days=1),
+            end=datetime.utcnow(),
+            filter_keys={"project_id": [self.project.id]},
+            aggregations=[["count()", "", "count"]],
+            referrer="test",
+            stream=True,
+        )
+
+        assert urlopen.call_args[1]["preload_content"] is False
+        assert not isinstance(result["data"], list)
+        assert next(result["data"]) == {"count": 0}
+        assert not response.release_conn.called
+        assert list(result["data"]) == [{"count": i} for i in range(1, 10)]
+        assert result["meta"] == []
+        assert response.release_conn.called
+        assert not response.close.called
@@ -4,8 +4,10 @@ from __future__ import absolute_import
 
 import mock
 
+from django.conf import settings
 from django.core.urlresolvers import reverse
 from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test import RequestFactory
 from exam import fixture
 from mock import Mock
 from six import BytesIO
@@ -16,6 +18,7 @@ from sentry.signals import event_accepted, event_dropped, event_filtered
 from sentry.testutils import assert_mock_called_once_with_partial, TestCase
 from sentry.utils import json
 from sentry.utils.data_filters import FilterTypes
+from sentry.web.api import spool_request_body
 
 
 class SecurityReportCspTest(TestCase):
@@ -760,6 +763,21 @@ class EventAttachmentStoreViewTest(TestCase):
         assert self.has_attachment()
 
 
+class SpoolRequestBodyTest(TestCase):
+    def test_large_body(self):
+        body = b"MDMP" + b"\x00" * (settings.FILE_UPLOAD_MAX_MEMORY_SIZE + 1)
+        request = RequestFactory().post("/", data=body, content_type="application/octet-stream")
+
+        minidump = spool_request_body(request, "Minidump")
+        assert minidump.name == "Minidump"
+        assert minidump.size == len(body)
+        # The body exceeds the memory limit, so it was written to disk.
+        assert minidump.file._rolled
+        assert minidump.read(4) == b"MDMP"
+        minidump.seek(0)
+        assert minidump.read() == body
+
+
 class RobotsTxtTest(TestCase):
     @fixture
     def path(self):